@@ -9,15 +9,27 @@ import uuid
 import io
 import zipfile
 import time
-from openai import OpenAI
+import tempfile
+import shutil
+import concurrent.futures
 from dotenv import load_dotenv
-import requests
 import subprocess
 import ffmpeg
 
 from ffmpeg_config import FFMPEG_THREAD_STR
-from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
+from http_clients import get_elevenlabs_client, get_openai_client, get_session
+import adlocalizer_jobs
+import http_download
+import music_bed_cache
+import whisper_chunking
+import transcription_cache
+import voice_catalog
+import workspace_manager
+import separation_worker
+import stem_cache
+from upload_utils import UploadTooLarge, stream_save_file
+from subtitle_alignment import write_script_sidecar
 
 # Import vocal models configuration
 from vocal_models_config import (
@@ -31,6 +43,7 @@ from subtitle_utils import (
     burn_subtitles_onto_video,
     generate_srt_file,
     get_available_subtitle_styles,
+    normalize_burn_backend,
 )
 
 # Load environment variables (for local development)
@@ -110,14 +123,14 @@ try:
     
     if openai_api_key:
         logging.info("🤖 Initializing OpenAI client...")
-        openai_client = OpenAI(api_key=openai_api_key)
+        openai_client = get_openai_client(openai_api_key)
         logging.info("✅ OpenAI client initialized successfully")
     else:
         logging.warning("⚠️  OpenAI client not initialized - missing API key")
 
     if elevenlabs_api_key:
         logging.info("🎙️  Initializing ElevenLabs client...")
-        eleven_labs_client = ElevenLabs(api_key=elevenlabs_api_key)
+        eleven_labs_client = get_elevenlabs_client(elevenlabs_api_key)
         ELEVENLABS_API_KEY = elevenlabs_api_key
         logging.info("✅ ElevenLabs client initialized successfully")
     else:
@@ -148,72 +161,20 @@ VOICES = {
     "3": {"name": "Chris", "id": "iP95p4xoKVk53GoZ742B"}
 }
 
-VOICE_CACHE_TTL_SECONDS = 300
-_voice_catalog_cache: list[dict] = []
-_voice_catalog_cached_at: float = 0.0
-
-
-def fetch_elevenlabs_voices(api_key: str):
-    """Fetch available ElevenLabs voices via REST API."""
-    if not api_key:
-        return []
-
-    try:
-        response = requests.get(
-            "https://api.elevenlabs.io/v1/voices",
-            headers={
-                "xi-api-key": api_key,
-                "Accept": "application/json",
-            },
-            timeout=15,
-        )
-        response.raise_for_status()
-        payload = response.json()
-        mapped = []
-        for voice in payload.get('voices', []):
-            voice_id = voice.get('voice_id')
-            name = voice.get('name') or voice_id
-            if not voice_id or not name:
-                continue
-            mapped.append({
-                'id': voice_id,
-                'name': name,
-                'preview_url': voice.get('preview_url'),
-                'labels': voice.get('labels', {}),
-            })
-        return mapped
-    except Exception as exc:
-        logging.error(f"Failed to fetch ElevenLabs voices: {exc}")
-        return []
+_LEGACY_VOICE_NAMES = {voice['id']: voice['name'] for voice in VOICES.values()}
 
 
 def get_elevenlabs_voice_catalog(force_refresh: bool = False):
-    """Return cached ElevenLabs voices, refreshing when necessary."""
-    global _voice_catalog_cache, _voice_catalog_cached_at
-
-    if not ELEVENLABS_API_KEY:
-        return []
-
-    cache_expired = time.time() - _voice_catalog_cached_at > VOICE_CACHE_TTL_SECONDS
-    if force_refresh or cache_expired or not _voice_catalog_cache:
-        voices = fetch_elevenlabs_voices(ELEVENLABS_API_KEY)
-        if voices:
-            _voice_catalog_cache = voices
-            _voice_catalog_cached_at = time.time()
-    return _voice_catalog_cache
+    """Return cached ElevenLabs voices; stale entries are refreshed in the background."""
+    return voice_catalog.get_catalog(ELEVENLABS_API_KEY, force_refresh=force_refresh)
 
 
 def resolve_voice_name(voice_id: str) -> str:
     """Best-effort resolution from voice_id to a human-readable name."""
-    for voice in get_elevenlabs_voice_catalog():
-        if voice.get('id') == voice_id:
-            return voice.get('name', voice_id)
-
-    for voice in VOICES.values():
-        if voice.get('id') == voice_id:
-            return voice.get('name', voice_id)
-
-    return voice_id
+    voice = voice_catalog.get_voice(ELEVENLABS_API_KEY, voice_id)
+    if voice:
+        return voice.get('name', voice_id)
+    return _LEGACY_VOICE_NAMES.get(voice_id, voice_id)
 
 # Import centralized language configuration
 from language_config import (
@@ -229,6 +190,8 @@ from language_config import (
 LEGACY_LANGUAGES = get_legacy_language_dict()
 
 SUBTITLE_STATE_KEY = 'subtitle_state'
+# Per-language subtitle fields live under "<prefix><LANG>:<field>" session keys
+SUBTITLE_LANGUAGE_KEY_PREFIX = 'subtitle_lang:'
 DEFAULT_SUBTITLE_STYLE = 'default'
 
 FILENAME_LANG_RE = re.compile(r'\[[^\]]+\](?!.*\[[^\]]+\])')
@@ -291,37 +254,70 @@ def _apply_naming_updates(base_name: str, lang_iso: str, music_token: str, hook_
     return updated
 
 
+def _session_audio_file(lang_code):
+    """Voiceover path for *lang_code*; ``audio_files`` is keyed by the frontend's lowercase ISO codes."""
+    audio_files = session.get('audio_files', {})
+    for key in (lang_code, lang_code.lower(), lang_code.upper()):
+        if key in audio_files:
+            return audio_files[key]
+    return None
+
+
+def _subtitle_field_key(lang_code, field):
+    return f"{SUBTITLE_LANGUAGE_KEY_PREFIX}{lang_code.upper()}:{field}"
+
+
+def _subtitle_language_entries():
+    """Rebuild ``{lang: entry}`` from the per-field session keys."""
+    languages = {}
+    for key, value in session.items():
+        if key.startswith(SUBTITLE_LANGUAGE_KEY_PREFIX):
+            lang_code, _, field = key[len(SUBTITLE_LANGUAGE_KEY_PREFIX):].partition(':')
+            languages.setdefault(lang_code, {})[field] = value
+    return languages
+
+
 def _init_subtitle_state(enabled=False, default_style=DEFAULT_SUBTITLE_STYLE, subtitles_dir=None):
+    for key in [key for key in session.keys() if key.startswith(SUBTITLE_LANGUAGE_KEY_PREFIX)]:
+        session.pop(key, None)
     state = {
         'enabled': bool(enabled),
         'default_style': default_style,
         'subtitles_dir': subtitles_dir,
-        'languages': {},
         'updated_at': datetime.now().isoformat(),
     }
     session[SUBTITLE_STATE_KEY] = state
-    return state
+    return {**state, 'languages': {}}
 
 
 def _get_subtitle_state():
-    return session.get(SUBTITLE_STATE_KEY)
+    state = session.get(SUBTITLE_STATE_KEY)
+    if not state:
+        return state
+    return {**state, 'languages': _subtitle_language_entries()}
 
 
 def _update_subtitle_state(state):
+    state = {key: value for key, value in state.items() if key != 'languages'}
     state['updated_at'] = datetime.now().isoformat()
     session[SUBTITLE_STATE_KEY] = state
 
 
 def _update_subtitle_language_entry(lang_code, updates):
+    """Store each changed field under its own session key.
+
+    With server-side sessions every key is its own row, so updating one
+    language's status rewrites that field only, not every language's segments.
+    """
     state = session.get(SUBTITLE_STATE_KEY)
     if not state:
         state = _init_subtitle_state()
-    languages = state.setdefault('languages', {})
-    entry = languages.get(lang_code.upper(), {})
-    entry.update(updates)
-    languages[lang_code.upper()] = entry
+    for field, value in updates.items():
+        key = _subtitle_field_key(lang_code, field)
+        if session.get(key) != value:
+            session[key] = value
     _update_subtitle_state(state)
-    return entry
+    return _subtitle_language_entries().get(lang_code.upper(), {})
 
 def get_enhanced_system_message(target_language, mode="faithful"):
     """Get enhanced system message for more localized translations"""
@@ -376,16 +372,53 @@ def translate_text(text, target_language, translation_mode="faithful"):
         logging.error(f"Error translating to {target_language}: {str(e)}")
         return None
 
+TTS_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _discard_temp_file(temp_path):
+    if not temp_path:
+        return
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
+
+
+def _spool_audio_chunks(chunks, output_file):
+    """Write streamed audio chunks into a temp file beside output_file.
+
+    Returns (temp_path, head, total_bytes) so callers can validate the payload
+    signature and size before atomically renaming it into place. The temp
+    file is removed if the stream fails part way through.
+    """
+    output_path = Path(output_file)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{output_path.stem[:40]}.",
+        suffix='.part',
+        dir=str(output_path.parent),
+    )
+    head = b''
+    total_bytes = 0
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if len(head) < 3:
+                    head += chunk[:3 - len(head)]
+                handle.write(chunk)
+                total_bytes += len(chunk)
+    except BaseException:
+        _discard_temp_file(temp_path)
+        raise
+    return temp_path, head, total_bytes
+
 def generate_elevenlabs_voice(text, language_code, output_directory, english_identifier, voice_id, model_id="eleven_multilingual_v2"):
     """Generate voice using ElevenLabs API"""
     if not eleven_labs_client:
         return None
         
     try:
-        # Warm cache so subsequent requests return metadata quickly
-        if ELEVENLABS_API_KEY:
-            get_elevenlabs_voice_catalog()
-
         # Get voice name from dynamic catalog (falls back to legacy mapping)
         voice_name = resolve_voice_name(voice_id).replace(" ", "_")
         
@@ -421,7 +454,7 @@ def generate_elevenlabs_voice(text, language_code, output_directory, english_ide
             use_speaker_boost=True,
         )
 
-        audio_bytes = b''
+        temp_path, head, total_bytes = None, b'', 0
 
         # Preferred path: official ElevenLabs client with streaming
         try:
@@ -433,17 +466,20 @@ def generate_elevenlabs_voice(text, language_code, output_directory, english_ide
                 output_format='mp3_44100_128',
                 voice_settings=voice_settings_payload,
             )
-            audio_bytes = b''.join(stream)
+            temp_path, head, total_bytes = _spool_audio_chunks(stream, output_file)
             logging.info(
                 "ElevenLabs streaming response: %s bytes (lang=%s, model=%s)",
-                len(audio_bytes),
+                total_bytes,
                 language_code,
                 model_id,
             )
         except Exception as stream_error:
             logging.warning(f"ElevenLabs streaming convert failed: {stream_error}")
 
-        if not audio_bytes:
+        if not total_bytes:
+            _discard_temp_file(temp_path)
+            temp_path = None
+
             # Fallback to direct REST call (legacy behaviour)
             url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
             headers = {
@@ -463,58 +499,66 @@ def generate_elevenlabs_voice(text, language_code, output_directory, english_ide
                 }
             }
 
-            response = requests.post(url, json=data, headers=headers, timeout=60)
-            logging.info(
-                "ElevenLabs REST response: status=%s, content-type=%s, length=%s",
-                response.status_code,
-                response.headers.get('Content-Type'),
-                response.headers.get('Content-Length'),
-            )
+            with get_session('elevenlabs').post(url, json=data, headers=headers, timeout=60, stream=True) as response:
+                logging.info(
+                    "ElevenLabs REST response: status=%s, content-type=%s, length=%s",
+                    response.status_code,
+                    response.headers.get('Content-Type'),
+                    response.headers.get('Content-Length'),
+                )
 
-            if response.status_code == 200:
-                audio_bytes = response.content
-                content_type = (response.headers.get('Content-Type') or '').lower()
-                if not content_type.startswith('audio/'):
-                    logging.error(
-                        "Unexpected ElevenLabs response content-type: %s", content_type or 'unknown'
+                if response.status_code == 200:
+                    content_type = (response.headers.get('Content-Type') or '').lower()
+                    if not content_type.startswith('audio/'):
+                        logging.error(
+                            "Unexpected ElevenLabs response content-type: %s", content_type or 'unknown'
+                        )
+                        raise RuntimeError(f"Unexpected response content type: {content_type or 'unknown'}")
+                    temp_path, head, total_bytes = _spool_audio_chunks(
+                        response.iter_content(chunk_size=TTS_STREAM_CHUNK_BYTES),
+                        output_file,
                     )
-                    raise RuntimeError(f"Unexpected response content type: {content_type or 'unknown'}")
 
-            else:
-                error_detail = response.text
-                try:
-                    payload = response.json()
-                    if isinstance(payload, dict):
-                        error_detail = payload.get('detail') or payload.get('error') or payload.get('message') or error_detail
-                except ValueError:
-                    pass
-
-                logging.error(f"Error from ElevenLabs API: {response.status_code} - {error_detail}")
-                raise RuntimeError(f"ElevenLabs request failed ({response.status_code}): {error_detail}")
-
-        if len(audio_bytes) < 1024:
-            logging.error(
-                "ElevenLabs audio payload too small (%s bytes) for lang=%s, model=%s",
-                len(audio_bytes),
-                language_code,
-                model_id,
-            )
-            raise RuntimeError("Received incomplete audio from ElevenLabs")
+                else:
+                    error_detail = response.text
+                    try:
+                        payload = response.json()
+                        if isinstance(payload, dict):
+                            error_detail = payload.get('detail') or payload.get('error') or payload.get('message') or error_detail
+                    except ValueError:
+                        pass
 
-        signature = audio_bytes[:3]
-        if not (signature.startswith(b'ID3') or audio_bytes[:2] in {b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'}):
-            logging.error("ElevenLabs audio signature invalid: %s", signature)
-            raise RuntimeError("Received invalid audio data from ElevenLabs")
+                    logging.error(f"Error from ElevenLabs API: {response.status_code} - {error_detail}")
+                    raise RuntimeError(f"ElevenLabs request failed ({response.status_code}): {error_detail}")
 
-        with open(output_file, "wb") as f:
-            f.write(audio_bytes)
+        try:
+            if total_bytes < 1024:
+                logging.error(
+                    "ElevenLabs audio payload too small (%s bytes) for lang=%s, model=%s",
+                    total_bytes,
+                    language_code,
+                    model_id,
+                )
+                raise RuntimeError("Received incomplete audio from ElevenLabs")
+
+            signature = head[:3]
+            if not (signature.startswith(b'ID3') or head[:2] in {b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'}):
+                logging.error("ElevenLabs audio signature invalid: %s", signature)
+                raise RuntimeError("Received invalid audio data from ElevenLabs")
+
+            os.replace(temp_path, output_file)
+        except Exception:
+            _discard_temp_file(temp_path)
+            raise
+        # Subtitles for this voiceover are aligned to the script instead of re-transcribed
+        write_script_sidecar(output_file, text, language_code, voice_id=voice_id, model_id=model_id)
         return output_file
     except Exception as e:
         logging.error(f"Error generating voice: {str(e)}")
         raise
 
 def extract_audio_from_video(video_path, output_audio_path):
-    """Extract audio from video using ffmpeg"""
+    """Extract audio from video using ffmpeg; the codec follows the output suffix (.ogg/.flac/.wav)"""
     try:
         logging.info(f"🎵 Starting audio extraction from video: {Path(video_path).name}")
         logging.info(f"📂 Output audio path: {output_audio_path}")
@@ -522,7 +566,7 @@ def extract_audio_from_video(video_path, output_audio_path):
         (
             ffmpeg
             .input(str(video_path))
-            .output(str(output_audio_path), acodec='pcm_s16le', ac=1, ar='16000')
+            .output(str(output_audio_path), vn=None, **whisper_chunking.extraction_output_args(output_audio_path))
             .global_args('-threads', FFMPEG_THREAD_STR)
             .overwrite_output()
             .run(capture_stdout=True, capture_stderr=True)
@@ -544,6 +588,16 @@ def extract_audio_from_video(video_path, output_audio_path):
         logging.error(f"❌ Error extracting audio: {str(e)}")
         return False
 
+TRANSCRIPTION_PROMPT = "This is a marketing video or advertisement. Please transcribe accurately."
+
+
+def _cached_transcription(media_path):
+    """Return (cache_key, cached_text) for a text-format transcription of *media_path*."""
+    key = transcription_cache.cache_key(media_path, prompt=TRANSCRIPTION_PROMPT, response_format='text')
+    cached = transcription_cache.get(key)
+    return key, (cached or {}).get('text')
+
+
 def transcribe_audio(audio_file_path):
     """Transcribe audio using OpenAI Whisper"""
     if not openai_client:
@@ -551,6 +605,11 @@ def transcribe_audio(audio_file_path):
         return None
         
     try:
+        cache_key, cached_text = _cached_transcription(audio_file_path)
+        if cached_text:
+            logging.info(f"♻️  Reusing cached transcription for {Path(audio_file_path).name}")
+            return cached_text
+
         # Get file info
         file_size = Path(audio_file_path).stat().st_size / (1024 * 1024)  # MB
         logging.info(f"🎤 Starting audio transcription with OpenAI Whisper")
@@ -560,14 +619,21 @@ def transcribe_audio(audio_file_path):
         import time
         start_time = time.time()
         
-        with open(audio_file_path, "rb") as audio_file:
-            logging.info("📤 Sending audio to OpenAI Whisper API...")
-            transcription = openai_client.audio.transcriptions.create(
-                file=audio_file,
-                model="whisper-1",
-                response_format="text",
-                prompt="This is a marketing video or advertisement. Please transcribe accurately."
-            )
+        def transcribe_chunk(chunk_path):
+            with open(chunk_path, "rb") as audio_file:
+                logging.info(f"📤 Sending {Path(chunk_path).name} to OpenAI Whisper API...")
+                text = openai_client.audio.transcriptions.create(
+                    file=audio_file,
+                    model="whisper-1",
+                    response_format="text",
+                    prompt=TRANSCRIPTION_PROMPT
+                )
+            return {'text': text, 'segments': []}
+
+        # Long or >25MB inputs are split on pauses and transcribed concurrently
+        transcription = whisper_chunking.transcribe_with_chunking(audio_file_path, transcribe_chunk).get('text')
+        if transcription:
+            transcription_cache.put(cache_key, {'text': transcription})
         
         processing_time = time.time() - start_time
         transcription_length = len(transcription) if transcription else 0
@@ -594,22 +660,35 @@ def transcribe_video(video_file_path):
         video_size = Path(video_file_path).stat().st_size / (1024 * 1024)  # MB
         logging.info(f"📊 Video file size: {video_size:.2f} MB")
         
+        # A re-uploaded source video skips extraction and Whisper entirely
+        video_cache_key, cached_text = _cached_transcription(video_file_path)
+        if cached_text:
+            logging.info(f"♻️  Reusing cached transcription for {Path(video_file_path).name}")
+            return cached_text
+        
         import time
         workflow_start_time = time.time()
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        temp_dir = Path("temp_transcription")
-        temp_dir.mkdir(exist_ok=True)
+        # Scratch space next to the video, i.e. inside the session workspace
+        temp_dir = Path(tempfile.mkdtemp(prefix="transcription_", dir=str(Path(video_file_path).parent)))
         logging.info(f"📁 Created temp directory: {temp_dir}")
         
-        temp_audio_path = temp_dir / f"temp_audio_{timestamp}.wav"
+        # Compressed speech (Opus by default) uploads ~10x faster than PCM WAV
+        temp_audio_path = temp_dir / f"temp_audio_{timestamp}{whisper_chunking.TRANSCRIPTION_AUDIO_SUFFIX}"
         
         # Step 1: Extract audio
         logging.info("🔄 Step 1/2: Extracting audio from video...")
         if not extract_audio_from_video(video_file_path, temp_audio_path):
-            logging.error("❌ Audio extraction failed - aborting transcription")
-            return None
+            if temp_audio_path.suffix == '.wav':
+                logging.error("❌ Audio extraction failed - aborting transcription")
+                return None
+            logging.warning(f"⚠️  {temp_audio_path.suffix} extraction failed, retrying as WAV")
+            temp_audio_path = temp_audio_path.with_suffix('.wav')
+            if not extract_audio_from_video(video_file_path, temp_audio_path):
+                logging.error("❌ Audio extraction failed - aborting transcription")
+                return None
         
         # Step 2: Transcribe audio
         logging.info("🔄 Step 2/2: Transcribing extracted audio...")
@@ -618,19 +697,15 @@ def transcribe_video(video_file_path):
         # Clean up temporary files
         logging.info("🧹 Cleaning up temporary files...")
         try:
-            if temp_audio_path.exists():
-                os.remove(temp_audio_path)
-                logging.info(f"🗑️  Removed temp audio file: {temp_audio_path.name}")
-            
-            if temp_dir.exists() and not any(temp_dir.iterdir()):
-                temp_dir.rmdir()
-                logging.info(f"🗑️  Removed empty temp directory")
+            shutil.rmtree(temp_dir)
+            logging.info(f"🗑️  Removed temp directory: {temp_dir.name}")
         except Exception as e:
             logging.warning(f"⚠️  Error cleaning up temp files: {str(e)}")
         
         total_time = time.time() - workflow_start_time
         
         if transcription:
+            transcription_cache.put(video_cache_key, {'text': transcription})
             logging.info(f"🎉 Video transcription completed successfully!")
             logging.info(f"⏱️  Total workflow time: {total_time:.2f} seconds")
         else:
@@ -654,64 +729,63 @@ def get_video_duration(video_file):
 
 
 
+def _music_source(video_file, custom_music_file, original_volume):
+    """Return (input_node, needs_volume) for the custom music track.
+
+    The looped/trimmed bed is rendered once per (track, duration, volume) and
+    shared by every language instead of re-decoding the music each time.
+    """
+    video_duration = music_bed_cache.probe_duration(video_file)
+    music_bed = None
+    if video_duration is None:
+        logging.error("Could not determine video duration, using original music duration")
+    else:
+        music_bed = music_bed_cache.get_music_bed(custom_music_file, video_duration, original_volume)
+
+    if music_bed:
+        return ffmpeg.input(str(music_bed)), False
+    return ffmpeg.input(str(custom_music_file)), True
+
+
+def _background_stream(video, original_volume, use_instrumental, music=None):
+    """Return the bed under the voiceover: custom music, or the video's own (instrumental) audio."""
+    if music is not None:
+        # Custom music mode: replace original audio entirely with custom music + voiceover
+        music_input, needs_volume = music
+        return ffmpeg.filter(music_input, 'volume', original_volume) if needs_volume else music_input
+
+    # Original mode: mix voiceover with original/instrumental video audio
+    # If using instrumental version, we don't need to lower the original volume as much
+    if use_instrumental:
+        original_volume = min(original_volume * 1.5, 1.0)  # Boost instrumental audio a bit
+    return ffmpeg.filter(video.audio, 'volume', original_volume)
+
+
+def _mix_over_background(background, audio, audio_file, voiceover_volume, music_mode):
+    """Build the amix of *background* with one voiceover."""
+    if music_mode and not (audio_file and Path(audio_file).exists() and audio):
+        # No voiceover - just use custom music at specified volume
+        return background
+    # 'first' keeps the bed's duration so music plays for the full video
+    return ffmpeg.filter([
+        background,
+        ffmpeg.filter(audio, 'volume', voiceover_volume)
+    ], 'amix', inputs=2, duration='first')
+
+
+def _mixed_audio_stream(video, audio, audio_file, original_volume, voiceover_volume, use_instrumental, music=None):
+    """Build the amix graph for one output; *music* is the (input, needs_volume) pair."""
+    background = _background_stream(video, original_volume, use_instrumental, music)
+    return _mix_over_background(background, audio, audio_file, voiceover_volume, music is not None)
+
+
 def mix_audio_with_video(audio_file, video_file, output_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False, custom_music_file=None):
     """Mix audio with video using ffmpeg-python"""
     try:
         video = ffmpeg.input(str(video_file))
         audio = ffmpeg.input(str(audio_file)) if audio_file else None
-        
-        if custom_music_file:
-            # Custom music mode: replace original audio entirely with custom music + voiceover
-            # Get video duration to match music duration
-            video_duration = get_video_duration(video_file)
-            if video_duration is None:
-                logging.error("Could not determine video duration, using original music duration")
-                custom_music = ffmpeg.input(str(custom_music_file))
-            else:
-                # Process custom music to match video duration
-                custom_music = ffmpeg.input(str(custom_music_file))
-                
-                # Get music duration
-                try:
-                    music_probe = ffmpeg.probe(str(custom_music_file))
-                    music_duration = float(music_probe['streams'][0]['duration'])
-                    
-                    if music_duration < video_duration:
-                        # Music is shorter than video - loop it
-                        loops_needed = int(video_duration / music_duration) + 1
-                        custom_music = ffmpeg.filter(custom_music, 'aloop', loop=loops_needed-1, size=2**31-1)
-                        # Trim to exact video duration
-                        custom_music = ffmpeg.filter(custom_music, 'atrim', duration=video_duration)
-                    elif music_duration > video_duration:
-                        # Music is longer than video - trim it
-                        custom_music = ffmpeg.filter(custom_music, 'atrim', duration=video_duration)
-                    # If durations match, use as-is
-                    
-                except Exception as e:
-                    logging.warning(f"Could not process music duration, using original: {str(e)}")
-                    custom_music = ffmpeg.input(str(custom_music_file))
-            
-            # Mix custom music with voiceover, ensuring final duration matches video
-            if audio_file and Path(audio_file).exists() and audio:
-                # Mix custom music with voiceover - music should play for full video duration
-                mixed_audio = ffmpeg.filter([
-                    ffmpeg.filter(custom_music, 'volume', original_volume),
-                    ffmpeg.filter(audio, 'volume', voiceover_volume)
-                ], 'amix', inputs=2, duration='first')  # Use 'first' to preserve music duration
-            else:
-                # No voiceover - just use custom music at specified volume
-                mixed_audio = ffmpeg.filter(custom_music, 'volume', original_volume)
-            
-        else:
-            # Original mode: mix voiceover with original/instrumental video audio
-            # If using instrumental version, we don't need to lower the original volume as much
-            if use_instrumental:
-                original_volume = min(original_volume * 1.5, 1.0)  # Boost instrumental audio a bit
-            
-            mixed_audio = ffmpeg.filter([
-                ffmpeg.filter(video.audio, 'volume', original_volume),
-                ffmpeg.filter(audio, 'volume', voiceover_volume)
-            ], 'amix', inputs=2, duration='first')
+        music = _music_source(video_file, custom_music_file, original_volume) if custom_music_file else None
+        mixed_audio = _mixed_audio_stream(video, audio, audio_file, original_volume, voiceover_volume, use_instrumental, music)
         
         ffmpeg.output(
             video.video,
@@ -729,6 +803,57 @@ def mix_audio_with_video(audio_file, video_file, output_file, original_volume=0.
         logging.error(f"Error in audio mixing: {str(e)}")
         return False
 
+
+def build_multi_mix(outputs, video_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False, music=None):
+    """Return the merged ffmpeg graph writing every ``(audio_file, output_file)`` in *outputs*.
+
+    The bed is built once and fanned out with ``asplit``; ffmpeg-python refuses
+    to compile a filter node with several outgoing edges.
+    """
+    video = ffmpeg.input(str(video_file))
+    background = _background_stream(video, original_volume, use_instrumental, music)
+    if len(outputs) > 1:
+        split = background.filter_multi_output('asplit', len(outputs))
+        backgrounds = [split[index] for index in range(len(outputs))]
+    else:
+        backgrounds = [background]
+
+    streams = []
+    for (audio_file, output_file), output_background in zip(outputs, backgrounds):
+        audio = ffmpeg.input(str(audio_file))
+        mixed_audio = _mix_over_background(output_background, audio, audio_file, voiceover_volume, music is not None)
+        streams.append(ffmpeg.output(
+            video.video,
+            mixed_audio,
+            str(output_file),
+            acodec='aac',
+            vcodec='copy'
+        ))
+    return ffmpeg.merge_outputs(*streams).global_args('-threads', FFMPEG_THREAD_STR).overwrite_output()
+
+
+def mix_audio_with_video_multi(outputs, video_file, original_volume=0.8, voiceover_volume=1.3, use_instrumental=False, custom_music_file=None):
+    """Mix several voiceovers onto one video in a single ffmpeg run.
+
+    *outputs* is a list of ``(audio_file, output_file)`` pairs. The video is
+    demuxed once and stream-copied into every output, the music bed (or the
+    original audio) is decoded once, and each output gets its own ``amix``.
+    Returns True only if every output was written.
+    """
+    try:
+        music = _music_source(video_file, custom_music_file, original_volume) if custom_music_file else None
+        build_multi_mix(
+            outputs, video_file, original_volume, voiceover_volume, use_instrumental, music
+        ).run(capture_stdout=True, capture_stderr=True)
+
+        return all(Path(output_file).exists() and Path(output_file).stat().st_size > 0 for _, output_file in outputs)
+    except ffmpeg.Error as e:
+        logging.error(f"Error in multi-output audio mixing: {e.stderr.decode() if e.stderr else str(e)}")
+        return False
+    except Exception as e:
+        logging.error(f"Error in multi-output audio mixing: {str(e)}")
+        return False
+
 # ===== ADLOCALIZER ROUTES =====
 
 def list_voices():
@@ -740,11 +865,12 @@ def list_voices():
             }), 503
 
         refresh = request.args.get('refresh') in {'1', 'true', 'True', 'yes'}
+        cached = not refresh and voice_catalog.is_cached(ELEVENLABS_API_KEY)
         voices = get_elevenlabs_voice_catalog(force_refresh=refresh)
         response_payload = {
             'voices': voices,
             'count': len(voices),
-            'cached': not refresh and bool(_voice_catalog_cache),
+            'cached': cached,
             'default_voice_id': voices[0]['id'] if voices else None,
             'message': 'Voices loaded from ElevenLabs' if voices else 'No voices returned from ElevenLabs.',
         }
@@ -779,33 +905,67 @@ def translate():
             logging.error("OpenAI client not initialized")
             return jsonify({'error': 'OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.'}), 500
         
-        translations = {}
+        valid_languages = []
         for lang_code in languages:
             # Support both old and new language codes
             if validate_language_code(lang_code):
-                lang_name = get_language_name(lang_code)
-                logging.info(f"Translating to {lang_name} ({lang_code})")
-                translation = translate_text(text, lang_name, translation_mode)
-                if translation:
-                    logging.info(f"Translation successful for {lang_code}: '{translation[:50]}...'")
-                    translations[lang_code] = translation
-                else:
-                    logging.error(f"Translation failed for {lang_code}")
+                valid_languages.append(lang_code)
             else:
                 logging.warning(f"Unknown language code: {lang_code}")
-        
-        if not translations:
+
+        if not valid_languages:
             logging.error("No translations were generated")
             return jsonify({'error': 'No translations were generated. Please check your OpenAI API key.'}), 500
-        
-        logging.info(f"Returning {len(translations)} translations")
-        return jsonify({'translations': translations})
+
+        return _submit_job('translate', valid_languages, ['translate'], _run_translate_job, text, valid_languages, translation_mode)
     except Exception as e:
         logging.error(f"Translation error: {str(e)}")
         import traceback
         logging.error(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
+
+def _run_translate_job(job_id, text, languages, translation_mode):
+    """Translate into every language concurrently on the network pool."""
+
+    def translate_one(lang_code):
+        adlocalizer_jobs.mark_stage(job_id, lang_code, 'translate', 'running')
+        lang_name = get_language_name(lang_code)
+        logging.info(f"Translating to {lang_name} ({lang_code})")
+        return translate_text(text, lang_name, translation_mode)
+
+    futures = {adlocalizer_jobs.io_executor.submit(translate_one, lang_code): lang_code for lang_code in languages}
+    translations = {}
+    for future in concurrent.futures.as_completed(futures):
+        lang_code = futures[future]
+        try:
+            translation = future.result()
+        except Exception as exc:
+            logging.error(f"Translation failed for {lang_code}: {exc}")
+            translation = None
+        if translation:
+            logging.info(f"Translation successful for {lang_code}: '{translation[:50]}...'")
+            translations[lang_code] = translation
+            adlocalizer_jobs.mark_stage(job_id, lang_code, 'translate', 'done')
+            adlocalizer_jobs.finish_task(job_id, lang_code, True)
+        else:
+            logging.error(f"Translation failed for {lang_code}")
+            adlocalizer_jobs.mark_stage(job_id, lang_code, 'translate', 'failed')
+            adlocalizer_jobs.finish_task(job_id, lang_code, False, 'Translation failed')
+
+    if not translations:
+        logging.error("No translations were generated")
+        adlocalizer_jobs.finish_job(job_id, {
+            'response': {'error': 'No translations were generated. Please check your OpenAI API key.'},
+            'status_code': 500,
+        }, status='error', message='No translations were generated')
+        return
+
+    # Preserve the order the languages were requested in
+    ordered = {lang_code: translations[lang_code] for lang_code in languages if lang_code in translations}
+    logging.info(f"Returning {len(ordered)} translations")
+    adlocalizer_jobs.finish_job(job_id, {'response': {'translations': ordered}})
+
 def generate_voice():
     try:
         data = request.get_json()
@@ -827,64 +987,118 @@ def generate_voice():
         session_id = session.get('session_id', str(uuid.uuid4()))
         session['session_id'] = session_id
         
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         audio_dir = base_dir / "audio"
         audio_dir.mkdir(parents=True, exist_ok=True)
         
-        audio_files = {}
-        voice_errors = {}
         # Create a clean identifier from the first translation (max 20 chars)
         raw_text = list(translations.values())[0][:20]
         # Replace sequences of non-alphanumeric characters with single underscore
         english_identifier = re.sub(r'[^a-zA-Z0-9]+', '_', raw_text.strip())
         # Remove leading/trailing underscores
         english_identifier = english_identifier.strip('_')
-        
-        for lang_code, translation in translations.items():
-            try:
-                safe_translation = (translation or '').strip()
-                if not safe_translation:
-                    logging.warning(f"Skipping voice generation for {lang_code}: translation text missing")
-                    voice_errors[lang_code] = 'No translated text available'
-                    continue
 
-                logging.info(
-                    "Generating voice for %s (%d bytes) | sample: %s",
-                    lang_code,
-                    len(safe_translation.encode('utf-8')),
-                    safe_translation[:80]
-                )
-                output_file = generate_elevenlabs_voice(
-                    safe_translation,
-                    lang_code,
-                    str(audio_dir),
-                    english_identifier,
-                    voice_id,
-                    model_id=voice_model,
-                )
-                if output_file:
-                    audio_files[lang_code] = output_file
-            except Exception as exc:
-                logging.error(f"Voice generation failed for {lang_code}: {exc}")
-                voice_errors[lang_code] = str(exc)
+        return _submit_job(
+            'generate_voice',
+            list(translations.keys()),
+            ['voice'],
+            _run_voice_job,
+            dict(translations),
+            str(audio_dir),
+            english_identifier,
+            voice_id,
+            voice_model,
+        )
+    except Exception as e:
+        logging.error(f"Voice generation error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-        if not audio_files:
-            status_code = 502 if voice_errors else 500
-            return jsonify({
+
+try:
+    ELEVENLABS_MAX_CONCURRENCY = max(1, int(os.environ.get('ELEVENLABS_MAX_CONCURRENCY', '3')))
+except (TypeError, ValueError):
+    ELEVENLABS_MAX_CONCURRENCY = 3
+
+# ElevenLabs enforces per-account concurrency limits; stay under them across jobs. Voice
+# requests get their own pool so queued voiceovers never hold IO workers that Whisper and
+# translation tasks are waiting for.
+_elevenlabs_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=ELEVENLABS_MAX_CONCURRENCY, thread_name_prefix='adlocalizer-elevenlabs'
+)
+
+
+def _run_voice_job(job_id, translations, audio_dir, english_identifier, voice_id, voice_model):
+    """Generate every voiceover concurrently, capped by ELEVENLABS_MAX_CONCURRENCY."""
+
+    def generate_one(lang_code, translation):
+        safe_translation = (translation or '').strip()
+        if not safe_translation:
+            logging.warning(f"Skipping voice generation for {lang_code}: translation text missing")
+            raise ValueError('No translated text available')
+
+        adlocalizer_jobs.mark_stage(job_id, lang_code, 'voice', 'running')
+        logging.info(
+            "Generating voice for %s (%d bytes) | sample: %s",
+            lang_code,
+            len(safe_translation.encode('utf-8')),
+            safe_translation[:80]
+        )
+        return generate_elevenlabs_voice(
+            safe_translation,
+            lang_code,
+            audio_dir,
+            english_identifier,
+            voice_id,
+            model_id=voice_model,
+        )
+
+    futures = {
+        _elevenlabs_executor.submit(generate_one, lang_code, translation): lang_code
+        for lang_code, translation in translations.items()
+    }
+    audio_files = {}
+    voice_errors = {}
+    for future in concurrent.futures.as_completed(futures):
+        lang_code = futures[future]
+        try:
+            output_file = future.result()
+        except Exception as exc:
+            logging.error(f"Voice generation failed for {lang_code}: {exc}")
+            voice_errors[lang_code] = str(exc)
+            output_file = None
+        if output_file:
+            audio_files[lang_code] = output_file
+            adlocalizer_jobs.mark_stage(job_id, lang_code, 'voice', 'done')
+            adlocalizer_jobs.finish_task(job_id, lang_code, True)
+        else:
+            adlocalizer_jobs.mark_stage(job_id, lang_code, 'voice', 'failed')
+            adlocalizer_jobs.finish_task(job_id, lang_code, False, voice_errors.get(lang_code, 'No audio generated'))
+
+    if not audio_files:
+        adlocalizer_jobs.finish_job(job_id, {
+            'response': {
                 'error': 'No audio files were generated. Please check your ElevenLabs API key or selected voice.',
                 'details': voice_errors,
-            }), status_code
+            },
+            'status_code': 502 if voice_errors else 500,
+        }, status='error', message='No audio files were generated')
+        return
 
-        session['audio_files'] = audio_files
+    audio_files = {lang_code: audio_files[lang_code] for lang_code in translations if lang_code in audio_files}
+    response_payload = {'audio_files': audio_files}
+    if voice_errors:
+        response_payload['warnings'] = voice_errors
+    adlocalizer_jobs.finish_job(job_id, {
+        'response': response_payload,
+        'session_updates': {'audio_files': audio_files},
+    })
 
-        response_payload = {'audio_files': audio_files}
-        if voice_errors:
-            response_payload['warnings'] = voice_errors
 
-        return jsonify(response_payload)
-    except Exception as e:
-        logging.error(f"Voice generation error: {str(e)}")
-        return jsonify({'error': str(e)}), 500
+try:
+    ADLOCALIZER_MAX_UPLOAD_BYTES = max(1, int(os.environ.get('ADLOCALIZER_MAX_UPLOAD_MB', '1024'))) * 1024 * 1024
+except (TypeError, ValueError):
+    ADLOCALIZER_MAX_UPLOAD_BYTES = 1024 * 1024 * 1024
+
 
 def upload_video():
     try:
@@ -899,16 +1113,18 @@ def upload_video():
         session_id = session.get('session_id', str(uuid.uuid4()))
         session['session_id'] = session_id
         
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         video_dir = base_dir / "video"
         video_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save video file
+        # Stream to disk in chunks (hashing on the way) instead of buffering the upload
         video_path = video_dir / video_file.filename
-        video_file.save(str(video_path))
+        try:
+            bytes_written = stream_save_file(video_file, video_path, max_bytes=ADLOCALIZER_MAX_UPLOAD_BYTES)
+        except UploadTooLarge as exc:
+            return jsonify({'error': str(exc)}), 413
         
-        # Get file size info
-        original_size_mb = video_path.stat().st_size / (1024 * 1024)
+        original_size_mb = bytes_written / (1024 * 1024)
         logging.info(f"📹 Video uploaded: {video_file.filename} ({original_size_mb:.2f} MB)")
         
         session['video_path'] = str(video_path)
@@ -929,7 +1145,7 @@ def upload_custom_music():
         session_id = session.get('session_id', str(uuid.uuid4()))
         session['session_id'] = session_id
         
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         music_dir = base_dir / "custom_music"
         music_dir.mkdir(parents=True, exist_ok=True)
         
@@ -941,10 +1157,8 @@ def upload_custom_music():
             if not default_music_path.exists():
                 return jsonify({'error': f'Default music file not found: {selected_music}'}), 404
             
-            # Copy default music to session directory
-            import shutil
-            custom_music_path = music_dir / selected_music
-            shutil.copy2(str(default_music_path), str(custom_music_path))
+            # Hardlink the bundled track instead of copying it into every session
+            custom_music_path = workspace_manager.link_shared_asset(default_music_path, music_dir / selected_music)
             
             session['custom_music_path'] = str(custom_music_path)
             session['custom_music_name'] = selected_music.split('.')[0]  # Store name without extension
@@ -966,9 +1180,11 @@ def upload_custom_music():
             if file_extension not in audio_extensions:
                 return jsonify({'error': f'Unsupported audio format: .{file_extension}. Please upload: {", ".join(audio_extensions)}'}), 400
             
-            # Save music file
             custom_music_path = music_dir / music_file.filename
-            music_file.save(str(custom_music_path))
+            try:
+                stream_save_file(music_file, custom_music_path, max_bytes=ADLOCALIZER_MAX_UPLOAD_BYTES)
+            except UploadTooLarge as exc:
+                return jsonify({'error': str(exc)}), 413
             
             session['custom_music_path'] = str(custom_music_path)
             session['custom_music_name'] = music_file.filename.split('.')[0]  # Store name without extension
@@ -978,6 +1194,37 @@ def upload_custom_music():
         logging.error(f"Custom music upload error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+_WORKER_UNAVAILABLE = object()
+
+
+def _separate_in_worker(audio_file, stems_dir, model_name, params):
+    """Run a Demucs job on the resident worker pool.
+
+    Returns the instrumental path, None on failure, or ``_WORKER_UNAVAILABLE``
+    when the caller should fall back to the demucs CLI.
+    """
+    try:
+        options = separation_worker.job_options(params)
+        started = time.perf_counter()
+        stems = separation_worker.separate(audio_file, stems_dir, model_name, options)
+    except separation_worker.SeparationUnavailable as e:
+        logging.info(f"Separation worker unavailable ({e}); using the demucs CLI")
+        return _WORKER_UNAVAILABLE
+    except TimeoutError as e:
+        logging.error(f"DEMUCS worker timed out: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"DEMUCS worker failed: {str(e)}")
+        return None
+    
+    instrumental = next((path for name, path in stems.items() if name.startswith('no_')), None)
+    if not instrumental:
+        logging.error(f"DEMUCS worker produced no instrumental stem: {sorted(stems)}")
+        return None
+    logging.info(f"DEMUCS worker separated {audio_file} with {model_name} in {time.perf_counter() - started:.1f}s")
+    return instrumental
+
+
 def separate_vocals_demucs(audio_file, output_dir):
     """Separate vocals from audio using Demucs"""
     try:
@@ -985,6 +1232,13 @@ def separate_vocals_demucs(audio_file, output_dir):
         stems_dir = Path(output_dir) / "stems"
         stems_dir.mkdir(parents=True, exist_ok=True)
         
+        instrumental = _separate_in_worker(
+            audio_file, stems_dir, 'htdemucs_ft',
+            {'--two-stems': 'vocals', '--mp3': True, '--mp3-bitrate': '320'},
+        )
+        if instrumental is not _WORKER_UNAVAILABLE:
+            return instrumental
+        
         # Run demucs separation with better error handling - use high quality model
         cmd = [
             'python3', '-m', 'demucs.separate',
@@ -1135,19 +1389,14 @@ def separate_vocals_replicate(audio_file, output_dir, model_config):
             logging.error(f"Available URLs: {output}")
             return None
         
-        # Download the file
-        import requests
-        response = requests.get(instrumental_url)
-        if response.status_code != 200:
-            logging.error(f"Failed to download instrumental file: {response.status_code}")
-            return None
-        
-        # Save to output directory
+        # Stream the file to the output directory
         audio_name = Path(audio_file).stem
         instrumental_path = output_path / f"{audio_name}_instrumental_replicate.mp3"
-        
-        with open(instrumental_path, "wb") as f:
-            f.write(response.content)
+        try:
+            http_download.download(instrumental_url, instrumental_path, upstream='replicate')
+        except http_download.DownloadFailed as e:
+            logging.error(f"Failed to download instrumental file: {e}")
+            return None
         
         logging.info(f"Downloaded instrumental file: {instrumental_path}")
         return str(instrumental_path)
@@ -1172,19 +1421,31 @@ def separate_vocals_with_model(audio_file, output_dir, model_id="uvr_mdx"):
         
         logging.info(f"Using model: {model_config['name']} ({model_config['description']})")
         
+        # Stems depend on the engine settings, not on display fields like name/description
+        cache_settings = {key: value for key, value in model_config.items() if key not in ('name', 'description', 'recommended')}
+        cached_dir = Path(output_dir) / "stems" / "cached" / Path(audio_file).stem
+        cached = stem_cache.lookup(audio_file, model_id, cache_settings, cached_dir)
+        if cached:
+            return str(cached['instrumental'])
+        
         # Route to appropriate engine
         if model_config["engine"] == "demucs":
-            return separate_vocals_demucs_model(audio_file, output_dir, model_config)
+            result = separate_vocals_demucs_model(audio_file, output_dir, model_config)
         elif model_config["engine"] == "replicate":
             result = separate_vocals_replicate(audio_file, output_dir, model_config)
             if result is None:
                 logging.warning(f"Replicate API failed for {model_id}, trying fallback to DEMUCS v4")
-                # If Replicate fails, fall back to high-quality DEMUCS v4
+                # If Replicate fails, fall back to high-quality DEMUCS v4; not cached as this model's output
                 return separate_vocals_demucs(audio_file, output_dir)
-            return result
         else:
             logging.error(f"Unknown engine: {model_config['engine']}")
             return None
+        
+        if result:
+            # Demucs writes vocals.<ext> next to no_vocals.<ext>
+            vocals = next(Path(result).parent.glob('vocals.*'), None) if Path(result).stem == 'no_vocals' else None
+            stem_cache.store(audio_file, model_id, cache_settings, result, vocals)
+        return result
             
     except Exception as e:
         logging.error(f"Error in vocal separation with model {model_id}: {str(e)}")
@@ -1197,6 +1458,12 @@ def separate_vocals_demucs_model(audio_file, output_dir, model_config):
         stems_dir = Path(output_dir) / "stems"
         stems_dir.mkdir(parents=True, exist_ok=True)
         
+        instrumental = _separate_in_worker(
+            audio_file, stems_dir, model_config["model_name"], model_config.get("params", {}),
+        )
+        if instrumental is not _WORKER_UNAVAILABLE:
+            return instrumental
+        
         # Build command based on model configuration
         cmd = ['python3', '-m', 'demucs.separate']
         
@@ -1339,6 +1606,12 @@ def remove_vocals():
             'success': False
         }), 503
 
+SUBTITLE_FALLBACK_NOTE = 'Subtitle timing estimated (fallback)'
+
+# Mix every language in one ffmpeg process; set to 0 to always run one process per language
+MULTI_OUTPUT_MIX = os.environ.get('ADLOCALIZER_MULTI_OUTPUT_MIX', '1').lower() not in {'0', 'false', 'no'}
+
+
 def mix_audio():
     try:
         data = request.get_json() or {}
@@ -1351,6 +1624,10 @@ def mix_audio():
         use_custom_music = bool(data.get('use_custom_music', False))
         add_subtitles = bool(data.get('add_subtitles', False))
         subtitle_style = data.get('subtitle_style', DEFAULT_SUBTITLE_STYLE) or DEFAULT_SUBTITLE_STYLE
+        subtitle_timing = data.get('subtitle_timing')
+        if subtitle_timing not in {'auto', 'align', 'transcribe'}:
+            subtitle_timing = None
+        subtitle_backend = normalize_burn_backend(data.get('subtitle_backend'))
 
         audio_files = session.get('audio_files', {})
         video_path = session.get('video_path')
@@ -1382,7 +1659,7 @@ def mix_audio():
         session_id = session.get('session_id', str(uuid.uuid4()))
         session['session_id'] = session_id
 
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         export_dir = base_dir / "export"
         export_dir.mkdir(parents=True, exist_ok=True)
         subtitles_dir = base_dir / "subtitles"
@@ -1392,163 +1669,465 @@ def mix_audio():
         else:
             _init_subtitle_state(False, subtitle_style, None)
 
-        mixed_videos = {}
-        subtitle_summary = {}
-        video_filename = Path(video_path).name
+        plan = {
+            'video_path': video_path,
+            'export_dir': export_dir,
+            'subtitles_dir': subtitles_dir,
+            'original_volume': original_volume,
+            'voiceover_volume': voiceover_volume,
+            'use_vocal_removal': use_vocal_removal,
+            'use_custom_music': use_custom_music,
+            'custom_music_path': custom_music_path,
+            'custom_music_name': session.get('custom_music_name', 'custom_music'),
+            'add_subtitles': add_subtitles,
+            'subtitle_style': subtitle_style,
+            'subtitle_timing': subtitle_timing,
+            'subtitle_backend': subtitle_backend,
+            'available_styles': available_styles,
+            'audio_files': dict(audio_files),
+        }
 
         if use_custom_music and not audio_files:
-            music_name = session.get('custom_music_name', 'custom_music')
-            base_name = video_filename.split('.')[0]
-            if base_name.upper().endswith('_EN'):
-                base_name = re.sub(r'_EN$', '', base_name, flags=re.IGNORECASE)
-            output_file = export_dir / f"{base_name}_music-{music_name}.mp4"
-            if mix_audio_with_video(None, video_path, str(output_file), original_volume, voiceover_volume, use_vocal_removal, custom_music_path):
-                mixed_videos['custom_music'] = str(output_file)
-            if add_subtitles:
-                subtitle_summary['custom_music'] = {
-                    'status': 'skipped',
-                    'error': 'Subtitles require generated voiceovers',
-                }
+            task_ids = ['custom_music']
+            stages = ['mix']
         else:
-            for lang_code, audio_file in audio_files.items():
-                lang_key = lang_code.upper()
-
-                if not os.path.exists(audio_file):
-                    if add_subtitles:
-                        subtitle_summary[lang_key] = {
-                            'status': 'error',
-                            'error': 'Voiceover file missing',
-                        }
-                    continue
+            task_ids = [lang_code.upper() for lang_code in audio_files]
+            stages = ['mix', 'transcribe', 'burn'] if add_subtitles else ['mix']
 
-                base_name = video_filename.split('.')[0]
-                if base_name.upper().endswith('_EN'):
-                    base_name = re.sub(r'_EN$', f'_[{lang_code}]', base_name, flags=re.IGNORECASE)
-                elif re.search(r'\[en\]$', base_name, re.IGNORECASE):
-                    base_name = re.sub(r'\[en\]$', f'[{lang_code}]', base_name, flags=re.IGNORECASE)
-                else:
-                    base_name = f"{base_name}_[{lang_code}]"
-
-                music_override = None
-                if use_custom_music:
-                    music_override = session.get('custom_music_name', 'custom_music')
-                elif use_vocal_removal:
-                    music_override = 'instrumental'
-
-                music_token = _derive_music_token(base_name, music_override)
-                clean_base = _apply_naming_updates(base_name, lang_code, music_token)
-                subtitle_base = _apply_naming_updates(base_name, lang_code, music_token, hook_override='HOOK-sub', ensure_sub_suffix=True)
-
-                output_file = export_dir / f"{clean_base}.mp4"
-                success = mix_audio_with_video(audio_file, video_path, str(output_file), original_volume, voiceover_volume, use_vocal_removal, custom_music_path)
-                if not success:
-                    if add_subtitles:
-                        subtitle_summary[lang_key] = {
-                            'status': 'error',
-                            'error': 'Failed to mix audio with video',
-                        }
-                    continue
+        return _submit_job('mix', task_ids, stages, _run_mix_job, plan)
+    except Exception as e:
+        logging.error(f"Audio mixing error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
-                mixed_videos[lang_key] = {'clean': str(output_file)}
-                summary_entry = {
-                    'status': 'ready',
-                    'clean_filename': Path(output_file).name,
-                    'clean_basename': clean_base,
-                }
-                if add_subtitles:
-                    summary_entry['subtitle_basename'] = subtitle_base
 
+def _build_language_outputs(lang_code, video_filename, plan):
+    """Return (clean_base, subtitle_base) export names for one language."""
+    base_name = video_filename.split('.')[0]
+    if base_name.upper().endswith('_EN'):
+        base_name = re.sub(r'_EN$', f'_[{lang_code}]', base_name, flags=re.IGNORECASE)
+    elif re.search(r'\[en\]$', base_name, re.IGNORECASE):
+        base_name = re.sub(r'\[en\]$', f'[{lang_code}]', base_name, flags=re.IGNORECASE)
+    else:
+        base_name = f"{base_name}_[{lang_code}]"
+
+    music_override = None
+    if plan['use_custom_music']:
+        music_override = plan['custom_music_name']
+    elif plan['use_vocal_removal']:
+        music_override = 'instrumental'
+
+    music_token = _derive_music_token(base_name, music_override)
+    clean_base = _apply_naming_updates(base_name, lang_code, music_token)
+    subtitle_base = _apply_naming_updates(base_name, lang_code, music_token, hook_override='HOOK-sub', ensure_sub_suffix=True)
+    return clean_base, subtitle_base
+
+
+def _run_mix_job(job_id, plan):
+    """Mix, transcribe and burn every language on the shared worker pools.
+
+    Each language is a small DAG: the ffmpeg mix (CPU pool) and the subtitle
+    transcription of the voiceover (network pool) start together, and the burn
+    (CPU pool) runs once both have finished. Results are collected on the job
+    and copied into the user's session when the status endpoint reports them.
+    """
+    video_path = plan['video_path']
+    export_dir = plan['export_dir']
+    add_subtitles = plan['add_subtitles']
+    subtitle_style = plan['subtitle_style']
+    mix_args = (
+        plan['original_volume'],
+        plan['voiceover_volume'],
+        plan['use_vocal_removal'],
+        plan['custom_music_path'],
+    )
+
+    mixed_videos = {}
+    subtitle_summary = {}
+    subtitle_entries = {}
+    video_filename = Path(video_path).name
+
+    if plan['use_custom_music'] and not plan['audio_files']:
+        base_name = video_filename.split('.')[0]
+        if base_name.upper().endswith('_EN'):
+            base_name = re.sub(r'_EN$', '', base_name, flags=re.IGNORECASE)
+        output_file = export_dir / f"{base_name}_music-{plan['custom_music_name']}.mp4"
+        adlocalizer_jobs.mark_stage(job_id, 'custom_music', 'mix', 'running')
+        success = adlocalizer_jobs.cpu_executor.submit(
+            mix_audio_with_video, None, video_path, str(output_file), *mix_args
+        ).result()
+        adlocalizer_jobs.mark_stage(job_id, 'custom_music', 'mix', 'done' if success else 'failed')
+        if success:
+            mixed_videos['custom_music'] = str(output_file)
+        if add_subtitles:
+            subtitle_summary['custom_music'] = {
+                'status': 'skipped',
+                'error': 'Subtitles require generated voiceovers',
+            }
+        adlocalizer_jobs.finish_task(job_id, 'custom_music', success, None if success else 'Failed to mix audio with video')
+    else:
+        contexts = {}
+        futures = {}
+
+        def submit(stage, lang_key, fn, *args):
+            executor = adlocalizer_jobs.io_executor if stage == 'transcribe' else adlocalizer_jobs.cpu_executor
+            adlocalizer_jobs.mark_stage(job_id, lang_key, stage, 'running')
+            futures[executor.submit(fn, *args)] = (stage, lang_key)
+
+        def fail(lang_key, status, error_message, entry_updates=None):
+            ctx = contexts[lang_key]
+            if add_subtitles:
+                ctx['summary'].update({'status': status, 'error': error_message})
+                subtitle_summary[lang_key] = ctx['summary']
+                if entry_updates is not None:
+                    subtitle_entries[lang_key] = entry_updates
+            adlocalizer_jobs.finish_task(job_id, lang_key, status == 'completed', error_message)
+
+        for lang_code, audio_file in plan['audio_files'].items():
+            lang_key = lang_code.upper()
+
+            if not os.path.exists(audio_file):
                 if add_subtitles:
-                    srt_result = generate_srt_file(audio_file, lang_key, subtitle_base, subtitles_dir, openai_client)
-                    if not srt_result.get('success'):
-                        error_message = srt_result.get('error', 'Subtitle transcription failed')
-                        summary_entry.update({'status': 'transcription_failed', 'error': error_message})
-                        _update_subtitle_language_entry(lang_key, {
+                    subtitle_summary[lang_key] = {
+                        'status': 'error',
+                        'error': 'Voiceover file missing',
+                    }
+                adlocalizer_jobs.finish_task(job_id, lang_key, False, 'Voiceover file missing')
+                continue
+
+            clean_base, subtitle_base = _build_language_outputs(lang_code, video_filename, plan)
+            output_file = export_dir / f"{clean_base}.mp4"
+            summary_entry = {
+                'status': 'ready',
+                'clean_filename': output_file.name,
+                'clean_basename': clean_base,
+            }
+            if add_subtitles:
+                summary_entry['subtitle_basename'] = subtitle_base
+
+            contexts[lang_key] = {
+                'audio_file': audio_file,
+                'clean_base': clean_base,
+                'subtitle_base': subtitle_base,
+                'output_file': output_file,
+                'summary': summary_entry,
+                'mixed': None,
+                'srt_result': None,
+            }
+
+            if add_subtitles:
+                submit('transcribe', lang_key, generate_srt_file, audio_file, lang_key, subtitle_base, plan['subtitles_dir'], openai_client, plan['subtitle_timing'])
+
+        def submit_single_mixes(lang_keys):
+            for lang_key in lang_keys:
+                ctx = contexts[lang_key]
+                submit('mix', lang_key, mix_audio_with_video, ctx['audio_file'], video_path, str(ctx['output_file']), *mix_args)
+
+        mix_keys = list(contexts)
+        if MULTI_OUTPUT_MIX and len(mix_keys) > 1:
+            # One ffmpeg process demuxes the video and decodes the music once for every language
+            for lang_key in mix_keys:
+                adlocalizer_jobs.mark_stage(job_id, lang_key, 'mix', 'running')
+            batch_outputs = [(contexts[key]['audio_file'], str(contexts[key]['output_file'])) for key in mix_keys]
+            futures[adlocalizer_jobs.cpu_executor.submit(
+                mix_audio_with_video_multi, batch_outputs, video_path, *mix_args
+            )] = ('mix_batch', tuple(mix_keys))
+        else:
+            submit_single_mixes(mix_keys)
+
+        while futures:
+            done, _ = concurrent.futures.wait(futures.keys(), return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                stage, lang_key = futures.pop(future)
+                if stage == 'mix_batch':
+                    try:
+                        batch_ok = future.result()
+                    except Exception as exc:
+                        logging.error(f"Mix job {job_id} multi-output mix raised: {exc}")
+                        batch_ok = False
+                    if batch_ok:
+                        logging.info(f"Mix job {job_id} mixed {len(lang_key)} language(s) in one ffmpeg run")
+                        # Re-enter the loop as if each language had mixed on its own
+                        for key in lang_key:
+                            resolved = concurrent.futures.Future()
+                            resolved.set_result(True)
+                            futures[resolved] = ('mix', key)
+                    else:
+                        logging.warning(f"Mix job {job_id} multi-output mix failed; falling back to per-language runs")
+                        submit_single_mixes(lang_key)
+                    continue
+
+                ctx = contexts[lang_key]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logging.error(f"Mix job {job_id} {stage} failed for {lang_key}: {exc}")
+                    result = False if stage == 'mix' else {'success': False, 'error': str(exc)}
+
+                if stage == 'mix':
+                    ctx['mixed'] = bool(result)
+                    adlocalizer_jobs.mark_stage(job_id, lang_key, 'mix', 'done' if result else 'failed')
+                    if not result:
+                        fail(lang_key, 'error', 'Failed to mix audio with video')
+                        continue
+                    mixed_videos[lang_key] = {'clean': str(ctx['output_file'])}
+                    if not add_subtitles:
+                        adlocalizer_jobs.finish_task(job_id, lang_key, True)
+                        continue
+                elif stage == 'transcribe':
+                    ctx['srt_result'] = result
+                    transcribed = bool(result.get('success'))
+                    adlocalizer_jobs.mark_stage(job_id, lang_key, 'transcribe', 'done' if transcribed else 'failed')
+                    if ctx['mixed'] is False:
+                        continue
+                    if not transcribed:
+                        error_message = result.get('error', 'Subtitle transcription failed')
+                        fail(lang_key, 'transcription_failed', error_message, {
                             'status': 'transcription_failed',
                             'error': error_message,
-                            'clean_video': str(output_file),
-                            'base_name': clean_base,
-                            'subtitle_basename': subtitle_base,
+                            'clean_video': str(ctx['output_file']),
+                            'base_name': ctx['clean_base'],
+                            'subtitle_basename': ctx['subtitle_base'],
                         })
-                    else:
-                        subtitle_output = export_dir / f"{subtitle_base}.mp4"
-                        fallback_note = 'Subtitle timing estimated (fallback)'
-                        if srt_result.get('fallback_used'):
-                            summary_entry.setdefault('notes', [])
-                            if fallback_note not in summary_entry['notes']:
-                                summary_entry['notes'].append(fallback_note)
-                        burn_result = burn_subtitles_onto_video(
-                            str(output_file),
-                            srt_result['srt_path'],
-                            str(subtitle_output),
-                            lang_key,
-                            subtitle_style,
-                            segments=srt_result.get('segments'),
-                        )
-                        if not burn_result.get('success'):
-                            error_message = burn_result.get('error', 'Failed to burn subtitles')
-                            summary_entry.update({'status': 'burn_failed', 'error': error_message})
-                            _update_subtitle_language_entry(lang_key, {
-                                'status': 'burn_failed',
-                                'error': error_message,
-                                'srt_path': srt_result['srt_path'],
-                                'srt_filename': srt_result['srt_filename'],
-                                'clean_video': str(output_file),
-                                'base_name': clean_base,
-                                'subtitle_basename': subtitle_base,
-                                'transcript_path': srt_result.get('transcript_path'),
-                            })
-                        else:
-                            mixed_videos[lang_key]['subtitled'] = burn_result['output_path']
-                            if burn_result.get('fallback_generated'):
-                                summary_entry.setdefault('notes', [])
-                                if fallback_note not in summary_entry['notes']:
-                                    summary_entry['notes'].append(fallback_note)
-                            summary_entry.update({
-                                'status': 'completed',
-                                'srt_filename': srt_result['srt_filename'],
-                                'subtitle_filename': Path(burn_result['output_path']).name,
-                                'style': subtitle_style,
-                                'fallback_used': srt_result.get('fallback_used', False),
-                                'fallback_generated': burn_result.get('fallback_generated', False),
-                                'transcript_path': srt_result.get('transcript_path'),
-                                'subtitle_basename': subtitle_base,
-                            })
-                            _update_subtitle_language_entry(lang_key, {
-                                'status': 'completed',
-                                'srt_path': srt_result['srt_path'],
-                                'srt_filename': srt_result['srt_filename'],
-                                'subtitle_video': burn_result['output_path'],
-                                'clean_video': str(output_file),
-                                'style': subtitle_style,
-                                'base_name': clean_base,
-                                'subtitle_basename': subtitle_base,
-                                'fallback_used': srt_result.get('fallback_used', False),
-                                'fallback_generated': burn_result.get('fallback_generated', False),
-                                'segments': burn_result.get('segments', srt_result.get('segments', [])),
-                                'notes': summary_entry.get('notes', []),
-                                'transcript_path': srt_result.get('transcript_path'),
-                            })
-
-                if add_subtitles:
-                    subtitle_summary[lang_key] = summary_entry
+                        continue
+                elif stage == 'burn':
+                    _complete_language_burn(job_id, lang_key, ctx, result, subtitle_style, mixed_videos, subtitle_summary, subtitle_entries)
+                    continue
 
-        session['mixed_videos'] = mixed_videos
-        session['used_vocal_removal'] = use_vocal_removal
-        session['used_custom_music'] = use_custom_music
+                # Burn once both the mixed video and the subtitles are ready
+                srt_result = ctx['srt_result']
+                if ctx['mixed'] and srt_result and srt_result.get('success') and lang_key not in subtitle_summary:
+                    if srt_result.get('fallback_used'):
+                        ctx['summary'].setdefault('notes', [])
+                        if SUBTITLE_FALLBACK_NOTE not in ctx['summary']['notes']:
+                            ctx['summary']['notes'].append(SUBTITLE_FALLBACK_NOTE)
+                    subtitle_output = export_dir / f"{ctx['subtitle_base']}.mp4"
+                    submit(
+                        'burn', lang_key, _burn_language_subtitles,
+                        str(ctx['output_file']), srt_result, str(subtitle_output), lang_key, subtitle_style,
+                        plan['subtitle_backend'],
+                    )
 
-        response = {
+    response = {
+        'mixed_videos': mixed_videos,
+        'subtitles_enabled': add_subtitles,
+        'subtitle_data': subtitle_summary,
+        'subtitle_styles': plan['available_styles'],
+        'default_subtitle_style': subtitle_style,
+    }
+    adlocalizer_jobs.finish_job(job_id, {
+        'response': response,
+        'session_updates': {
             'mixed_videos': mixed_videos,
-            'subtitles_enabled': add_subtitles,
-            'subtitle_data': subtitle_summary,
-            'subtitle_styles': available_styles,
-            'default_subtitle_style': subtitle_style,
+            'used_vocal_removal': plan['use_vocal_removal'],
+            'used_custom_music': plan['use_custom_music'],
+        },
+        'subtitle_entries': subtitle_entries,
+    })
+
+
+def _burn_language_subtitles(clean_video, srt_result, subtitle_output, lang_key, subtitle_style, backend=None):
+    return burn_subtitles_onto_video(
+        clean_video,
+        srt_result['srt_path'],
+        subtitle_output,
+        lang_key,
+        subtitle_style,
+        segments=srt_result.get('segments'),
+        backend=backend,
+    )
+
+
+def _complete_language_burn(job_id, lang_key, ctx, burn_result, subtitle_style, mixed_videos, subtitle_summary, subtitle_entries):
+    srt_result = ctx['srt_result']
+    summary_entry = ctx['summary']
+    output_file = ctx['output_file']
+    if not burn_result.get('success'):
+        error_message = burn_result.get('error', 'Failed to burn subtitles')
+        adlocalizer_jobs.mark_stage(job_id, lang_key, 'burn', 'failed')
+        summary_entry.update({'status': 'burn_failed', 'error': error_message})
+        subtitle_summary[lang_key] = summary_entry
+        subtitle_entries[lang_key] = {
+            'status': 'burn_failed',
+            'error': error_message,
+            'srt_path': srt_result['srt_path'],
+            'srt_filename': srt_result['srt_filename'],
+            'clean_video': str(output_file),
+            'base_name': ctx['clean_base'],
+            'subtitle_basename': ctx['subtitle_base'],
+            'transcript_path': srt_result.get('transcript_path'),
         }
-        return jsonify(response)
+        adlocalizer_jobs.finish_task(job_id, lang_key, False, error_message)
+        return
+
+    adlocalizer_jobs.mark_stage(job_id, lang_key, 'burn', 'done')
+    mixed_videos[lang_key]['subtitled'] = burn_result['output_path']
+    if burn_result.get('fallback_generated'):
+        summary_entry.setdefault('notes', [])
+        if SUBTITLE_FALLBACK_NOTE not in summary_entry['notes']:
+            summary_entry['notes'].append(SUBTITLE_FALLBACK_NOTE)
+    summary_entry.update({
+        'status': 'completed',
+        'srt_filename': srt_result['srt_filename'],
+        'subtitle_filename': Path(burn_result['output_path']).name,
+        'style': subtitle_style,
+        'fallback_used': srt_result.get('fallback_used', False),
+        'fallback_generated': burn_result.get('fallback_generated', False),
+        'transcript_path': srt_result.get('transcript_path'),
+        'subtitle_basename': ctx['subtitle_base'],
+        'burn_backend': burn_result.get('backend'),
+        'burn_seconds': burn_result.get('burn_seconds'),
+    })
+    subtitle_summary[lang_key] = summary_entry
+    subtitle_entries[lang_key] = {
+        'status': 'completed',
+        'srt_path': srt_result['srt_path'],
+        'srt_filename': srt_result['srt_filename'],
+        'subtitle_video': burn_result['output_path'],
+        'clean_video': str(output_file),
+        'style': subtitle_style,
+        'base_name': ctx['clean_base'],
+        'subtitle_basename': ctx['subtitle_base'],
+        'fallback_used': srt_result.get('fallback_used', False),
+        'fallback_generated': burn_result.get('fallback_generated', False),
+        'segments': burn_result.get('segments', srt_result.get('segments', [])),
+        'notes': summary_entry.get('notes', []),
+        'transcript_path': srt_result.get('transcript_path'),
+    }
+    adlocalizer_jobs.finish_task(job_id, lang_key, True)
+
+
+JOB_STREAM_POLL_SECONDS = 1.0
+
+
+def _submit_job(kind, task_ids, stages, target, *args):
+    """Queue *target* as a background job for this session and return a 202 with its URLs."""
+    session_id = session.get('session_id', str(uuid.uuid4()))
+    session['session_id'] = session_id
+    task_ids = list(task_ids)
+    job_id = adlocalizer_jobs.create_job(kind, session_id, task_ids, stages)
+    adlocalizer_jobs.start_job(job_id, target, *args)
+    logging.info(f"Queued {kind} job {job_id} for {len(task_ids)} task(s)")
+
+    return jsonify({
+        'job_id': job_id,
+        'kind': kind,
+        'status': 'queued',
+        'status_url': f'/api/adlocalizer/jobs/{job_id}',
+        'result_url': f'/api/adlocalizer/jobs/{job_id}/result',
+        'stream_url': f'/api/adlocalizer/jobs/{job_id}/stream',
+    }), 202
+
+
+def _apply_job_result(job_id, result):
+    """Copy a finished job's session updates into the cookie session exactly once."""
+    if result and adlocalizer_jobs.claim_result_application(job_id):
+        for key, value in result.get('session_updates', {}).items():
+            session[key] = value
+        for lang_key, updates in result.get('subtitle_entries', {}).items():
+            _update_subtitle_language_entry(lang_key, updates)
+        subtitled_videos = result.get('subtitled_videos')
+        if subtitled_videos:
+            mixed_videos = session.get('mixed_videos', {})
+            for lang_key, variants in subtitled_videos.items():
+                current_entry = mixed_videos.get(lang_key)
+                if isinstance(current_entry, dict):
+                    current_entry['subtitled'] = variants['subtitled']
+                elif isinstance(current_entry, str):
+                    mixed_videos[lang_key] = {'clean': current_entry, 'subtitled': variants['subtitled']}
+                else:
+                    mixed_videos[lang_key] = dict(variants)
+            session['mixed_videos'] = mixed_videos
+
+
+def get_adlocalizer_job_status(job_id):
+    """Report job progress; copy finished results into the session once."""
+    try:
+        job = adlocalizer_jobs.get_job(job_id, session.get('session_id'))
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        workspace_manager.touch(session.get('session_id'))
+
+        result = job.get('result') or {}
+        _apply_job_result(job_id, result)
+
+        payload = adlocalizer_jobs.public_job_view(job)
+        payload['result'] = result.get('response')
+        return jsonify(payload)
     except Exception as e:
-        logging.error(f"Audio mixing error: {str(e)}")
+        logging.error(f"Job status error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+# Kept for the original mix-specific status URL
+mix_audio_status = get_adlocalizer_job_status
+
+
+def get_adlocalizer_job_result(job_id):
+    """Return the finished job's response body with its original status code."""
+    try:
+        job = adlocalizer_jobs.get_job(job_id, session.get('session_id'))
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        if job['status'] not in adlocalizer_jobs.FINISHED_STATUSES:
+            return jsonify({
+                'job_id': job_id,
+                'status': job['status'],
+                'progress': job['progress'],
+                'status_message': job['status_message'],
+            }), 202
+
+        result = job.get('result') or {}
+        _apply_job_result(job_id, result)
+        response = result.get('response')
+        if response is None:
+            error_message = job['errors'][-1] if job['errors'] else 'Job finished without a result'
+            return jsonify({'error': error_message}), 500
+        return jsonify(response), result.get('status_code', 200)
+    except Exception as e:
+        logging.error(f"Job result error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+def stream_adlocalizer_job(job_id):
+    """Server-sent events feed of job status until the job finishes."""
+    from flask import Response, stream_with_context
+
+    session_id = session.get('session_id')
+    if not adlocalizer_jobs.get_job(job_id, session_id):
+        return jsonify({'error': 'Job not found'}), 404
+
+    def generate():
+        last_updated = None
+        while True:
+            job = adlocalizer_jobs.get_job(job_id, session_id)
+            if not job:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if job['last_updated'] != last_updated:
+                last_updated = job['last_updated']
+                payload = adlocalizer_jobs.public_job_view(job)
+                # Results are applied to the session by the result endpoint; the
+                # stream only reports progress since it cannot set cookies.
+                payload.pop('result', None)
+                yield f"data: {json.dumps(payload)}\n\n"
+            if job['status'] in adlocalizer_jobs.FINISHED_STATUSES:
+                return
+            time.sleep(JOB_STREAM_POLL_SECONDS)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+try:
+    TRANSCRIBE_MAX_UPLOAD_MB = max(1, int(os.environ.get('TRANSCRIBE_MAX_UPLOAD_MB', '100')))
+except (TypeError, ValueError):
+    TRANSCRIBE_MAX_UPLOAD_MB = 100
+
+
 def transcribe():
     try:
         logging.info("=" * 60)
@@ -1602,7 +2181,7 @@ def transcribe():
         session['session_id'] = session_id
         logging.info(f"🔑 Session ID: {session_id}")
         
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         transcription_dir = base_dir / "transcription"
         transcription_dir.mkdir(parents=True, exist_ok=True)
         logging.info(f"📁 Created transcription directory: {transcription_dir}")
@@ -1617,97 +2196,44 @@ def transcribe():
         
         logging.info("✅ OpenAI client is available")
         
-        # Check file size (limit to 100MB for practical upload limits)
-        logging.info("📏 Checking file size...")
-        file_size_mb = len(media_file.read()) / (1024 * 1024)
-        media_file.seek(0)  # Reset file pointer
-        logging.info(f"📊 File size: {file_size_mb:.2f} MB")
+        video_available_for_vocal_removal = False
+        
+        kind = 'video' if is_video else 'audio'
+        media_path = transcription_dir / f"transcription_{kind}_{timestamp}_{media_file.filename}"
+        logging.info(f"💾 Saving {kind} to: {media_path}")
         
-        if file_size_mb > 100:
-            logging.error(f"❌ File size ({file_size_mb:.1f}MB) exceeds 100MB limit")
+        # The size limit is enforced on the bytes actually streamed; long media is chunked for Whisper
+        try:
+            bytes_written = stream_save_file(media_file, media_path, max_bytes=TRANSCRIBE_MAX_UPLOAD_MB * 1024 * 1024)
+        except UploadTooLarge:
+            logging.error(f"❌ Upload exceeds {TRANSCRIBE_MAX_UPLOAD_MB}MB limit")
             return jsonify({
-                'error': f'File size ({file_size_mb:.1f}MB) exceeds 100MB limit. Please use a smaller file.'
+                'error': f'File size exceeds {TRANSCRIBE_MAX_UPLOAD_MB}MB limit. Please use a smaller file.'
             }), 400
         
-        logging.info("✅ File size check passed")
-        
-        transcription = None
-        video_available_for_vocal_removal = False
-        
-        import time
-        processing_start_time = time.time()
+        file_size_mb = bytes_written / (1024 * 1024)
+        logging.info(f"✅ {kind.capitalize()} saved successfully ({file_size_mb:.2f} MB)")
         
         if is_video:
-            logging.info("🎬 Processing VIDEO file...")
-            # Handle video files (existing workflow)
-            temp_video_path = transcription_dir / f"transcription_video_{timestamp}_{media_file.filename}"
-            logging.info(f"💾 Saving video to: {temp_video_path}")
-            media_file.save(str(temp_video_path))
-            
-            # Verify file was saved
-            if temp_video_path.exists():
-                saved_size = temp_video_path.stat().st_size / (1024 * 1024)  # MB
-                logging.info(f"✅ Video saved successfully ({saved_size:.2f} MB)")
-            else:
-                logging.error("❌ Failed to save video file")
-                return jsonify({'error': 'Failed to save uploaded video file'}), 500
-            
             # Store the transcription video path for later use
-            session['transcription_video_path'] = str(temp_video_path)
+            session['transcription_video_path'] = str(media_path)
             video_available_for_vocal_removal = True
-            
-            # Transcribe video (extracts audio first)
-            logging.info("🎵 Starting video transcription workflow...")
-            transcription = transcribe_video(str(temp_video_path))
-            
-        elif is_audio:
-            logging.info("🎵 Processing AUDIO file...")
-            # Handle audio files directly
-            temp_audio_path = transcription_dir / f"transcription_audio_{timestamp}_{media_file.filename}"
-            logging.info(f"💾 Saving audio to: {temp_audio_path}")
-            media_file.save(str(temp_audio_path))
-            
-            # Verify file was saved
-            if temp_audio_path.exists():
-                saved_size = temp_audio_path.stat().st_size / (1024 * 1024)  # MB
-                logging.info(f"✅ Audio saved successfully ({saved_size:.2f} MB)")
-            else:
-                logging.error("❌ Failed to save audio file")
-                return jsonify({'error': 'Failed to save uploaded audio file'}), 500
-            
-            # Store the transcription audio path for reference
-            session['transcription_audio_path'] = str(temp_audio_path)
-            
-            # Transcribe audio directly
-            logging.info("🎤 Starting audio transcription...")
-            transcription = transcribe_audio(temp_audio_path)
-        
-        total_processing_time = time.time() - processing_start_time
-        
-        if transcription:
-            logging.info("=" * 60)
-            logging.info("🎉 TRANSCRIPTION COMPLETED SUCCESSFULLY!")
-            logging.info(f"⏱️  Total processing time: {total_processing_time:.2f} seconds")
-            logging.info(f"📝 Transcription length: {len(transcription)} characters")
-            logging.info(f"🔧 Vocal removal available: {video_available_for_vocal_removal}")
-            logging.info(f"📄 File type processed: {'video' if is_video else 'audio'}")
-            logging.info("=" * 60)
-            
-            return jsonify({
-                'transcription': transcription,
-                'video_available_for_vocal_removal': video_available_for_vocal_removal,
-                'file_type': 'video' if is_video else 'audio'
-            })
         else:
-            file_type = 'video' if is_video else 'audio'
-            logging.error("=" * 60)
-            logging.error("❌ TRANSCRIPTION FAILED!")
-            logging.error(f"⏱️  Total processing time: {total_processing_time:.2f} seconds")
-            logging.error(f"📄 File type: {file_type}")
-            logging.error(f"💾 File size: {file_size_mb:.2f} MB")
-            logging.error("=" * 60)
-            
-            return jsonify({'error': f'Failed to transcribe {file_type}. Please check your OpenAI API key and try again.'}), 500
+            # Store the transcription audio path for reference
+            session['transcription_audio_path'] = str(media_path)
+        
+        media_path = str(media_path)
+        
+        return _submit_job(
+            'transcribe',
+            ['transcription'],
+            ['transcribe'],
+            _run_transcribe_job,
+            media_path,
+            is_video,
+            video_available_for_vocal_removal,
+            file_size_mb,
+        )
     except Exception as e:
         logging.error("=" * 60)
         logging.error("💥 TRANSCRIPTION ERROR - EXCEPTION OCCURRED!")
@@ -1718,13 +2244,69 @@ def transcribe():
         logging.error("=" * 60)
         return jsonify({'error': str(e)}), 500
 
+
+def _run_transcribe_job(job_id, media_path, is_video, video_available_for_vocal_removal, file_size_mb):
+    """Run Whisper for an uploaded file off the request thread."""
+    processing_start_time = time.time()
+    file_type = 'video' if is_video else 'audio'
+
+    adlocalizer_jobs.mark_stage(job_id, 'transcription', 'transcribe', 'running')
+    future = adlocalizer_jobs.io_executor.submit(
+        transcribe_video if is_video else transcribe_audio,
+        media_path,
+    )
+    try:
+        transcription = future.result()
+    except Exception as exc:
+        logging.error(f"❌ Transcription raised: {exc}")
+        transcription = None
+
+    total_processing_time = time.time() - processing_start_time
+
+    if transcription:
+        logging.info("=" * 60)
+        logging.info("🎉 TRANSCRIPTION COMPLETED SUCCESSFULLY!")
+        logging.info(f"⏱️  Total processing time: {total_processing_time:.2f} seconds")
+        logging.info(f"📝 Transcription length: {len(transcription)} characters")
+        logging.info(f"🔧 Vocal removal available: {video_available_for_vocal_removal}")
+        logging.info(f"📄 File type processed: {file_type}")
+        logging.info("=" * 60)
+
+        adlocalizer_jobs.mark_stage(job_id, 'transcription', 'transcribe', 'done')
+        adlocalizer_jobs.finish_task(job_id, 'transcription', True)
+        adlocalizer_jobs.finish_job(job_id, {
+            'response': {
+                'transcription': transcription,
+                'video_available_for_vocal_removal': video_available_for_vocal_removal,
+                'file_type': file_type,
+            },
+        })
+        return
+
+    logging.error("=" * 60)
+    logging.error("❌ TRANSCRIPTION FAILED!")
+    logging.error(f"⏱️  Total processing time: {total_processing_time:.2f} seconds")
+    logging.error(f"📄 File type: {file_type}")
+    logging.error(f"💾 File size: {file_size_mb:.2f} MB")
+    logging.error("=" * 60)
+
+    error_message = f'Failed to transcribe {file_type}. Please check your OpenAI API key and try again.'
+    adlocalizer_jobs.mark_stage(job_id, 'transcription', 'transcribe', 'failed')
+    adlocalizer_jobs.finish_task(job_id, 'transcription', False, error_message)
+    adlocalizer_jobs.finish_job(job_id, {
+        'response': {'error': error_message},
+        'status_code': 500,
+    }, status='error', message='Transcription failed')
+
+
 def download_adlocalizer_file(filename):
     try:
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
         
-        file_path = Path(f"temp_files/{session_id}/export/{filename}")
+        file_path = workspace_manager.WORKSPACE_ROOT / session_id / "export" / filename
         if not file_path.exists():
             return jsonify({'error': 'File not found'}), 404
         
@@ -1757,6 +2339,7 @@ def download_subtitle_file(filename):
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
 
         state = _get_subtitle_state()
         if not state or not state.get('subtitles_dir'):
@@ -1785,6 +2368,7 @@ def reburn_subtitles():
         data = request.get_json() or {}
         lang_code = (data.get('language') or '').upper()
         requested_style = data.get('style') or DEFAULT_SUBTITLE_STYLE
+        requested_backend = normalize_burn_backend(data.get('backend'))
 
         if not lang_code:
             return jsonify({'error': 'Language code is required'}), 400
@@ -1809,70 +2393,30 @@ def reburn_subtitles():
         if not srt_path or not clean_video or not base_name or not subtitle_base:
             return jsonify({'error': 'Subtitle data is incomplete for this language'}), 400
 
-        subtitle_output = entry.get('subtitle_video')
-        if not subtitle_output:
-            subtitle_output = str(Path(clean_video).with_name(f"{subtitle_base}.mp4"))
-
-        burn_result = burn_subtitles_onto_video(
-            clean_video,
-            srt_path,
-            subtitle_output,
-            lang_code,
-            requested_style,
-        )
-
-        if not burn_result.get('success'):
-            return jsonify({'error': burn_result.get('error', 'Failed to burn subtitles')}), 500
+        audio_file = None
+        if not Path(srt_path).exists():
+            # Rebuild a cleaned-up SRT from the cached Whisper response instead of failing
+            audio_file = _session_audio_file(lang_code)
+            if not audio_file or not os.path.exists(audio_file):
+                return jsonify({'error': 'Subtitle file missing and voiceover audio unavailable'}), 404
 
-        notes = list(entry.get('notes', []))
-        if burn_result.get('fallback_generated'):
-            note_text = 'Subtitle timing estimated (fallback)'
-            if note_text not in notes:
-                notes = notes + [note_text]
-
-        _update_subtitle_language_entry(lang_code, {
-            'status': 'completed',
-            'subtitle_video': burn_result['output_path'],
-            'subtitle_filename': Path(burn_result['output_path']).name,
+        plan = {
+            'retry': False,
+            'lang_code': lang_code,
             'style': requested_style,
-            'fallback_used': entry.get('fallback_used', False),
-            'fallback_generated': burn_result.get('fallback_generated', False),
-            'segments': burn_result.get('segments', entry.get('segments', [])),
-            'notes': notes,
-            'transcript_path': entry.get('transcript_path'),
+            'backend': requested_backend,
+            'entry': dict(entry),
+            'audio_file': audio_file,
+            'srt_path': srt_path,
+            'srt_base': Path(srt_path).stem,
+            'subtitles_dir': Path(srt_path).parent,
+            'clean_video': clean_video,
             'base_name': base_name,
-            'subtitle_basename': subtitle_base,
-        })
-
-        mixed_videos = session.get('mixed_videos', {})
-        current_entry = mixed_videos.get(lang_code)
-        if isinstance(current_entry, dict):
-            current_entry['subtitled'] = burn_result['output_path']
-        elif isinstance(current_entry, str):
-            mixed_videos[lang_code] = {
-                'clean': current_entry,
-                'subtitled': burn_result['output_path'],
-            }
-        else:
-            mixed_videos[lang_code] = {
-                'clean': clean_video,
-                'subtitled': burn_result['output_path'],
-            }
-        session['mixed_videos'] = mixed_videos
-
-        payload = {
-            'language': lang_code,
-            'status': 'completed',
-            'style': requested_style,
-            'subtitle_filename': Path(burn_result['output_path']).name,
-            'srt_filename': Path(srt_path).name,
-            'fallback_used': entry.get('fallback_used', False),
-            'fallback_generated': burn_result.get('fallback_generated', False),
-            'notes': notes,
-            'transcript_path': entry.get('transcript_path'),
+            'subtitle_base': subtitle_base,
+            'subtitle_output': entry.get('subtitle_video') or str(Path(clean_video).with_name(f"{subtitle_base}.mp4")),
         }
-
-        return jsonify({'success': True, 'subtitle': payload, 'mixed_videos': {lang_code: mixed_videos[lang_code]}})
+        stages = ['transcribe', 'burn'] if audio_file else ['burn']
+        return _submit_job('subtitles', [lang_code], stages, _run_subtitle_job, plan)
     except Exception as e:
         logging.error(f"Re-burn subtitles error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -1883,6 +2427,7 @@ def retry_subtitles():
         data = request.get_json() or {}
         lang_code = (data.get('language') or '').upper()
         requested_style = data.get('style') or DEFAULT_SUBTITLE_STYLE
+        requested_backend = normalize_burn_backend(data.get('backend'))
 
         if not lang_code:
             return jsonify({'error': 'Language code is required'}), 400
@@ -1899,8 +2444,7 @@ def retry_subtitles():
         if not entry:
             return jsonify({'error': f'No subtitles found for {lang_code}'}), 404
 
-        audio_files = session.get('audio_files', {})
-        audio_file = audio_files.get(lang_code)
+        audio_file = _session_audio_file(lang_code)
         if not audio_file or not os.path.exists(audio_file):
             return jsonify({'error': 'Voiceover audio missing for retry'}), 404
 
@@ -1914,81 +2458,134 @@ def retry_subtitles():
         if not session_id:
             return jsonify({'error': 'No active session'}), 404
 
-        base_dir = Path(f"temp_files/{session_id}")
+        base_dir = workspace_manager.session_workspace(session_id)
         subtitles_dir = Path(state.get('subtitles_dir') or (base_dir / 'subtitles'))
 
-        srt_result = generate_srt_file(audio_file, lang_code, subtitle_base, subtitles_dir, openai_client)
-        if not srt_result.get('success'):
-            return jsonify({'error': srt_result.get('error', 'Subtitle transcription failed')}), 500
-
-        subtitle_output = entry.get('subtitle_video') or str(Path(clean_video).with_name(f"{subtitle_base}.mp4"))
-        fallback_notes = list(entry.get('notes', []))
-        note_text = 'Subtitle timing estimated (fallback)'
-        if srt_result.get('fallback_used') and note_text not in fallback_notes:
-            fallback_notes = fallback_notes + [note_text]
-        burn_result = burn_subtitles_onto_video(
-            clean_video,
-            srt_result['srt_path'],
-            subtitle_output,
-            lang_code,
-            requested_style,
-            segments=srt_result.get('segments'),
-        )
-
-        if not burn_result.get('success'):
-            return jsonify({'error': burn_result.get('error', 'Failed to burn subtitles')}), 500
-
-        if burn_result.get('fallback_generated') and note_text not in fallback_notes:
-            fallback_notes = fallback_notes + [note_text]
-
-        _update_subtitle_language_entry(lang_code, {
-            'status': 'completed',
-            'srt_path': srt_result['srt_path'],
-            'srt_filename': srt_result['srt_filename'],
-            'subtitle_video': burn_result['output_path'],
-            'subtitle_filename': Path(burn_result['output_path']).name,
+        plan = {
+            'retry': True,
+            'lang_code': lang_code,
             'style': requested_style,
+            'backend': requested_backend,
+            'entry': dict(entry),
+            'audio_file': audio_file,
+            'srt_path': None,
+            'srt_base': subtitle_base,
+            'subtitles_dir': subtitles_dir,
+            'clean_video': clean_video,
             'base_name': base_name,
-            'subtitle_basename': subtitle_base,
-            'fallback_used': srt_result.get('fallback_used', False),
-            'fallback_generated': burn_result.get('fallback_generated', False),
-            'segments': burn_result.get('segments', srt_result.get('segments', [])),
-            'notes': fallback_notes,
-            'transcript_path': srt_result.get('transcript_path'),
-        })
-
-        mixed_videos = session.get('mixed_videos', {})
-        if isinstance(mixed_videos.get(lang_code), dict):
-            mixed_videos[lang_code]['subtitled'] = burn_result['output_path']
-        elif isinstance(mixed_videos.get(lang_code), str):
-            mixed_videos[lang_code] = {
-                'clean': mixed_videos[lang_code],
-                'subtitled': burn_result['output_path'],
-            }
-        else:
-            mixed_videos[lang_code] = {
-                'clean': clean_video,
-                'subtitled': burn_result['output_path'],
-            }
-        session['mixed_videos'] = mixed_videos
-
-        payload = {
-            'language': lang_code,
-            'status': 'completed',
-            'style': requested_style,
-            'srt_filename': srt_result['srt_filename'],
-            'subtitle_filename': Path(burn_result['output_path']).name,
-            'fallback_used': srt_result.get('fallback_used', False),
-            'fallback_generated': burn_result.get('fallback_generated', False),
-            'notes': fallback_notes,
-            'transcript_path': srt_result.get('transcript_path'),
+            'subtitle_base': subtitle_base,
+            'subtitle_output': entry.get('subtitle_video') or str(Path(clean_video).with_name(f"{subtitle_base}.mp4")),
         }
-
-        return jsonify({'success': True, 'subtitle': payload, 'mixed_videos': {lang_code: mixed_videos[lang_code]}})
+        return _submit_job('subtitles', [lang_code], ['transcribe', 'burn'], _run_subtitle_job, plan)
     except Exception as e:
         logging.error(f"Retry subtitles error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+
+def _run_subtitle_job(job_id, plan):
+    """Re-transcribe (when needed) and burn one language's subtitles off the request thread.
+
+    A retry always regenerates the SRT and takes its timing and notes from the
+    new transcription; a re-burn reuses the stored SRT, rebuilding it only when
+    the file has gone missing, and keeps the entry's existing metadata.
+    """
+    lang_code = plan['lang_code']
+    entry = plan['entry']
+
+    def fail(stage, error_message):
+        adlocalizer_jobs.mark_stage(job_id, lang_code, stage, 'failed')
+        adlocalizer_jobs.finish_task(job_id, lang_code, False, error_message)
+        adlocalizer_jobs.finish_job(job_id, {
+            'response': {'error': error_message},
+            'status_code': 500,
+        }, status='error', message='Subtitle processing failed')
+
+    srt_path = plan['srt_path']
+    srt_result = None
+    if plan['audio_file']:
+        adlocalizer_jobs.mark_stage(job_id, lang_code, 'transcribe', 'running')
+        try:
+            srt_result = adlocalizer_jobs.io_executor.submit(
+                generate_srt_file, plan['audio_file'], lang_code, plan['srt_base'], plan['subtitles_dir'], openai_client
+            ).result()
+        except Exception as exc:
+            logging.error(f"Subtitle job {job_id} transcription raised: {exc}")
+            srt_result = {'success': False, 'error': str(exc)}
+        if not srt_result.get('success'):
+            fail('transcribe', srt_result.get('error', 'Subtitle transcription failed'))
+            return
+        adlocalizer_jobs.mark_stage(job_id, lang_code, 'transcribe', 'done')
+        srt_path = srt_result['srt_path']
+
+    # A retry describes the fresh transcription; a re-burn keeps what the entry already records
+    source = srt_result if plan['retry'] else entry
+    notes = list(entry.get('notes', []))
+    if plan['retry'] and srt_result.get('fallback_used') and SUBTITLE_FALLBACK_NOTE not in notes:
+        notes.append(SUBTITLE_FALLBACK_NOTE)
+
+    adlocalizer_jobs.mark_stage(job_id, lang_code, 'burn', 'running')
+    try:
+        burn_result = adlocalizer_jobs.cpu_executor.submit(
+            burn_subtitles_onto_video,
+            plan['clean_video'],
+            srt_path,
+            plan['subtitle_output'],
+            lang_code,
+            plan['style'],
+            segments=srt_result.get('segments') if plan['retry'] else None,
+            backend=plan['backend'],
+        ).result()
+    except Exception as exc:
+        logging.error(f"Subtitle job {job_id} burn raised: {exc}")
+        burn_result = {'success': False, 'error': str(exc)}
+    if not burn_result.get('success'):
+        fail('burn', burn_result.get('error', 'Failed to burn subtitles'))
+        return
+    adlocalizer_jobs.mark_stage(job_id, lang_code, 'burn', 'done')
+
+    if burn_result.get('fallback_generated') and SUBTITLE_FALLBACK_NOTE not in notes:
+        notes.append(SUBTITLE_FALLBACK_NOTE)
+
+    output_path = burn_result['output_path']
+    srt_filename = srt_result['srt_filename'] if plan['retry'] else Path(srt_path).name
+    entry_updates = {
+        'status': 'completed',
+        'srt_path': srt_path,
+        'srt_filename': srt_filename,
+        'subtitle_video': output_path,
+        'subtitle_filename': Path(output_path).name,
+        'style': plan['style'],
+        'base_name': plan['base_name'],
+        'subtitle_basename': plan['subtitle_base'],
+        'fallback_used': source.get('fallback_used', False),
+        'fallback_generated': burn_result.get('fallback_generated', False),
+        'segments': burn_result.get('segments', source.get('segments', [])),
+        'notes': notes,
+        'transcript_path': source.get('transcript_path'),
+    }
+    payload = {
+        'language': lang_code,
+        'status': 'completed',
+        'style': plan['style'],
+        'srt_filename': srt_filename,
+        'subtitle_filename': Path(output_path).name,
+        'fallback_used': entry_updates['fallback_used'],
+        'fallback_generated': entry_updates['fallback_generated'],
+        'notes': notes,
+        'transcript_path': entry_updates['transcript_path'],
+        'burn_backend': burn_result.get('backend'),
+        'burn_seconds': burn_result.get('burn_seconds'),
+    }
+
+    variants = {'clean': plan['clean_video'], 'subtitled': output_path}
+    adlocalizer_jobs.finish_task(job_id, lang_code, True)
+    adlocalizer_jobs.finish_job(job_id, {
+        'response': {'success': True, 'subtitle': payload, 'mixed_videos': {lang_code: variants}},
+        'subtitle_entries': {lang_code: entry_updates},
+        'subtitled_videos': {lang_code: variants},
+    })
+
+
 def create_streaming_download_response(file_path, filename):
     """Create optimized streaming response for large file downloads"""
     import os
@@ -2042,10 +2639,11 @@ def serve_audio(filepath):
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
         
         # Remove any directory traversal attempts
         safe_path = Path(filepath).name
-        file_path = Path(f"temp_files/{session_id}/audio/{safe_path}")
+        file_path = workspace_manager.WORKSPACE_ROOT / session_id / "audio" / safe_path
         
         if not file_path.exists():
             return jsonify({'error': 'Audio file not found'}), 404
@@ -2061,10 +2659,11 @@ def serve_video(filepath):
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
         
         # Remove any directory traversal attempts
         safe_path = Path(filepath).name
-        file_path = Path(f"temp_files/{session_id}/export/{safe_path}")
+        file_path = workspace_manager.WORKSPACE_ROOT / session_id / "export" / safe_path
         
         if not file_path.exists():
             return jsonify({'error': 'Video file not found'}), 404
@@ -2090,6 +2689,7 @@ def download_all_adlocalizer():
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
         
         mixed_videos = session.get('mixed_videos', {})
         if not mixed_videos:
@@ -2126,6 +2726,7 @@ def download_all_voiceovers():
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No session found'}), 404
+        workspace_manager.touch(session_id)
         
         audio_files = session.get('audio_files', {})
         if not audio_files:
@@ -2327,6 +2928,8 @@ def create_fast_adlocalizer_zip(files, zip_name):
     finally:
         zip_buffer.close()
 
-# Create necessary directories for AdLocalizer
-Path("temp_files").mkdir(exist_ok=True)
-Path("temp_transcription").mkdir(exist_ok=True) 
+# Evict idle session workspaces under the disk budget, never while a job runs
+workspace_manager.start_scheduler(adlocalizer_jobs.active_session_ids)
+
+# Decode the bundled music library once so music beds never start from MP3
+music_bed_cache.start_background_warmup()
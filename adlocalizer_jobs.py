@@ -0,0 +1,266 @@
+"""Background job registry and bounded worker pools for AdLocalizer.
+
+Long-running AdLocalizer work (per-language mixing, transcription and
+subtitle burns) runs outside the request thread. Jobs are tracked in memory
+the same way the video converter tracks ``processing_jobs`` so the frontend
+can poll a status endpoint instead of holding a worker open for minutes.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import copy
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger('adlocalizer_jobs')
+
+FINISHED_STATUSES = {'completed', 'completed_with_errors', 'error', 'cancelled'}
+
+
+def _env_workers(name: str, default: int) -> int:
+    try:
+        value = int(os.environ.get(name, '0'))
+    except (TypeError, ValueError):
+        value = 0
+    return value if value > 0 else default
+
+
+_cpu_count = os.cpu_count() or 2
+
+# ffmpeg mixes and subtitle burns are CPU bound; keep them to a handful of workers
+CPU_WORKERS = _env_workers('ADLOCALIZER_CPU_WORKERS', max(1, min(4, _cpu_count)))
+# Whisper/ElevenLabs/OpenAI calls mostly wait on the network and can fan out wider
+IO_WORKERS = _env_workers('ADLOCALIZER_IO_WORKERS', 8)
+
+try:
+    JOB_RETENTION_SECONDS = max(300, int(os.environ.get('ADLOCALIZER_JOB_RETENTION_SECONDS', '3600')))
+except (TypeError, ValueError):
+    JOB_RETENTION_SECONDS = 3600
+
+cpu_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix='adlocalizer-cpu')
+io_executor = concurrent.futures.ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='adlocalizer-io')
+
+# Store AdLocalizer jobs in memory (in production, use Redis or similar)
+adlocalizer_jobs: Dict[str, Dict[str, Any]] = {}
+job_lock = threading.Lock()
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def create_job(kind: str, session_id: str, task_ids: Iterable[str], stages: Iterable[str]) -> str:
+    """Register a queued job with one task per id, each walking through *stages*."""
+    job_id = str(uuid.uuid4())
+    stage_list = list(stages)
+    task_order = list(task_ids)
+    tasks = {
+        task_id: {
+            'task_id': task_id,
+            'status': 'queued',
+            'stage': None,
+            'stages': {stage: 'pending' for stage in stage_list},
+            'error': None,
+            'started_at': None,
+            'completed_at': None,
+        }
+        for task_id in task_order
+    }
+    with job_lock:
+        adlocalizer_jobs[job_id] = {
+            'job_id': job_id,
+            'kind': kind,
+            'status': 'queued',
+            'progress': 0,
+            'status_message': 'Queued for processing',
+            'total_tasks': len(task_order),
+            'completed_tasks': 0,
+            'failed_tasks': 0,
+            'tasks': tasks,
+            'task_order': task_order,
+            'errors': [],
+            'result': None,
+            'created_at': _now(),
+            'last_updated': _now(),
+            '_session_id': session_id,
+            '_created_ts': time.time(),
+            '_results_applied': False,
+        }
+    return job_id
+
+
+def start_job(job_id: str, target: Callable[..., None], *args: Any) -> None:
+    """Run *target(job_id, \\*args)* on a daemon thread, recording crashes on the job."""
+
+    def runner() -> None:
+        try:
+            target(job_id, *args)
+        except Exception as exc:  # pragma: no cover - defensive guard for worker crashes
+            logger.exception('AdLocalizer job %s failed: %s', job_id, exc)
+            finish_job(job_id, status='error', message='Processing failed', error=str(exc))
+
+    thread = threading.Thread(target=runner, name=f'adlocalizer-job-{job_id[:8]}')
+    thread.daemon = True
+    thread.start()
+
+
+def _refresh_progress_locked(job: Dict[str, Any]) -> None:
+    """Recompute progress from per-task stage states; caller must hold job_lock."""
+    total_stages = 0
+    done_stages = 0
+    for task in job['tasks'].values():
+        for state in task['stages'].values():
+            total_stages += 1
+            if state in ('done', 'failed', 'skipped'):
+                done_stages += 1
+    if total_stages:
+        job['progress'] = min(100.0, (done_stages / total_stages) * 100)
+    job['last_updated'] = _now()
+
+
+def mark_stage(job_id: str, task_id: str, stage: str, state: str, error: Optional[str] = None) -> None:
+    """Record a stage transition (running/done/failed/skipped) for one task."""
+    with job_lock:
+        job = adlocalizer_jobs.get(job_id)
+        if not job:
+            return
+        task = job['tasks'].get(task_id)
+        if not task:
+            return
+        if job['status'] == 'queued':
+            job['status'] = 'processing'
+        task['stages'][stage] = state
+        if state == 'running':
+            task['stage'] = stage
+            task['status'] = 'running'
+            task['started_at'] = task['started_at'] or _now()
+            job['status_message'] = f"Running {stage} for {task_id}"
+        if error:
+            task['error'] = error
+        _refresh_progress_locked(job)
+
+
+def finish_task(job_id: str, task_id: str, success: bool, error: Optional[str] = None) -> None:
+    """Mark a task as finished; any stages that never ran are recorded as skipped."""
+    with job_lock:
+        job = adlocalizer_jobs.get(job_id)
+        if not job:
+            return
+        task = job['tasks'].get(task_id)
+        if not task or task['status'] in ('success', 'failed'):
+            return
+        for stage, state in task['stages'].items():
+            if state in ('pending', 'running'):
+                task['stages'][stage] = 'skipped'
+        task['status'] = 'success' if success else 'failed'
+        task['stage'] = None
+        task['completed_at'] = _now()
+        if error:
+            task['error'] = error
+        job['completed_tasks'] += 1
+        if not success:
+            job['failed_tasks'] += 1
+            job['errors'].append(f"{task_id}: {error or 'Unknown error'}")
+        success_count = job['completed_tasks'] - job['failed_tasks']
+        job['status_message'] = f"Processed {success_count}/{job['total_tasks']} item(s)"
+        _refresh_progress_locked(job)
+
+
+def finish_job(
+    job_id: str,
+    result: Optional[Dict[str, Any]] = None,
+    *,
+    status: Optional[str] = None,
+    message: Optional[str] = None,
+    error: Optional[str] = None,
+) -> None:
+    """Store the final result and derive the terminal status from task outcomes."""
+    with job_lock:
+        job = adlocalizer_jobs.get(job_id)
+        if not job:
+            return
+        if error:
+            job['errors'].append(error)
+        if result is not None:
+            job['result'] = result
+        if status is None:
+            status = 'completed_with_errors' if job.get('failed_tasks') else 'completed'
+        job['status'] = status
+        if message:
+            job['status_message'] = message
+        elif status == 'completed':
+            job['status_message'] = 'Completed successfully'
+        elif status == 'completed_with_errors':
+            job['status_message'] = f"Completed with {job['failed_tasks']} error(s)"
+        job['progress'] = 100.0
+        job['last_updated'] = _now()
+
+
+def get_job(job_id: str, session_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return a deep copy of the job if it belongs to *session_id*."""
+    with job_lock:
+        job = adlocalizer_jobs.get(job_id)
+        if not job or job.get('_session_id') != session_id:
+            return None
+        return copy.deepcopy(job)
+
+
+def public_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip private bookkeeping and order tasks for the status endpoint."""
+    payload = {key: value for key, value in job.items() if not key.startswith('_') and key != 'tasks'}
+    payload['tasks'] = [job['tasks'][task_id] for task_id in job.get('task_order', []) if task_id in job['tasks']]
+    return payload
+
+
+def claim_result_application(job_id: str) -> bool:
+    """Return True exactly once per finished job so session updates are applied once."""
+    with job_lock:
+        job = adlocalizer_jobs.get(job_id)
+        if not job or job['status'] not in FINISHED_STATUSES or job['_results_applied']:
+            return False
+        job['_results_applied'] = True
+        return True
+
+
+def active_session_ids() -> set:
+    """Sessions with a job still running, whose workspaces must not be evicted."""
+    with job_lock:
+        return {
+            job['_session_id']
+            for job in adlocalizer_jobs.values()
+            if job['status'] not in FINISHED_STATUSES and job.get('_session_id')
+        }
+
+
+def cleanup_old_jobs() -> None:
+    """Drop finished jobs older than the retention window."""
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    with job_lock:
+        expired = [
+            job_id
+            for job_id, job in adlocalizer_jobs.items()
+            if job['_created_ts'] < cutoff and job['status'] in FINISHED_STATUSES
+        ]
+        for job_id in expired:
+            del adlocalizer_jobs[job_id]
+    if expired:
+        logger.info('Cleaned up %s old AdLocalizer job(s)', len(expired))
+
+
+def _schedule_cleanup() -> None:
+    while True:
+        time.sleep(600)
+        try:
+            cleanup_old_jobs()
+        except Exception as exc:
+            logger.error('Error during AdLocalizer job cleanup: %s', exc)
+
+
+cleanup_thread = threading.Thread(target=_schedule_cleanup, name='adlocalizer-job-cleanup')
+cleanup_thread.daemon = True
+cleanup_thread.start()
@@ -1,4 +1,5 @@
 from flask import Flask, render_template, request, jsonify, send_file, make_response
+import importlib.util
 import os
 import sys
 import tempfile
@@ -20,6 +21,7 @@ from youtube_upload import build_plan, FEATURE_ALIASES, LANGUAGE_CODES, LANGUAGE
 from youtube_upload.runner import process_plans, write_results_csv
 from youtube_upload.uploader import YoutubeUploadClient, CredentialSetupError
 from oauth_routes import init_auth
+from server_session import init_server_sessions
 
 # Load environment variables from .env file
 try:
@@ -29,11 +31,9 @@ except ImportError:
     pass  # dotenv not available, continue without it
 
 # OpenAI client for creative name correction
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+OPENAI_AVAILABLE = importlib.util.find_spec('openai') is not None
+
+from http_clients import get_openai_client
 
 # Simple post-check normalizer for creative names
 import re
@@ -184,6 +184,7 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-here')
 
+init_server_sessions(app)
 init_auth(app)
 
 # Disable Flask's default request logging for cleaner output
@@ -310,9 +311,9 @@ def correct_creative_name():
     if not api_key:
         return jsonify({"error": "OpenAI API key not configured"}), 500
     
-    # Initialize client with the API key
+    # Reuse the shared, pooled client for this API key
     try:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
     except Exception as e:
         app_logger.error(f"Failed to initialize OpenAI client: {e}")
         return jsonify({"error": "OpenAI client initialization failed"}), 500
@@ -453,6 +454,38 @@ def api_mix_audio():
     except ImportError:
         return jsonify({'error': 'AdLocalizer functionality not available'}), 500
 
+@app.route('/api/mix-audio/status/<job_id>')
+def api_mix_audio_status(job_id):
+    try:
+        from adlocalizer_app import mix_audio_status
+        return mix_audio_status(job_id)
+    except ImportError:
+        return jsonify({'error': 'AdLocalizer functionality not available'}), 500
+
+@app.route('/api/adlocalizer/jobs/<job_id>')
+def api_adlocalizer_job_status(job_id):
+    try:
+        from adlocalizer_app import get_adlocalizer_job_status
+        return get_adlocalizer_job_status(job_id)
+    except ImportError:
+        return jsonify({'error': 'AdLocalizer functionality not available'}), 500
+
+@app.route('/api/adlocalizer/jobs/<job_id>/result')
+def api_adlocalizer_job_result(job_id):
+    try:
+        from adlocalizer_app import get_adlocalizer_job_result
+        return get_adlocalizer_job_result(job_id)
+    except ImportError:
+        return jsonify({'error': 'AdLocalizer functionality not available'}), 500
+
+@app.route('/api/adlocalizer/jobs/<job_id>/stream')
+def api_adlocalizer_job_stream(job_id):
+    try:
+        from adlocalizer_app import stream_adlocalizer_job
+        return stream_adlocalizer_job(job_id)
+    except ImportError:
+        return jsonify({'error': 'AdLocalizer functionality not available'}), 500
+
 @app.route('/api/upload-custom-music', methods=['POST'])
 def api_upload_custom_music():
     try:
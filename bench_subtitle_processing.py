@@ -0,0 +1,184 @@
+"""Micro-benchmark for the per-language subtitle splitters.
+
+Run from the repo root:
+
+    python bench_subtitle_processing.py [--segments 200]
+
+Reports the per-segment cost of refining Japanese and Traditional Chinese
+segments with ``refine_segments``. "before" patches in the old behaviour of
+building a fresh fugashi Tagger / OpenCC converter for every segment; "after"
+uses the shared instances in ``subtitle_processing``. Languages whose optional
+dependency is missing are skipped.
+
+It also checks the single-pass CJK splitter against the original
+slice-per-character implementation on random inputs (exits non-zero on any
+mismatch) and times both on a long transcript.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import random
+import time
+from typing import Callable, List
+
+import subtitle_processing
+
+SAMPLES = {
+    'JP': "Photoroomなら、AIがたった数秒で背景を削除します。商品写真もプロフィール写真も、Appひとつで完璧に仕上がります。",
+    'HK': "使用Photoroom，AI只需几秒钟就能移除背景。无论是商品照片还是头像，一个App就能完美搞定。",
+}
+
+
+@contextlib.contextmanager
+def _fresh_tools():
+    """The old behaviour: construct the Tagger / OpenCC converter inside every call."""
+    shared = (subtitle_processing._get_tagger, subtitle_processing._get_converter)
+
+    def new_tagger():
+        import fugashi
+        return fugashi.Tagger()
+
+    def new_converter():
+        import opencc
+        return opencc.OpenCC('s2t')
+
+    subtitle_processing._get_tagger, subtitle_processing._get_converter = new_tagger, new_converter
+    try:
+        yield
+    finally:
+        subtitle_processing._get_tagger, subtitle_processing._get_converter = shared
+
+
+def _reference_split_cjk(text: str, max_length: int) -> List[str]:
+    """The original quadratic splitter, kept verbatim as the equivalence oracle."""
+    text = subtitle_processing._clean_text(text)
+    is_punctuation = lambda char: char in subtitle_processing.ALL_PUNCTUATION  # noqa: E731
+
+    lines: List[str] = []
+    current = ''
+    i = 0
+    while i < len(text):
+        if current == '' and is_punctuation(text[i]):
+            if lines and len(lines[-1]) + 1 <= max_length:
+                lines[-1] += text[i]
+            i += 1
+            continue
+
+        preserved = False
+        for term in subtitle_processing.PRESERVED_TERMS:
+            if text[i:].startswith(term):
+                preserved = True
+                if len(current) + len(term) <= max_length:
+                    current += term
+                else:
+                    if current:
+                        lines.append(current)
+                    current = term
+                i += len(term)
+                break
+        if preserved:
+            continue
+
+        char = text[i]
+        lookahead = text[i + 1] if i + 1 < len(text) else ''
+        if len(current) + 1 <= max_length:
+            if lookahead and is_punctuation(lookahead) and len(current) + 2 <= max_length:
+                current += char + lookahead
+                i += 2
+            else:
+                current += char
+                i += 1
+        else:
+            if current:
+                lines.append(current)
+            current = char
+            i += 1
+
+        if current and current.endswith(('。', '！', '!', '？', '?')):
+            lines.append(current)
+            current = ''
+
+    if current:
+        lines.append(current)
+
+    return [line for line in lines if line.strip()]
+
+
+def _random_cjk_text(rng: random.Random) -> str:
+    alphabet = (
+        list("背景削除写真商品头像完美搞定사진배경สวัสดีครับ")
+        + list(subtitle_processing.ALL_PUNCTUATION)
+        + list(" \tAIpPp")
+        + subtitle_processing.PRESERVED_TERMS * 3
+        + ["Photo", "Ap", "A"]
+    )
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+
+
+def check_cjk_equivalence(cases: int, seed: int = 0) -> int:
+    """Compare the splitter with the reference on random inputs; returns the mismatch count."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(cases):
+        text = _random_cjk_text(rng)
+        max_length = rng.randint(1, 24)
+        expected = _reference_split_cjk(text, max_length)
+        actual = subtitle_processing._split_cjk_text(text, max_length)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"mismatch for {text!r} (max {max_length}): {expected!r} != {actual!r}")
+    print(f"CJK splitter: {cases - mismatches}/{cases} random inputs identical to the reference")
+    return mismatches
+
+
+def bench_cjk_splitter(repeat: int) -> None:
+    transcript = "使用Photoroom，AI只需几秒钟就能移除背景。无论是商品照片还是头像，一个App就能完美搞定！" * 200
+    before = _per_segment_ms(lambda: _reference_split_cjk(transcript, 16), repeat)
+    after = _per_segment_ms(lambda: subtitle_processing._split_cjk_text(transcript, 16), repeat)
+    print(
+        f"CJK splitter on {len(transcript)} chars: before {before:.2f} ms, "
+        f"after {after:.2f} ms ({before / max(after, 1e-9):.1f}x)"
+    )
+
+
+def _per_segment_ms(func: Callable[[], object], count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - started) * 1000 / count
+
+
+def bench_text_tools(count: int) -> None:
+    available = {'JP': subtitle_processing.HAS_FUGASHI, 'HK': subtitle_processing.HAS_OPENCC}
+    warm_started = time.perf_counter()
+    subtitle_processing.warm_text_tools()
+    print(f"warmup: {(time.perf_counter() - warm_started) * 1000:.1f} ms")
+
+    for language, text in SAMPLES.items():
+        if not available[language]:
+            print(f"{language}: skipped (optional dependency not installed)")
+            continue
+        segment = [{'start': 0.0, 'end': 4.0, 'text': text}]
+        # Both sides time the full refine_segments call; only the tool lifetime differs
+        with _fresh_tools():
+            before = _per_segment_ms(lambda: subtitle_processing.refine_segments(segment, language), count)
+        after = _per_segment_ms(lambda: subtitle_processing.refine_segments(segment, language), count)
+        print(f"{language}: before {before:.3f} ms/segment, after {after:.3f} ms/segment ({before / max(after, 1e-9):.1f}x)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--segments', type=int, default=200, help='segments per measurement')
+    parser.add_argument('--cases', type=int, default=5000, help='random inputs for the splitter equivalence check')
+    args = parser.parse_args()
+    bench_text_tools(args.segments)
+    mismatches = check_cjk_equivalence(args.cases)
+    bench_cjk_splitter(repeat=5)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+"""Check that the multi-output AdLocalizer mix graph compiles.
+
+Run from the repo root:
+
+    python check_audio_mix_graph.py [--languages 3]
+
+Builds the single-run mix graph for the three bed variants (original audio,
+raw custom music that still needs its volume filter, and a cached music bed)
+and asks ffmpeg-python to compile each one. No media is read or written. A
+graph that fails to compile would make every mix job silently fall back to
+one ffmpeg process per language, so the script exits non-zero on any failure.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import ffmpeg
+
+from adlocalizer_app import build_multi_mix
+
+
+def check_case(name: str, outputs, music) -> bool:
+    try:
+        args = build_multi_mix(outputs, 'video.mp4', music=music).compile()
+    except Exception as exc:
+        print(f"{name}: FAILED ({exc})")
+        return False
+    filter_graph = args[args.index('-filter_complex') + 1] if '-filter_complex' in args else ''
+    print(f"{name}: ok ({len(outputs)} output(s), {filter_graph.count('asplit')} asplit)")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--languages', type=int, default=3, help='voiceovers mixed in one run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # _mix_over_background only adds a voiceover that exists on disk
+        outputs = []
+        for index in range(max(1, args.languages)):
+            voiceover = Path(scratch) / f'voiceover_{index}.mp3'
+            voiceover.touch()
+            outputs.append((str(voiceover), str(Path(scratch) / f'mix_{index}.mp4')))
+
+        cases = {
+            'original audio': None,
+            'raw custom music': (ffmpeg.input('music.mp3'), True),
+            'cached music bed': (ffmpeg.input('music_bed.wav'), False),
+        }
+        results = [check_case(name, outputs, music) for name, music in cases.items()]
+        results += [check_case(f'{name} (single output)', outputs[:1], music) for name, music in cases.items()]
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""Pooled, keep-alive HTTP sessions and API clients shared across upstreams.
+
+Every upstream (ElevenLabs, OpenAI, Replicate, generic file downloads) gets one
+process-wide ``requests.Session`` or SDK client so repeated calls reuse TCP/TLS
+connections instead of paying for a fresh handshake each time. Pool sizes,
+timeouts and retry behaviour are read from the environment, e.g.
+``HTTP_ELEVENLABS_POOL_MAXSIZE=32`` or ``HTTP_DOWNLOADS_READ_TIMEOUT=120``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Defaults per upstream; each value can be overridden with HTTP_<UPSTREAM>_<KEY>.
+UPSTREAM_DEFAULTS: Dict[str, Dict[str, float]] = {
+    "elevenlabs": {"pool_connections": 2, "pool_maxsize": 16, "connect_timeout": 10, "read_timeout": 60, "retries": 2},
+    "openai": {"pool_connections": 1, "pool_maxsize": 16, "connect_timeout": 10, "read_timeout": 120, "retries": 2},
+    "replicate": {"pool_connections": 4, "pool_maxsize": 8, "connect_timeout": 10, "read_timeout": 120, "retries": 3},
+    "downloads": {"pool_connections": 8, "pool_maxsize": 8, "connect_timeout": 10, "read_timeout": 60, "retries": 3},
+}
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+def get_upstream_config(upstream: str) -> Dict[str, float]:
+    """Return the effective pool/timeout/retry settings for *upstream*."""
+    defaults = UPSTREAM_DEFAULTS.get(upstream, UPSTREAM_DEFAULTS["downloads"])
+    prefix = f"HTTP_{upstream.upper()}_"
+    config = {}
+    for key, default in defaults.items():
+        # Global HTTP_<KEY> applies to every upstream unless a specific override exists
+        global_default = _env_number(f"HTTP_{key.upper()}", default)
+        config[key] = _env_number(f"{prefix}{key.upper()}", global_default)
+    return config
+
+
+def get_timeout(upstream: str) -> Tuple[float, float]:
+    """Return the ``(connect, read)`` timeout tuple configured for *upstream*."""
+    config = get_upstream_config(upstream)
+    return config["connect_timeout"], config["read_timeout"]
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout when the caller omits one."""
+
+    def __init__(self, *args, timeout: Tuple[float, float], **kwargs) -> None:
+        self._default_timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):  # type: ignore[override]
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._default_timeout
+        return super().send(request, **kwargs)
+
+
+_sessions: Dict[str, requests.Session] = {}
+_clients: Dict[Tuple[str, str], object] = {}
+_lock = threading.Lock()
+
+
+def _build_session(upstream: str) -> requests.Session:
+    config = get_upstream_config(upstream)
+    retries = Retry(
+        total=int(config["retries"]),
+        connect=int(config["retries"]),
+        read=int(config["retries"]),
+        status=int(config["retries"]),
+        backoff_factor=0.5,
+        status_forcelist=_RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _TimeoutHTTPAdapter(
+        pool_connections=int(config["pool_connections"]),
+        pool_maxsize=int(config["pool_maxsize"]),
+        max_retries=retries,
+        timeout=(config["connect_timeout"], config["read_timeout"]),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.info(
+        "Created pooled HTTP session for %s (pool=%s, retries=%s)",
+        upstream,
+        int(config["pool_maxsize"]),
+        int(config["retries"]),
+    )
+    return session
+
+
+def get_session(upstream: str) -> requests.Session:
+    """Return the shared keep-alive session for *upstream*, creating it on first use."""
+    session = _sessions.get(upstream)
+    if session is not None:
+        return session
+    with _lock:
+        session = _sessions.get(upstream)
+        if session is None:
+            session = _build_session(upstream)
+            _sessions[upstream] = session
+        return session
+
+
+def _build_httpx_client(upstream: str):
+    import httpx
+
+    config = get_upstream_config(upstream)
+    limits = httpx.Limits(
+        max_connections=int(config["pool_maxsize"]),
+        max_keepalive_connections=int(config["pool_maxsize"]),
+    )
+    timeout = httpx.Timeout(config["read_timeout"], connect=config["connect_timeout"])
+    return httpx.Client(limits=limits, timeout=timeout)
+
+
+def get_openai_client(api_key: Optional[str]):
+    """Return a shared OpenAI client for *api_key* backed by a pooled httpx client."""
+    if not api_key:
+        return None
+    cache_key = ("openai", api_key)
+    client = _clients.get(cache_key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            from openai import OpenAI
+
+            config = get_upstream_config("openai")
+            client = OpenAI(
+                api_key=api_key,
+                max_retries=int(config["retries"]),
+                http_client=_build_httpx_client("openai"),
+            )
+            _clients[cache_key] = client
+        return client
+
+
+def get_elevenlabs_client(api_key: Optional[str]):
+    """Return a shared ElevenLabs SDK client for *api_key* backed by a pooled httpx client."""
+    if not api_key:
+        return None
+    cache_key = ("elevenlabs", api_key)
+    client = _clients.get(cache_key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            from elevenlabs.client import ElevenLabs
+
+            client = ElevenLabs(
+                api_key=api_key,
+                timeout=get_upstream_config("elevenlabs")["read_timeout"],
+                httpx_client=_build_httpx_client("elevenlabs"),
+            )
+            _clients[cache_key] = client
+        return client
+
+
+__all__ = [
+    "UPSTREAM_DEFAULTS",
+    "get_elevenlabs_client",
+    "get_openai_client",
+    "get_session",
+    "get_timeout",
+    "get_upstream_config",
+]
@@ -0,0 +1,251 @@
+"""Streaming, resumable file downloads over the pooled HTTP sessions.
+
+Remote files (Replicate stems, YouTube upload sources) are written straight to
+a ``.part`` file next to the destination in ``DOWNLOAD_BUFFER_KB`` pieces, so
+memory stays bounded whatever the file size. When the server advertises byte
+ranges and the file is large enough, it is fetched as up to
+``DOWNLOAD_PARALLEL_PARTS`` concurrent Range requests. A part interrupted
+mid-stream resumes from the last byte written instead of starting over, and the
+finished file must match the size the server announced before it is renamed
+into place. A ``.part`` file left by an earlier call is only resumed when the
+ETag/Last-Modified recorded next to it still matches, and every ranged request
+carries ``If-Range`` so a file that changed on the server is never spliced.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import requests
+
+from http_clients import get_session
+
+logger = logging.getLogger('http_download')
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+DOWNLOAD_BUFFER_BYTES = max(64, _env_int('DOWNLOAD_BUFFER_KB', 1024)) * 1024
+DOWNLOAD_PARALLEL_PARTS = max(1, _env_int('DOWNLOAD_PARALLEL_PARTS', 4))
+# Files smaller than this are fetched with a single request
+DOWNLOAD_MIN_PART_BYTES = max(1, _env_int('DOWNLOAD_MIN_PART_MB', 8)) * 1024 * 1024
+DOWNLOAD_MAX_ATTEMPTS = max(1, _env_int('DOWNLOAD_MAX_ATTEMPTS', 5))
+
+_CONTENT_RANGE_RE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+# Sizes are compared against the bytes on the wire, so ask for them uncompressed
+_IDENTITY = {'Accept-Encoding': 'identity'}
+
+
+class DownloadFailed(IOError):
+    """Raised when a download cannot be completed after retries."""
+
+
+@dataclass
+class RemoteFile:
+    url: str
+    size: Optional[int]
+    accepts_ranges: bool
+    content_type: str
+    # Strong ETag or Last-Modified, usable in If-Range; None when the server sends neither
+    validator: Optional[str] = None
+
+
+def _validator(headers) -> Optional[str]:
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def probe(url: str, upstream: str = 'downloads') -> RemoteFile:
+    """Ask for the first byte to learn the size and whether ranges are honoured.
+
+    A one-byte ranged GET is used instead of HEAD because presigned storage
+    URLs are often signed for GET only.
+    """
+    session = get_session(upstream)
+    try:
+        response = session.get(url, headers={**_IDENTITY, 'Range': 'bytes=0-0'}, stream=True)
+    except requests.RequestException as exc:
+        raise DownloadFailed(f'Failed to reach {url}: {exc}') from exc
+    with response:
+        if response.status_code >= 400:
+            raise DownloadFailed(f'Failed to download {url}: HTTP {response.status_code}')
+        content_type = response.headers.get('content-type', '')
+        validator = _validator(response.headers)
+        match = _CONTENT_RANGE_RE.match(response.headers.get('content-range', ''))
+        if response.status_code == 206 and match and match.group(3) != '*':
+            return RemoteFile(response.url, int(match.group(3)), True, content_type, validator)
+        length = response.headers.get('content-length')
+        size = int(length) if length and length.isdigit() else None
+        return RemoteFile(response.url, size, False, content_type, validator)
+
+
+def _fetch_range(session: requests.Session, url: str, part_path: Path, start: int, end: Optional[int],
+                 validator: Optional[str] = None) -> int:
+    """Write bytes ``start..end`` (inclusive; ``end=None`` means to EOF) at their offset.
+
+    Retries resume from the last byte written. Returns the offset reached.
+    """
+    offset = start
+    last_error: Optional[Exception] = None
+    for attempt in range(DOWNLOAD_MAX_ATTEMPTS):
+        if end is not None and offset > end:
+            return offset
+        if attempt:
+            time.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)))
+        headers = dict(_IDENTITY)
+        if offset or end is not None:
+            headers['Range'] = f'bytes={offset}-' + ('' if end is None else str(end))
+            if validator:
+                # A changed file answers 200 with the whole new body instead of the range
+                headers['If-Range'] = validator
+        try:
+            with session.get(url, headers=headers, stream=True) as response:
+                if response.status_code == 200 and 'Range' in headers:
+                    # Range ignored or file changed. A part shares the file with the other
+                    # parts and must not rewrite it; a single stream starts over.
+                    if end is not None:
+                        raise DownloadFailed('Server answered a byte range with the whole file')
+                    offset = 0
+                elif response.status_code not in (200, 206):
+                    raise requests.HTTPError(f'HTTP {response.status_code}', response=response)
+                with part_path.open('r+b') as handle:
+                    handle.seek(offset)
+                    if response.status_code == 200 and end is None:
+                        handle.truncate()
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_BUFFER_BYTES):
+                        if not chunk:
+                            continue
+                        if end is not None:
+                            chunk = chunk[: end + 1 - offset]
+                        handle.write(chunk)
+                        offset += len(chunk)
+                        if end is not None and offset > end:
+                            break
+            if end is None or offset > end:
+                return offset
+            last_error = DownloadFailed(f'Connection closed at byte {offset} of range {start}-{end}')
+        except DownloadFailed:
+            raise
+        except (requests.RequestException, OSError) as exc:
+            last_error = exc
+        logger.warning('Download of %s interrupted at byte %s (attempt %s): %s', url, offset, attempt + 1, last_error)
+    raise DownloadFailed(f'Failed to download {url} after {DOWNLOAD_MAX_ATTEMPTS} attempts: {last_error}')
+
+
+def _split(size: int, parts: int) -> List[Tuple[int, int]]:
+    step = -(-size // parts)
+    return [(start, min(size, start + step) - 1) for start in range(0, size, step)]
+
+
+def _resume_offset(part_path: Path, state_path: Path, remote: RemoteFile) -> int:
+    """Bytes of *part_path* that belong to *remote*; 0 when they cannot be trusted."""
+    if not (remote.accepts_ranges and remote.validator and part_path.exists()):
+        return 0
+    try:
+        state = json.loads(state_path.read_text(encoding='utf-8'))
+        offset = part_path.stat().st_size
+    except (OSError, ValueError):
+        return 0
+    if state.get('validator') != remote.validator or state.get('size') != remote.size:
+        return 0
+    if remote.size is not None and offset > remote.size:
+        return 0
+    return offset
+
+
+def download(url: str, destination, *, upstream: str = 'downloads', remote: Optional[RemoteFile] = None,
+             parts: Optional[int] = None) -> Path:
+    """Download *url* to *destination* and return its path.
+
+    Raises ``DownloadFailed`` when the file cannot be fetched or its size does
+    not match what the server announced; no partial file is left at
+    *destination*. A ``.part`` file left by an interrupted sequential download
+    is resumed when the server supports ranges and the file's validator is
+    unchanged; otherwise it is discarded.
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    remote = remote or probe(url, upstream)
+    session = get_session(upstream)
+    part_path = destination.with_name(f'{destination.name}.part')
+    state_path = destination.with_name(f'{destination.name}.part.json')
+    started = time.perf_counter()
+
+    parts = DOWNLOAD_PARALLEL_PARTS if parts is None else max(1, parts)
+    size = remote.size
+    parallel = remote.accepts_ranges and size is not None and parts > 1 and size >= 2 * DOWNLOAD_MIN_PART_BYTES
+    try:
+        if parallel:
+            parts = min(parts, size // DOWNLOAD_MIN_PART_BYTES)
+            state_path.unlink(missing_ok=True)
+            with part_path.open('wb') as handle:
+                handle.truncate(size)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=parts, thread_name_prefix='download') as executor:
+                futures = [
+                    executor.submit(_fetch_range, session, remote.url, part_path, start, end, remote.validator)
+                    for start, end in _split(size, parts)
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            resume_from = _resume_offset(part_path, state_path, remote)
+            if not resume_from:
+                part_path.write_bytes(b'')
+                if remote.accepts_ranges and remote.validator:
+                    state_path.write_text(
+                        json.dumps({'url': url, 'validator': remote.validator, 'size': size}), encoding='utf-8'
+                    )
+                else:
+                    state_path.unlink(missing_ok=True)
+            else:
+                logger.info('Resuming download of %s at byte %s', url, resume_from)
+            if size is None or resume_from < size:
+                _fetch_range(session, remote.url, part_path, resume_from, None, remote.validator)
+
+        written = part_path.stat().st_size
+        if size is not None and written != size:
+            raise DownloadFailed(f'Downloaded {written} bytes from {url}, expected {size}')
+        os.replace(part_path, destination)
+        state_path.unlink(missing_ok=True)
+    except DownloadFailed:
+        # Sequential downloads keep their .part file so the next call can resume
+        if parallel:
+            part_path.unlink(missing_ok=True)
+        raise
+    except OSError as exc:
+        part_path.unlink(missing_ok=True)
+        state_path.unlink(missing_ok=True)
+        raise DownloadFailed(f'Error writing download for {url}: {exc}') from exc
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        'Downloaded %s (%.1f MB, %s part(s)) in %.1fs',
+        destination.name, written / 1048576, parts if parallel else 1, elapsed,
+    )
+    return destination
+
+
+__all__ = [
+    'DOWNLOAD_BUFFER_BYTES',
+    'DOWNLOAD_MAX_ATTEMPTS',
+    'DOWNLOAD_MIN_PART_BYTES',
+    'DOWNLOAD_PARALLEL_PARTS',
+    'DownloadFailed',
+    'RemoteFile',
+    'download',
+    'probe',
+]
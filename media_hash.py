@@ -0,0 +1,65 @@
+"""Content hashes for media files, memoized on (path, size, mtime).
+
+Several caches (music beds, transcriptions) are keyed by what a file contains
+rather than where it lives, because uploads and TTS output are copied between
+session directories. Hashing a large file is not free, so results are kept
+for as long as the file is unchanged, up to ``HASH_CACHE_ENTRIES`` files
+(least recently used first out).
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+
+HASH_CHUNK_BYTES = 1024 * 1024
+# Every upload and rendered file lands here; keep the most recent ones only
+HASH_CACHE_ENTRIES = 4096
+
+_hash_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def stat_key(path) -> Tuple[str, int, int]:
+    path = Path(path)
+    stat = path.stat()
+    return str(path.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def _store(key: Tuple[str, int, int], value: str) -> None:
+    with _lock:
+        _hash_cache[key] = value
+        _hash_cache.move_to_end(key)
+        while len(_hash_cache) > HASH_CACHE_ENTRIES:
+            _hash_cache.popitem(last=False)
+
+
+def remember_hash(path, value: str) -> None:
+    """Record a hash computed elsewhere (e.g. while streaming an upload to disk)."""
+    try:
+        key = stat_key(path)
+    except OSError:
+        return
+    _store(key, value)
+
+
+def file_sha256(path) -> str:
+    """Return the SHA-256 hex digest of *path*."""
+    key = stat_key(path)
+    with _lock:
+        cached = _hash_cache.get(key)
+        if cached:
+            _hash_cache.move_to_end(key)
+            return cached
+    digest = hashlib.sha256()
+    with Path(path).open('rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    _store(key, value)
+    return value
+
+
+__all__ = ['HASH_CHUNK_BYTES', 'file_sha256', 'remember_hash', 'stat_key']
@@ -0,0 +1,223 @@
+"""Pre-rendered music beds shared by every language mix.
+
+Custom-music mixes loop/trim the same track to the same video length for each
+language. The looped, trimmed and volume-adjusted bed is rendered once per
+``(music hash, duration, volume)`` into a PCM WAV and reused, so each language
+mix only has to ``amix`` two ready-made inputs. Bundled tracks in
+``static/music`` are decoded to PCM at startup so even the first bed built from
+them skips MP3 decoding.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import ffmpeg
+
+from ffmpeg_config import FFMPEG_THREAD_STR
+from media_hash import file_sha256, stat_key
+
+logger = logging.getLogger('music_bed_cache')
+
+MUSIC_CACHE_DIR = Path(os.environ.get('MUSIC_BED_CACHE_DIR', 'temp_files/_music_cache'))
+BUNDLED_MUSIC_DIR = Path('static/music')
+
+try:
+    MUSIC_BED_CACHE_MAX_BYTES = max(0, int(os.environ.get('MUSIC_BED_CACHE_MAX_MB', '512'))) * 1024 * 1024
+except (TypeError, ValueError):
+    MUSIC_BED_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_SAMPLE_RATE = 44100
+_CHANNELS = 2
+
+# (path, size, mtime) -> duration; tiny and lives for the process
+_duration_cache: Dict[Tuple[str, int, int], Optional[float]] = {}
+_key_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def file_hash(path) -> str:
+    """Return the SHA-256 of *path*, memoized on (path, size, mtime)."""
+    return file_sha256(path)
+
+
+def probe_duration(path) -> Optional[float]:
+    """Return the media duration in seconds, memoized on (path, size, mtime)."""
+    path = Path(path)
+    try:
+        key = stat_key(path)
+    except OSError:
+        return None
+    if key in _duration_cache:
+        return _duration_cache[key]
+    duration = None
+    try:
+        probe = ffmpeg.probe(str(path))
+        raw = probe.get('format', {}).get('duration') or probe['streams'][0].get('duration')
+        duration = float(raw) if raw is not None else None
+    except Exception as exc:
+        logger.warning('Could not probe duration of %s: %s', path, exc)
+    with _lock:
+        _duration_cache[key] = duration
+    return duration
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _lock:
+        lock = _key_locks.get(key)
+        if lock is None:
+            lock = _key_locks[key] = threading.Lock()
+        return lock
+
+
+def _render_atomic(stream, target: Path) -> None:
+    """Render *stream* to a sibling temp file and move it into place."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=str(target.parent), suffix='.part.wav')
+    os.close(fd)
+    try:
+        (
+            ffmpeg.output(
+                stream,
+                temp_path,
+                acodec='pcm_s16le',
+                ar=_SAMPLE_RATE,
+                ac=_CHANNELS,
+                format='wav',
+            )
+            .global_args('-threads', FFMPEG_THREAD_STR)
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        os.replace(temp_path, target)
+    except Exception:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _decoded_path(music_hash: str) -> Path:
+    return MUSIC_CACHE_DIR / 'decoded' / f'{music_hash}.wav'
+
+
+def decode_track(music_file) -> Optional[Path]:
+    """Decode *music_file* once to PCM WAV keyed by its content hash."""
+    music_hash = file_hash(music_file)
+    target = _decoded_path(music_hash)
+    if target.exists():
+        return target
+    with _lock_for(f'decoded:{music_hash}'):
+        if target.exists():
+            return target
+        try:
+            _render_atomic(ffmpeg.input(str(music_file)).audio, target)
+        except ffmpeg.Error as exc:
+            logger.error('Failed to decode %s: %s', music_file, exc.stderr.decode() if exc.stderr else exc)
+            return None
+    logger.info('Decoded music track %s -> %s', Path(music_file).name, target.name)
+    return target
+
+
+def get_music_bed(music_file, duration: float, volume: float) -> Optional[Path]:
+    """Return a cached bed of *music_file* looped/trimmed to *duration* at *volume*.
+
+    Returns ``None`` if the bed cannot be rendered so callers can fall back to
+    building the loop inline.
+    """
+    try:
+        music_hash = file_hash(music_file)
+    except OSError as exc:
+        logger.error('Cannot read music file %s: %s', music_file, exc)
+        return None
+
+    duration_ms = int(round(duration * 1000))
+    volume_milli = int(round(volume * 1000))
+    target = MUSIC_CACHE_DIR / 'beds' / f'{music_hash}_{duration_ms}ms_v{volume_milli}.wav'
+    if target.exists():
+        os.utime(target)
+        return target
+
+    with _lock_for(target.name):
+        if target.exists():
+            return target
+
+        # Prefer the pre-decoded PCM copy so the bed never re-decodes MP3/AAC
+        decoded = _decoded_path(music_hash)
+        source = decoded if decoded.exists() else Path(music_file)
+        music_duration = probe_duration(source)
+
+        stream = ffmpeg.input(str(source)).audio
+        if music_duration and music_duration < duration:
+            loops_needed = int(duration / music_duration) + 1
+            stream = ffmpeg.filter(stream, 'aloop', loop=loops_needed - 1, size=2**31 - 1)
+        stream = ffmpeg.filter(stream, 'atrim', duration=duration_ms / 1000.0)
+        stream = ffmpeg.filter(stream, 'volume', volume_milli / 1000.0)
+        try:
+            _render_atomic(stream, target)
+        except ffmpeg.Error as exc:
+            logger.error('Failed to render music bed for %s: %s', music_file, exc.stderr.decode() if exc.stderr else exc)
+            return None
+
+    logger.info('Rendered music bed %s (%.2fs, volume %.2f)', target.name, duration, volume)
+    _evict_beds()
+    return target
+
+
+def _evict_beds() -> None:
+    """Drop least recently used beds once the bed directory exceeds its budget."""
+    if not MUSIC_BED_CACHE_MAX_BYTES:
+        return
+    bed_dir = MUSIC_CACHE_DIR / 'beds'
+    try:
+        beds = [(path, path.stat()) for path in bed_dir.glob('*.wav') if not path.name.endswith('.part.wav')]
+    except OSError:
+        return
+    total = sum(stat.st_size for _, stat in beds)
+    for path, stat in sorted(beds, key=lambda item: item[1].st_mtime):
+        if total <= MUSIC_BED_CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+            total -= stat.st_size
+        except OSError:
+            pass
+
+
+def warm_bundled_tracks(music_dir: Path = BUNDLED_MUSIC_DIR) -> int:
+    """Decode every bundled track; returns the number of tracks ready."""
+    ready = 0
+    if not music_dir.is_dir():
+        return ready
+    for track in sorted(music_dir.iterdir()):
+        if track.suffix.lower() not in {'.mp3', '.wav', '.m4a', '.aac', '.ogg', '.flac'}:
+            continue
+        try:
+            if decode_track(track):
+                ready += 1
+        except Exception as exc:
+            logger.warning('Could not pre-decode %s: %s', track.name, exc)
+    logger.info('Pre-decoded %s bundled music track(s)', ready)
+    return ready
+
+
+def start_background_warmup(music_dir: Path = BUNDLED_MUSIC_DIR) -> None:
+    """Pre-decode bundled tracks on a daemon thread so startup is not delayed."""
+    thread = threading.Thread(target=warm_bundled_tracks, args=(music_dir,), name='music-bed-warmup')
+    thread.daemon = True
+    thread.start()
+
+
+__all__ = [
+    'decode_track',
+    'file_hash',
+    'get_music_bed',
+    'probe_duration',
+    'start_background_warmup',
+    'warm_bundled_tracks',
+]
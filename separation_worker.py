@@ -0,0 +1,331 @@
+"""Long-lived Demucs separation workers that keep their models loaded.
+
+``python -m demucs.separate`` starts a fresh interpreter per file, so every
+separation re-imports torch and reloads the model weights before any audio is
+processed. Jobs here go to a small pool of CPU-only worker processes
+(``python -m separation_worker``) that read one JSON job per line from stdin
+and answer on stdout. Each worker loads a model the first time it is asked for
+it and keeps it for later jobs, so repeat separations skip the model load
+entirely. A worker that times out is killed and replaced on the next job.
+Stems are written as files in the same layout the CLI produces
+(``<out_dir>/<model>/<audio stem>/{vocals,no_vocals}.<ext>``).
+
+``separate`` raises ``SeparationUnavailable`` when Demucs is not installed or
+a job uses CLI flags the worker does not implement; callers then fall back to
+the subprocess.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger('separation_worker')
+
+
+def _env_number(name: str, default, cast=float):
+    try:
+        return cast(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+_cpu_count = os.cpu_count() or 2
+
+# Each worker holds its own copy of every model it has used (~300 MB for htdemucs_ft)
+SEPARATION_WORKERS = max(1, _env_number('SEPARATION_WORKERS', 1, int))
+# torch intra-op threads per worker; 0 splits the CPUs evenly across workers
+_configured_threads = _env_number('SEPARATION_THREADS', 0, int)
+SEPARATION_THREADS = _configured_threads if _configured_threads > 0 else max(1, _cpu_count // SEPARATION_WORKERS)
+# Seconds of audio per chunk; 0 keeps the model's own (maximum) segment length
+SEPARATION_SEGMENT_SECONDS = max(0.0, _env_number('SEPARATION_SEGMENT_SECONDS', 0.0))
+SEPARATION_OVERLAP = min(0.9, max(0.0, _env_number('SEPARATION_OVERLAP', 0.25)))
+SEPARATION_TIMEOUT_SECONDS = max(30.0, _env_number('SEPARATION_TIMEOUT_SECONDS', 600.0))
+
+
+class SeparationUnavailable(RuntimeError):
+    """The worker pool cannot run this job; use the demucs CLI instead."""
+
+
+# demucs.separate flags the worker understands, mapped to job options
+_FLAG_OPTIONS = {
+    '--two-stems': 'two_stems',
+    '--mp3': 'mp3',
+    '--mp3-bitrate': 'mp3_bitrate',
+    '--segment': 'segment',
+    '--overlap': 'overlap',
+    '--shifts': 'shifts',
+    '--float32': 'float32',
+    '--int24': 'int24',
+    '--clip-mode': 'clip_mode',
+}
+
+
+def job_options(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Translate a model config's demucs CLI ``params`` into worker options."""
+    options: Dict[str, Any] = {}
+    for flag, value in (params or {}).items():
+        key = _FLAG_OPTIONS.get(flag)
+        if key is None:
+            raise SeparationUnavailable(f'Unsupported demucs flag for the worker pool: {flag}')
+        options[key] = value
+    return options
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+_models: Dict[str, Any] = {}
+
+
+def _init_worker(threads: int) -> None:
+    # Never pick up a GPU that happens to be visible; the pool is sized for CPU
+    os.environ['CUDA_VISIBLE_DEVICES'] = ''
+    for name in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[name] = str(threads)
+    import torch
+
+    torch.set_num_threads(threads)
+
+
+def _load_model(model_name: str):
+    model = _models.get(model_name)
+    if model is None:
+        from demucs.pretrained import get_model
+
+        model = get_model(model_name)
+        model.cpu()
+        model.eval()
+        _models[model_name] = model
+    return model
+
+
+def _max_segment(model) -> Optional[float]:
+    # Transformer models cannot run on longer chunks than they were trained with
+    limit = getattr(model, 'max_allowed_segment', None)
+    if limit is None and hasattr(model, 'segment'):
+        limit = float(model.segment)
+    return limit
+
+
+def _save_stem(wav, path: Path, samplerate: int, options: Dict[str, Any]) -> None:
+    from demucs.audio import save_audio
+
+    # Write under a temporary name so a killed job never leaves a half-written stem
+    partial = path.with_name(f'.{path.stem}.part{path.suffix}')
+    save_audio(
+        wav,
+        str(partial),
+        samplerate=samplerate,
+        bitrate=int(options.get('mp3_bitrate', 320)),
+        clip=options.get('clip_mode', 'rescale'),
+        bits_per_sample=24 if options.get('int24') else 16,
+        as_float=bool(options.get('float32')),
+    )
+    os.replace(partial, path)
+
+
+def _run_job(audio_file: str, out_dir: str, model_name: str, options: Dict[str, Any]) -> Dict[str, str]:
+    import torch
+    from demucs.apply import apply_model
+    from demucs.audio import AudioFile
+
+    model = _load_model(model_name)
+    wav = AudioFile(audio_file).read(streams=0, samplerate=model.samplerate, channels=model.audio_channels)
+    ref = wav.mean(0)
+    mean, std = ref.mean(), ref.std()
+    wav = (wav - mean) / (std + 1e-8)
+
+    segment = options.get('segment') or SEPARATION_SEGMENT_SECONDS or None
+    limit = _max_segment(model)
+    if segment is not None and limit is not None:
+        segment = min(float(segment), limit)
+
+    with torch.no_grad():
+        sources = apply_model(
+            model,
+            wav[None],
+            device='cpu',
+            shifts=int(options.get('shifts', 1)),
+            split=True,
+            overlap=float(options.get('overlap', SEPARATION_OVERLAP)),
+            segment=segment,
+            progress=False,
+        )[0]
+    sources = sources * std + mean
+
+    stems = dict(zip(model.sources, sources))
+    two_stems = options.get('two_stems')
+    if two_stems:
+        if two_stems not in stems:
+            raise ValueError(f'Model {model_name} has no {two_stems!r} source')
+        rest = sum(source for name, source in stems.items() if name != two_stems)
+        stems = {two_stems: stems[two_stems], f'no_{two_stems}': rest}
+
+    ext = 'mp3' if options.get('mp3') else 'wav'
+    target_dir = Path(out_dir) / model_name / Path(audio_file).stem
+    target_dir.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, str] = {}
+    for name, source in stems.items():
+        path = target_dir / f'{name}.{ext}'
+        _save_stem(source, path, model.samplerate, options)
+        written[name] = str(path)
+    return written
+
+
+def _serve() -> None:
+    """Worker main loop: one JSON job per stdin line, one JSON reply per stdout line."""
+    # Keep the protocol stream clean of anything torch or demucs print
+    replies = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+    _init_worker(int(os.environ.get('SEPARATION_THREADS', SEPARATION_THREADS)))
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            job = json.loads(line)
+            reply = {'stems': _run_job(job['audio_file'], job['out_dir'], job['model_name'], job.get('options') or {})}
+        except Exception as exc:
+            reply = {'error': f'{type(exc).__name__}: {exc}'}
+        replies.write(json.dumps(reply) + '\n')
+        replies.flush()
+
+
+# ---------------------------------------------------------------------------
+# Parent process side
+# ---------------------------------------------------------------------------
+
+class _Worker:
+    def __init__(self) -> None:
+        env = dict(os.environ, SEPARATION_THREADS=str(SEPARATION_THREADS))
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'separation_worker'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+        )
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, job: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self.process.stdin.write(json.dumps(job) + '\n')
+        self.process.stdin.flush()
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise TimeoutError(f'Separation exceeded {timeout:.0f}s')
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f'Separation worker exited with code {self.process.wait()}')
+        return json.loads(line)
+
+    def kill(self) -> None:
+        try:
+            self.process.kill()
+            self.process.wait(timeout=10)
+        except Exception:
+            pass
+
+
+_idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+_started = 0
+_start_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    return importlib.util.find_spec('demucs') is not None and importlib.util.find_spec('torch') is not None
+
+
+def _acquire() -> _Worker:
+    """Take an idle worker, starting one while fewer than SEPARATION_WORKERS exist."""
+    global _started
+    with _start_lock:
+        if _idle.empty() and _started < SEPARATION_WORKERS:
+            _started += 1
+            _idle.put(None)
+    worker = _idle.get()
+    if worker is None or not worker.alive():
+        try:
+            worker = _Worker()
+        except BaseException:
+            # Hand the slot back so the next job can try again instead of blocking forever
+            _idle.put(None)
+            raise
+        logger.info('Started separation worker pid %s with %s thread(s)', worker.process.pid, SEPARATION_THREADS)
+    return worker
+
+
+def separate(audio_file, out_dir, model_name: str, options: Optional[Dict[str, Any]] = None,
+             timeout: Optional[float] = None) -> Dict[str, str]:
+    """Separate *audio_file* with *model_name* and return ``{stem name: path}``.
+
+    Blocks until a worker is free and has finished the job. Raises
+    ``SeparationUnavailable`` when Demucs is not installed, ``TimeoutError``
+    when the job runs longer than *timeout* (the worker is replaced) and
+    ``RuntimeError`` for failures inside the worker.
+    """
+    if not is_available():
+        raise SeparationUnavailable('demucs/torch are not installed')
+    timeout = SEPARATION_TIMEOUT_SECONDS if timeout is None else timeout
+    job = {
+        'audio_file': os.path.abspath(audio_file),
+        'out_dir': os.path.abspath(out_dir),
+        'model_name': model_name,
+        'options': dict(options or {}),
+    }
+    worker = _acquire()
+    try:
+        reply = worker.run(job, timeout)
+    except BaseException:
+        # A timed-out or broken worker may still be mid-job; never hand it out again
+        worker.kill()
+        _idle.put(None)
+        raise
+    _idle.put(worker)
+    if 'error' in reply:
+        raise RuntimeError(reply['error'])
+    return reply['stems']
+
+
+def shutdown() -> None:
+    """Stop every idle worker; busy ones are stopped when their job returns."""
+    global _started
+    with _start_lock:
+        while True:
+            try:
+                worker = _idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.kill()
+            _started -= 1
+
+
+__all__ = [
+    'SEPARATION_OVERLAP',
+    'SEPARATION_SEGMENT_SECONDS',
+    'SEPARATION_THREADS',
+    'SEPARATION_TIMEOUT_SECONDS',
+    'SEPARATION_WORKERS',
+    'SeparationUnavailable',
+    'is_available',
+    'job_options',
+    'separate',
+    'shutdown',
+]
+
+
+if __name__ == '__main__':
+    _serve()
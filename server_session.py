@@ -0,0 +1,305 @@
+"""Server-side Flask sessions: only a signed session id travels in the cookie.
+
+AdLocalizer keeps file paths, per-language subtitle entries and segment lists
+in ``session``. With Flask's cookie sessions all of it rides on every request
+and response and can exceed cookie limits with 15+ languages. Here each
+top-level session key is one row in SQLite, so a request that changes one key
+rewrites only that row. A small in-process LRU of serialized values sits in
+front of the database. Each session carries a version number that is checked
+on load, so several worker processes never serve a stale copy.
+
+Set ``SESSION_BACKEND=cookie`` to keep Flask's default cookie sessions.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+logger = logging.getLogger('server_session')
+
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sqlite').strip().lower()
+SESSION_DB_PATH = Path(os.environ.get('SESSION_DB_PATH', 'temp_files/_sessions.sqlite3'))
+
+try:
+    SESSION_CACHE_ENTRIES = max(0, int(os.environ.get('SESSION_CACHE_ENTRIES', '256')))
+except (TypeError, ValueError):
+    SESSION_CACHE_ENTRIES = 256
+
+# Expired sessions are swept at most this often, from whichever request saves next
+_PURGE_INTERVAL_SECONDS = 3600
+# Read-only requests refresh a session's access time at most this often
+_TOUCH_INTERVAL_SECONDS = 300
+
+_serializer = TaggedJSONSerializer()
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session dict that remembers the serialized values it was loaded with."""
+
+    def __init__(self, initial=None, sid: Optional[str] = None, new: bool = False, stored=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.accessed = False
+        self.stored: Dict[str, str] = dict(stored or {})
+
+    # Reads mark the session accessed, as Flask's SecureCookieSession does, so
+    # responses that depend on it get ``Vary: Cookie``
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+
+class SQLiteSessionStore:
+    """One row per (session id, key) plus a per-session version and access time."""
+
+    def __init__(self, path: Path, cache_entries: int = SESSION_CACHE_ENTRIES):
+        self.path = Path(path)
+        self.cache_entries = cache_entries
+        self._local = threading.local()
+        self._cache: "OrderedDict[str, Tuple[int, Dict[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._touched: Dict[str, float] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'sid TEXT PRIMARY KEY, version INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS session_values ('
+                'sid TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (sid, key))'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def load(self, sid: str) -> Optional[Dict[str, str]]:
+        """Return the serialized values of *sid*, or None if the session does not exist."""
+        conn = self._connection()
+        row = conn.execute('SELECT version FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        if row is None:
+            self._forget(sid)
+            return None
+        version = row[0]
+        with self._lock:
+            cached = self._cache.get(sid)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(sid)
+                return dict(cached[1])
+        values = dict(conn.execute('SELECT key, value FROM session_values WHERE sid = ?', (sid,)).fetchall())
+        self._remember(sid, version, values)
+        return dict(values)
+
+    def save(self, sid: str, changed: Dict[str, str], deleted, previous: Dict[str, str]) -> None:
+        """Write only *changed* keys and drop *deleted* ones, then bump the version."""
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if changed:
+                conn.executemany(
+                    'INSERT INTO session_values (sid, key, value) VALUES (?, ?, ?) '
+                    'ON CONFLICT(sid, key) DO UPDATE SET value = excluded.value',
+                    [(sid, key, value) for key, value in changed.items()],
+                )
+            if deleted:
+                conn.executemany(
+                    'DELETE FROM session_values WHERE sid = ? AND key = ?',
+                    [(sid, key) for key in deleted],
+                )
+            conn.execute(
+                'INSERT INTO sessions (sid, version, accessed) VALUES (?, 1, ?) '
+                'ON CONFLICT(sid) DO UPDATE SET version = version + 1, accessed = excluded.accessed',
+                (sid, now),
+            )
+            version = conn.execute('SELECT version FROM sessions WHERE sid = ?', (sid,)).fetchone()[0]
+
+        values = dict(previous)
+        values.update(changed)
+        for key in deleted:
+            values.pop(key, None)
+        self._remember(sid, version, values)
+
+    def touch(self, sid: str) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._touched.get(sid, 0.0) < _TOUCH_INTERVAL_SECONDS:
+                return
+            self._touched[sid] = now
+        self._connection().execute('UPDATE sessions SET accessed = ? WHERE sid = ?', (now, sid))
+
+    def delete(self, sid: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM session_values WHERE sid = ?', (sid,))
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+        self._forget(sid)
+
+    def purge_expired(self, max_age_seconds: float) -> int:
+        """Delete sessions not accessed within *max_age_seconds*; returns how many."""
+        cutoff = time.time() - max_age_seconds
+        conn = self._connection()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            expired = [row[0] for row in conn.execute('SELECT sid FROM sessions WHERE accessed < ?', (cutoff,))]
+            conn.executemany('DELETE FROM session_values WHERE sid = ?', [(sid,) for sid in expired])
+            conn.executemany('DELETE FROM sessions WHERE sid = ?', [(sid,) for sid in expired])
+        for sid in expired:
+            self._forget(sid)
+        return len(expired)
+
+    def maybe_purge(self, max_age_seconds: float) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_purge < _PURGE_INTERVAL_SECONDS:
+                return
+            self._last_purge = now
+        try:
+            removed = self.purge_expired(max_age_seconds)
+            if removed:
+                logger.info('Purged %s expired session(s)', removed)
+        except sqlite3.Error as exc:
+            logger.warning('Session purge failed: %s', exc)
+
+    def _remember(self, sid: str, version: int, values: Dict[str, str]) -> None:
+        with self._lock:
+            self._touched[sid] = time.time()
+            if not self.cache_entries:
+                return
+            self._cache[sid] = (version, values)
+            self._cache.move_to_end(sid)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def _forget(self, sid: str) -> None:
+        with self._lock:
+            self._cache.pop(sid, None)
+            self._touched.pop(sid, None)
+
+
+class ServerSessionInterface(SessionInterface):
+    """Keeps session data in a SQLiteSessionStore; the cookie holds a signed id."""
+
+    session_class = ServerSession
+    salt = 'server-session'
+
+    def __init__(self, store: SQLiteSessionStore):
+        self.store = store
+
+    def _signer(self, app) -> Optional[Signer]:
+        if not app.secret_key:
+            return None
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        signer = self._signer(app)
+        if signer is None:
+            return None
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = signer.unsign(cookie).decode('utf-8')
+                stored = self.store.load(sid)
+            except (BadSignature, UnicodeDecodeError):
+                stored = None
+            except sqlite3.Error as exc:
+                logger.error('Could not load session: %s', exc)
+                stored = None
+            if stored is not None:
+                data = {}
+                for key, value in stored.items():
+                    try:
+                        data[key] = _serializer.loads(value)
+                    except ValueError:
+                        logger.warning('Dropping unreadable session key %s', key)
+                return self.session_class(data, sid=sid, stored=stored)
+        return self.session_class(sid=uuid.uuid4().hex, new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            # Compare serialized values so only keys whose content changed are written,
+            # including nested edits that were reassigned to the same key
+            serialized = {key: _serializer.dumps(value) for key, value in session.items()}
+            changed = {key: value for key, value in serialized.items() if session.stored.get(key) != value}
+            deleted = [key for key in session.stored if key not in serialized]
+            if changed or deleted or session.new:
+                self.store.save(session.sid, changed, deleted, session.stored)
+                session.stored = serialized
+        elif not session.new:
+            self.store.touch(session.sid)
+
+        self.store.maybe_purge(app.permanent_session_lifetime.total_seconds())
+
+        if not (session.modified or self.should_set_cookie(app, session)):
+            return
+        signer = self._signer(app)
+        response.set_cookie(
+            name,
+            signer.sign(session.sid.encode('utf-8')).decode('utf-8'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def init_server_sessions(app) -> None:
+    """Install server-side sessions on *app* unless SESSION_BACKEND=cookie."""
+    if SESSION_BACKEND == 'cookie':
+        logger.info('Using cookie sessions (SESSION_BACKEND=cookie)')
+        return
+    if SESSION_BACKEND != 'sqlite':
+        logger.warning('Unknown SESSION_BACKEND %r; using sqlite', SESSION_BACKEND)
+    app.session_interface = ServerSessionInterface(SQLiteSessionStore(SESSION_DB_PATH))
+
+
+__all__ = ['SQLiteSessionStore', 'ServerSession', 'ServerSessionInterface', 'init_server_sessions']
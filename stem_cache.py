@@ -0,0 +1,156 @@
+"""Separated stems shared across sessions, keyed by audio content and model.
+
+Vocal separation is the most expensive step in the app, and the same source
+video is often localized again in a later session. Each separation's
+instrumental (and vocals, when the engine produced them) is kept under
+``STEM_CACHE_DIR/<entry>/`` where the entry name is derived from
+``(audio hash, model id, model settings)``. Entries are published by renaming
+a fully written directory into place, hardlinked out to callers instead of
+copied, and the least recently used ones are evicted once the cache exceeds
+``STEM_CACHE_MAX_MB``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from media_hash import file_sha256
+from workspace_manager import link_shared_asset
+
+logger = logging.getLogger('stem_cache')
+
+STEM_CACHE_DIR = Path(os.environ.get('STEM_CACHE_DIR', 'temp_files/_stem_cache'))
+
+try:
+    STEM_CACHE_MAX_BYTES = max(0, int(os.environ.get('STEM_CACHE_MAX_MB', '2048'))) * 1024 * 1024
+except (TypeError, ValueError):
+    STEM_CACHE_MAX_BYTES = 2048 * 1024 * 1024
+
+STEM_NAMES = ('instrumental', 'vocals')
+
+_lock = threading.Lock()
+
+
+def entry_name(audio_hash: str, model_id: str, settings: Any) -> str:
+    """Directory name for one separation; *settings* is anything JSON-serializable."""
+    fingerprint = hashlib.sha256(
+        json.dumps(settings, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()[:16]
+    safe_model = ''.join(char if char.isalnum() or char in '-_' else '_' for char in str(model_id))
+    return f'{audio_hash}_{safe_model}_{fingerprint}'
+
+
+def _entry_dir(audio_file, model_id: str, settings: Any) -> Path:
+    return STEM_CACHE_DIR / entry_name(file_sha256(audio_file), model_id, settings)
+
+
+def _stems_in(entry: Path) -> Dict[str, Path]:
+    stems: Dict[str, Path] = {}
+    try:
+        for path in entry.iterdir():
+            if path.stem in STEM_NAMES:
+                stems[path.stem] = path
+    except OSError:
+        pass
+    return stems
+
+
+def lookup(audio_file, model_id: str, settings: Any, target_dir) -> Optional[Dict[str, Path]]:
+    """Return ``{stem: path}`` linked into *target_dir* on a hit, else None."""
+    try:
+        entry = _entry_dir(audio_file, model_id, settings)
+    except OSError:
+        return None
+    stems = _stems_in(entry)
+    if 'instrumental' not in stems:
+        return None
+    try:
+        os.utime(entry)
+        linked = {
+            name: link_shared_asset(path, Path(target_dir) / f'{name}{path.suffix}')
+            for name, path in stems.items()
+        }
+    except OSError as exc:
+        # Evicted between listing and linking
+        logger.warning('Stem cache entry %s vanished: %s', entry.name, exc)
+        return None
+    logger.info('Stem cache hit for %s (%s)', Path(audio_file).name, model_id)
+    return linked
+
+
+def store(audio_file, model_id: str, settings: Any, instrumental, vocals=None) -> None:
+    """Add a finished separation to the cache; failures are logged, not raised."""
+    try:
+        entry = _entry_dir(audio_file, model_id, settings)
+        if entry.exists():
+            os.utime(entry)
+            return
+        STEM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=str(STEM_CACHE_DIR), prefix='.staging_'))
+        try:
+            for name, source in (('instrumental', instrumental), ('vocals', vocals)):
+                if source and Path(source).exists():
+                    link_shared_asset(source, staging / f'{name}{Path(source).suffix}')
+            os.replace(staging, entry)
+        except OSError:
+            # Another worker published the same entry first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not entry.exists():
+                raise
+    except OSError as exc:
+        logger.warning('Could not cache stems for %s: %s', audio_file, exc)
+        return
+    evict()
+
+
+def _entry_size(entry: Path) -> int:
+    total = 0
+    for path in entry.iterdir():
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def evict() -> int:
+    """Drop least recently used entries above STEM_CACHE_MAX_BYTES; returns bytes freed."""
+    if not STEM_CACHE_MAX_BYTES:
+        return 0
+    with _lock:
+        try:
+            entries = []
+            for entry in STEM_CACHE_DIR.iterdir():
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    entries.append((entry, entry.stat().st_mtime, _entry_size(entry)))
+        except OSError:
+            return 0
+        total = sum(size for _, _, size in entries)
+        freed = 0
+        for entry, _, size in sorted(entries, key=lambda item: item[1]):
+            if total <= STEM_CACHE_MAX_BYTES:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            freed += size
+        # Staging directories left behind by a crashed process
+        for staging in STEM_CACHE_DIR.glob('.staging_*'):
+            try:
+                if time.time() - staging.stat().st_mtime > 3600:
+                    shutil.rmtree(staging, ignore_errors=True)
+            except OSError:
+                continue
+    if freed:
+        logger.info('Evicted %.1f MB from the stem cache', freed / 1048576)
+    return freed
+
+
+__all__ = ['STEM_CACHE_DIR', 'STEM_CACHE_MAX_BYTES', 'entry_name', 'evict', 'lookup', 'store']
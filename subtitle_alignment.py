@@ -0,0 +1,148 @@
+"""Subtitle timing for voiceovers whose script is already known.
+
+AdLocalizer voiceovers are ElevenLabs renders of a translation we already
+have, so transcribing them again only to recover the same words is wasted
+time and can drift from the script. When a voiceover is generated its exact
+text is written to a ``<audio>.script.json`` sidecar; ``align_script`` then
+splits that text into subtitle lines and spreads them over the speech regions
+found by ffmpeg ``silencedetect``, weighted by character count and snapped to
+the pauses between phrases.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from media_hash import file_sha256
+from subtitle_processing import split_subtitle_text
+from whisper_chunking import detect_silences, probe_duration
+
+logger = logging.getLogger('subtitle_alignment')
+
+# TTS output has clean pauses; shorter than Whisper chunking's threshold
+ALIGN_NOISE_DB = -40
+ALIGN_MIN_SILENCE = 0.12
+# A line boundary this close to a pause moves into it; sentence ends reach further
+SNAP_SECONDS = 0.35
+SENTENCE_SNAP_SECONDS = 1.0
+
+# ASCII terminators need trailing whitespace so "3.5" and "U.S." stay whole; CJK ones end a sentence outright
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])(?:\s+|$)|(?<=[。！？])\s*')
+_SENTENCE_END_CHARS = ('.', '!', '?', '。', '！', '？')
+
+
+def sidecar_path(audio_file) -> Path:
+    audio_path = Path(audio_file)
+    return audio_path.with_name(f'{audio_path.name}.script.json')
+
+
+def write_script_sidecar(audio_file, text: str, language_code: str, **metadata) -> None:
+    """Record the exact text rendered into *audio_file*."""
+    payload = {
+        'text': text,
+        'language': language_code,
+        'audio_sha256': file_sha256(audio_file),
+        **metadata,
+    }
+    try:
+        sidecar_path(audio_file).write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+    except OSError as exc:
+        logger.warning('Could not write script sidecar for %s: %s', audio_file, exc)
+
+
+def read_script_sidecar(audio_file) -> Optional[str]:
+    """Return the script for *audio_file* if its sidecar still matches the audio bytes."""
+    path = sidecar_path(audio_file)
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+        if payload.get('audio_sha256') != file_sha256(audio_file):
+            return None
+    except (OSError, ValueError):
+        return None
+    text = (payload.get('text') or '').strip()
+    return text or None
+
+
+def _speech_regions(duration: float, silences: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    regions: List[Tuple[float, float]] = []
+    cursor = 0.0
+    for start, end in sorted(silences):
+        if start > cursor:
+            regions.append((cursor, min(start, duration)))
+        cursor = max(cursor, end)
+    if cursor < duration:
+        regions.append((cursor, duration))
+    return [(start, end) for start, end in regions if end - start > 0.01]
+
+
+def _speech_to_wall(offset: float, regions: List[Tuple[float, float]]) -> float:
+    """Map a position on the concatenated speech timeline to media time."""
+    for start, end in regions:
+        length = end - start
+        if offset <= length:
+            return start + offset
+        offset -= length
+    return regions[-1][1]
+
+
+def _script_lines(text: str, language_code: str) -> List[str]:
+    lines: List[str] = []
+    for sentence in _SENTENCE_END_RE.split(text):
+        if sentence.strip():
+            lines.extend(split_subtitle_text(sentence, language_code))
+    return lines
+
+
+def align_script(audio_file, text: str, language_code: str) -> List[Dict[str, object]]:
+    """Return ``{'start', 'end', 'text'}`` segments for *text* spoken in *audio_file*.
+
+    Returns an empty list when the audio cannot be measured so the caller can
+    fall back to transcription.
+    """
+    lines = _script_lines(text, language_code)
+    duration = probe_duration(Path(audio_file))
+    if not lines or not duration:
+        return []
+
+    silences = detect_silences(Path(audio_file), noise_db=ALIGN_NOISE_DB, min_silence=ALIGN_MIN_SILENCE)
+    regions = _speech_regions(duration, silences) or [(0.0, duration)]
+    speech_total = sum(end - start for start, end in regions)
+
+    weights = [max(1, len(line.replace(' ', ''))) for line in lines]
+    weight_total = float(sum(weights))
+
+    # Leading/trailing silence is not a pause between phrases
+    pauses = [pause for pause in silences if pause[0] > regions[0][0] and pause[1] < regions[-1][1]]
+
+    starts = [regions[0][0]]
+    ends: List[float] = []
+    consumed = 0
+    for line, weight in zip(lines[:-1], weights[:-1]):
+        consumed += weight
+        boundary = _speech_to_wall(speech_total * consumed / weight_total, regions)
+        line_end = next_start = boundary
+        tolerance = SENTENCE_SNAP_SECONDS if line.endswith(_SENTENCE_END_CHARS) else SNAP_SECONDS
+        nearest = min(
+            pauses,
+            key=lambda pause: max(pause[0] - boundary, boundary - pause[1], 0.0),
+            default=None,
+        )
+        if nearest and max(nearest[0] - boundary, boundary - nearest[1], 0.0) <= tolerance:
+            line_end, next_start = nearest
+        # Keep the timeline monotonic even when two boundaries snap to one pause
+        line_end = max(line_end, starts[-1] + 0.2)
+        next_start = max(next_start, line_end)
+        ends.append(line_end)
+        starts.append(next_start)
+    ends.append(max(regions[-1][1], starts[-1] + 0.2))
+
+    return [
+        {'start': round(start, 3), 'end': round(end, 3), 'text': line}
+        for start, end, line in zip(starts, ends, lines)
+    ]
+
+
+__all__ = ['align_script', 'read_script_sidecar', 'sidecar_path', 'write_script_sidecar']
@@ -8,8 +8,12 @@ web app.
 from __future__ import annotations
 
 import importlib.util
+import logging
+import os
 import re
-from typing import List
+import threading
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Tuple
 
 from language_config import (
     LANGUAGE_CODE_MAPPING,
@@ -24,6 +28,11 @@ CHINESE_PUNCTUATION = "，。！？、；：""''「」【】《》（）…~～"
 ALL_PUNCTUATION = CHINESE_PUNCTUATION + ",.!?;:\"'()[]{}<>…-"
 PRESERVED_TERMS = ["Photoroom", "AI", "App"]
 
+# Alternation keeps list order, so the first listed term wins as before
+_PRESERVED_TERM_RE = re.compile('|'.join(re.escape(term) for term in PRESERVED_TERMS) or '(?!)')
+_PUNCTUATION_SET = frozenset(ALL_PUNCTUATION)
+_SENTENCE_END_CHARS = ('。', '！', '!', '？', '?')
+
 MAX_LENGTHS = {
     'CN': 16,
     'HK': 16,
@@ -34,6 +43,51 @@ MAX_LENGTHS = {
 DEFAULT_MAX_LENGTH = 24
 RTL_LANGUAGES = {'SA'}
 
+logger = logging.getLogger('subtitle_processing')
+
+# Process-wide tools; building either per segment costs tens to hundreds of ms
+_tagger = None
+_converter = None
+_init_lock = threading.Lock()
+# MeCab taggers keep per-parse state, so parses are serialized
+_tagger_lock = threading.Lock()
+
+
+def _get_tagger():
+    global _tagger
+    if _tagger is None:
+        with _init_lock:
+            if _tagger is None:
+                import fugashi
+
+                _tagger = fugashi.Tagger()
+    return _tagger
+
+
+def _get_converter():
+    global _converter
+    if _converter is None:
+        with _init_lock:
+            if _converter is None:
+                import opencc
+
+                _converter = opencc.OpenCC('s2t')
+    return _converter
+
+
+def warm_text_tools() -> None:
+    """Load the MeCab dictionary and OpenCC tables ahead of the first JP/HK subtitle."""
+    for name, available, loader in (
+        ('fugashi', HAS_FUGASHI, _get_tagger),
+        ('opencc', HAS_OPENCC, _get_converter),
+    ):
+        if not available:
+            continue
+        try:
+            loader()
+        except Exception as exc:
+            logger.warning('Could not warm %s: %s', name, exc)
+
 
 def _normalize_codes(language_code: str) -> tuple[str, str]:
     code = (language_code or '').strip()
@@ -49,7 +103,7 @@ def _normalize_codes(language_code: str) -> tuple[str, str]:
 
 
 def _is_punctuation(char: str) -> bool:
-    return char in ALL_PUNCTUATION
+    return char in _PUNCTUATION_SET
 
 
 def _clean_text(text: str) -> str:
@@ -62,10 +116,7 @@ def _convert_traditional(text: str) -> str:
     if not HAS_OPENCC:
         return text
     try:
-        import opencc
-
-        converter = opencc.OpenCC('s2t')
-        return converter.convert(text)
+        return _get_converter().convert(text)
     except Exception:
         return text
 
@@ -75,35 +126,37 @@ def _split_cjk_text(text: str, max_length: int, traditional: bool = False) -> Li
         text = _convert_traditional(text)
     text = _clean_text(text)
 
+    # Single pass: terms are matched in place and punctuation is a set lookup,
+    # so no per-character slices of the remaining text are made
+    punctuation = _PUNCTUATION_SET
+    match_term = _PRESERVED_TERM_RE.match
+    length = len(text)
     lines: List[str] = []
     current = ''
     i = 0
-    while i < len(text):
-        if current == '' and _is_punctuation(text[i]):
+    while i < length:
+        char = text[i]
+        if current == '' and char in punctuation:
             if lines and len(lines[-1]) + 1 <= max_length:
-                lines[-1] += text[i]
+                lines[-1] += char
             i += 1
             continue
 
-        preserved = False
-        for term in PRESERVED_TERMS:
-            if text[i:].startswith(term):
-                preserved = True
-                if len(current) + len(term) <= max_length:
-                    current += term
-                else:
-                    if current:
-                        lines.append(current)
-                    current = term
-                i += len(term)
-                break
-        if preserved:
+        term_match = match_term(text, i)
+        if term_match:
+            term = term_match.group()
+            if len(current) + len(term) <= max_length:
+                current += term
+            else:
+                if current:
+                    lines.append(current)
+                current = term
+            i += len(term)
             continue
 
-        char = text[i]
-        lookahead = text[i + 1] if i + 1 < len(text) else ''
+        lookahead = text[i + 1] if i + 1 < length else ''
         if len(current) + 1 <= max_length:
-            if lookahead and _is_punctuation(lookahead) and len(current) + 2 <= max_length:
+            if lookahead and lookahead in punctuation and len(current) + 2 <= max_length:
                 current += char + lookahead
                 i += 2
             else:
@@ -115,7 +168,7 @@ def _split_cjk_text(text: str, max_length: int, traditional: bool = False) -> Li
             current = char
             i += 1
 
-        if current and current.endswith(('。', '！', '!', '？', '?')):
+        if current and current.endswith(_SENTENCE_END_CHARS):
             lines.append(current)
             current = ''
 
@@ -129,10 +182,9 @@ def _split_japanese(text: str, max_length: int) -> List[str]:
     if not HAS_FUGASHI:
         return _split_cjk_text(text, max_length)
     try:
-        import fugashi
-
-        tagger = fugashi.Tagger()
-        words = [word.surface for word in tagger(text)]
+        tagger = _get_tagger()
+        with _tagger_lock:
+            words = [word.surface for word in tagger(text)]
         lines: List[str] = []
         current = ''
         for word in words:
@@ -205,7 +257,79 @@ def _split_text(text: str, language_code: str) -> List[str]:
     return _split_lines(text, max_len, is_cjk, language=language)
 
 
-def refine_segments(segments: List[dict], language_code: str) -> List[dict]:
+def _visible_length(text: str) -> int:
+    return len(''.join(text.split()))
+
+
+def _segment_words(segment: dict, words: Optional[List[dict]], start: float, end: float) -> List[dict]:
+    """Words belonging to *segment*: its own ``words`` or the top-level ones whose midpoint falls inside it."""
+    own_words = segment.get('words') or []
+    candidates = own_words or words or []
+    usable = []
+    for word in candidates:
+        try:
+            word_start = float(word.get('start'))
+            word_end = float(word.get('end'))
+        except (TypeError, ValueError):
+            continue
+        if not own_words and not start <= (word_start + word_end) / 2 < end:
+            continue
+        if _visible_length(str(word.get('word') or '')):
+            usable.append({'word': str(word['word']), 'start': word_start, 'end': max(word_start, word_end)})
+    return usable
+
+
+def _line_timings(lines: List[str], start: float, end: float, words: List[dict]) -> List[Tuple[float, float]]:
+    """Give each line the start of its first word and the end of its last one.
+
+    Lines and words are matched by position in the visible (non-whitespace)
+    characters, scaled when the split text and the word list disagree in
+    length (e.g. after simplified -> traditional conversion). Without words the
+    segment is shared out in proportion to each line's character count.
+    """
+    line_lengths = [max(1, _visible_length(line)) for line in lines]
+    line_total = float(sum(line_lengths))
+
+    if not words:
+        timings = []
+        duration = max(end - start, 0.5)
+        consumed = 0
+        for length in line_lengths:
+            line_start = start + duration * consumed / line_total
+            consumed += length
+            timings.append((line_start, start + duration * consumed / line_total))
+        return timings
+
+    word_ends: List[int] = []
+    total = 0
+    for word in words:
+        total += max(1, _visible_length(word['word']))
+        word_ends.append(total)
+    ratio = total / line_total
+
+    timings = []
+    consumed = 0
+    previous_end = start
+    for length in line_lengths:
+        first_char = consumed * ratio
+        consumed += length
+        last_char = consumed * ratio
+        first = min(bisect_right(word_ends, first_char), len(words) - 1)
+        last = max(first, min(bisect_left(word_ends, last_char), len(words) - 1))
+        line_start = max(words[first]['start'], previous_end if timings else start)
+        line_end = max(words[last]['end'], line_start + 0.2)
+        timings.append((line_start, line_end))
+        previous_end = line_end
+    return timings
+
+
+def refine_segments(segments: List[dict], language_code: str, words: Optional[List[dict]] = None) -> List[dict]:
+    """Split segments into display lines.
+
+    With Whisper word timestamps (per segment or the top-level *words* list)
+    each line spans its own words; otherwise lines share the segment in
+    proportion to their length.
+    """
     refined: List[dict] = []
     if not segments:
         return refined
@@ -225,21 +349,24 @@ def refine_segments(segments: List[dict], language_code: str) -> List[dict]:
         if end <= start:
             end = start + 0.5
 
-        lines = _split_text(text, language_code)
+        lines = [line.strip() for line in _split_text(text, language_code) if line.strip()]
         if not lines:
             continue
 
-        duration = max(end - start, 0.5)
-        slice_duration = duration / len(lines)
-        for index, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-            seg_start = start + index * slice_duration
-            seg_end = start + (index + 1) * slice_duration
+        timings = _line_timings(lines, start, end, _segment_words(segment, words, start, end))
+        for line, (seg_start, seg_end) in zip(lines, timings):
             refined.append({
                 'start': seg_start,
                 'end': seg_end,
                 'text': line,
             })
     return refined
+
+
+def split_subtitle_text(text: str, language_code: str) -> List[str]:
+    """Split *text* into display lines using the same per-language rules as refine_segments."""
+    return [line.strip() for line in _split_text(text, language_code) if line.strip()]
+
+
+if os.environ.get('SUBTITLE_TEXT_TOOLS_WARMUP', '').lower() in {'1', 'true', 'yes'}:
+    threading.Thread(target=warm_text_tools, name='subtitle-text-warmup', daemon=True).start()
@@ -1,7 +1,13 @@
+import io
 import json
 import os
 import logging
-from functools import partial
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -10,7 +16,9 @@ from moviepy.editor import CompositeVideoClip, ImageClip, VideoFileClip
 from moviepy.video.tools.subtitles import SubtitlesClip
 from PIL import Image, ImageDraw, ImageFont
 
-from ffmpeg_config import FFMPEG_THREADS
+import ffmpeg
+
+from ffmpeg_config import FFMPEG_THREADS, FFMPEG_THREAD_STR
 
 try:  # Optional dependencies for proper RTL shaping
     import arabic_reshaper  # type: ignore
@@ -23,6 +31,9 @@ except Exception:  # pragma: no cover - optional runtime dep
     bidi_get_display = None
 
 from subtitle_processing import refine_segments
+import transcription_cache
+from subtitle_alignment import align_script, read_script_sidecar
+from whisper_chunking import VIDEO_SUFFIXES, extract_transcription_audio, transcribe_with_chunking
 
 from language_config import (
     LANGUAGES,
@@ -32,6 +43,20 @@ from language_config import (
 )
 
 LOGGER = logging.getLogger(__name__)
+SUBTITLE_TIMING_MODE = os.environ.get("SUBTITLE_TIMING_MODE", "auto").strip().lower()
+# "ffmpeg" overlays pre-rendered caption PNGs natively; "ass" lets libass render an
+# ASS script (no Python rasterization); "moviepy" composites frames in Python
+SUBTITLE_BURN_BACKENDS = ("ffmpeg", "ass", "moviepy")
+# Backends tried, in order, when the requested one fails
+_BURN_FALLBACK_CHAINS = {
+    "ass": ("ass", "ffmpeg", "moviepy"),
+    "ffmpeg": ("ffmpeg", "moviepy"),
+    "moviepy": ("moviepy",),
+}
+SUBTITLE_BURN_BACKEND = os.environ.get("SUBTITLE_BURN_BACKEND", "ffmpeg").strip().lower()
+SUBTITLE_END_OFFSET = 0.8
+# Segments still drive line grouping; words give each line its real start/end
+WHISPER_TIMESTAMP_GRANULARITIES = ("word", "segment")
 FONT_DIRECTORY = Path(__file__).parent / "static" / "fonts"
 
 
@@ -177,6 +202,16 @@ def _parse_color(color: object, default_alpha: int = 255) -> Tuple[int, int, int
     return 255, 255, 255, default_alpha
 
 
+def normalize_burn_backend(value: Optional[str]) -> str:
+    """Return a known burn backend, falling back to ``SUBTITLE_BURN_BACKEND``."""
+    candidate = (value or "").strip().lower()
+    if candidate in SUBTITLE_BURN_BACKENDS:
+        return candidate
+    if SUBTITLE_BURN_BACKEND in SUBTITLE_BURN_BACKENDS:
+        return SUBTITLE_BURN_BACKEND
+    return "ffmpeg"
+
+
 def get_available_subtitle_styles() -> List[Dict[str, str]]:
     return [
         {"id": key, "name": config["name"], "description": config["description"]}
@@ -217,7 +252,20 @@ def _shape_text_for_language(text: str, old_code: str) -> str:
     return text
 
 
-def _load_font(old_code: str, font_size: int) -> ImageFont.FreeTypeFont:
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+# Loaded FreeType faces keyed by (path, size); CJK OTFs are ~16 MB each to parse
+FONT_CACHE_SIZE = _env_int("SUBTITLE_FONT_CACHE_SIZE", 64)
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_source(old_code: str) -> Optional[str]:
+    """Return the first loadable font path/name for *old_code*, memoized per language."""
     candidates = LANGUAGE_FONT_CANDIDATES.get(old_code, []) + DEFAULT_FONT_CANDIDATES
     search_dirs = FONT_SEARCH_DIRS or [FONT_DIRECTORY]
     last_error: Optional[Exception] = None
@@ -227,62 +275,188 @@ def _load_font(old_code: str, font_size: int) -> ImageFont.FreeTypeFont:
             candidate_path = directory / candidate
             if candidate_path.exists():
                 try:
-                    return ImageFont.truetype(str(candidate_path), font_size)
+                    _truetype(str(candidate_path), 12)
+                    return str(candidate_path)
                 except Exception as exc:
                     last_error = exc
                     continue
         try:
-            return ImageFont.truetype(candidate, font_size)
+            _truetype(candidate, 12)
+            return candidate
         except Exception as exc:
             last_error = exc
             continue
 
     if last_error:
         LOGGER.warning("Font fallback for %s due to: %s", old_code, last_error)
-    LOGGER.warning("Falling back to default PIL font for language %s", old_code)
-    return ImageFont.load_default()
+    return None
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE or None)
+def _truetype(source: str, font_size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(source, font_size)
+
+
+def _load_font(old_code: str, font_size: int) -> ImageFont.FreeTypeFont:
+    source = _resolve_font_source(old_code)
+    if source is None:
+        LOGGER.warning("Falling back to default PIL font for language %s", old_code)
+        return ImageFont.load_default()
+    return _truetype(source, font_size)
+
+
+def get_font_cache_stats() -> Dict[str, object]:
+    """Hit/miss counters for loaded fonts and per-language path resolution."""
+    fonts = _truetype.cache_info()
+    paths = _resolve_font_source.cache_info()
+    return {
+        "font_hits": fonts.hits,
+        "font_misses": fonts.misses,
+        "fonts_loaded": fonts.currsize,
+        "font_capacity": fonts.maxsize,
+        "languages_resolved": paths.currsize,
+    }
+
+
+def warm_font_cache() -> int:
+    """Resolve every language's font and load it at each style's base size."""
+    sizes = sorted({int(style.get("font_size", 54)) for style in SUBTITLE_STYLES.values()})
+    loaded = 0
+    for old_code in sorted(set(LANGUAGE_FONT_CANDIDATES) | {"EN"}):
+        source = _resolve_font_source(old_code)
+        if source is None:
+            continue
+        for size in sizes:
+            try:
+                _truetype(source, size)
+                loaded += 1
+            except Exception as exc:
+                LOGGER.warning("Font warmup failed for %s: %s", source, exc)
+    LOGGER.info("Font cache warmed with %s face(s): %s", loaded, get_font_cache_stats())
+    return loaded
+
+
+# One scratch surface per thread; textlength never draws on it
+_scratch = threading.local()
+
+
+def _scratch_draw() -> ImageDraw.ImageDraw:
+    draw = getattr(_scratch, "draw", None)
+    if draw is None:
+        draw = _scratch.draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    return draw
+
+
+@lru_cache(maxsize=_env_int("SUBTITLE_GLYPH_WIDTH_CACHE_SIZE", 16384))
+def _token_width(font: ImageFont.FreeTypeFont, token: str) -> float:
+    return _scratch_draw().textlength(token, font=font)
+
+
+def _greedy_lines(tokens: List[str], widths: List[float], joiner: str, joiner_width: float, max_width: int) -> List[str]:
+    """Pack tokens into lines using their cached advances instead of re-measuring each line."""
+    lines: List[str] = []
+    line_start = 0
+    line_width = 0.0
+    for index, width in enumerate(widths):
+        if index == line_start:
+            line_width = width
+            continue
+        candidate = line_width + joiner_width + width
+        if candidate <= max_width:
+            line_width = candidate
+        else:
+            lines.append(joiner.join(tokens[line_start:index]))
+            line_start = index
+            line_width = width
+    if line_start < len(tokens):
+        lines.append(joiner.join(tokens[line_start:]))
+    return lines
 
 
 def _wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int, old_code: str) -> List[str]:
     if max_width <= 0:
         return [text]
-    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
     if old_code in CJK_OLD_CODES:
         lines: List[str] = []
-        current = ""
-        for char in text:
-            if char == "\n":
-                lines.append(current)
-                current = ""
+        for paragraph in text.split("\n"):
+            chars = list(paragraph)
+            if not chars:
+                lines.append("")
                 continue
-            test = current + char
-            width = draw.textlength(test, font=font)
-            if width <= max_width or not current:
-                current = test
-            else:
-                lines.append(current)
-                current = char
-        if current:
-            lines.append(current)
+            widths = [_token_width(font, char) for char in chars]
+            lines.extend(_greedy_lines(chars, widths, "", 0.0, max_width))
+        # Match the old behaviour of dropping an empty trailing line
+        if lines and not lines[-1]:
+            lines.pop()
         return lines
     words = text.split()
     if not words:
         return [text]
-    lines = []
-    current = words[0]
-    for word in words[1:]:
-        test = f"{current} {word}"
-        width = draw.textlength(test, font=font)
-        if width <= max_width:
-            current = test
-        else:
-            lines.append(current)
-            current = word
-    lines.append(current)
-    return lines
+    widths = [_token_width(font, word) for word in words]
+    return _greedy_lines(words, widths, " ", _token_width(font, " "), max_width)
 
 
 def _create_text_clip(text: str, style_key: str, old_code: str, video_width: int, video_height: int) -> ImageClip:
+    png_bytes = _caption_png(text, style_key, old_code, video_width, video_height)
+    image = Image.open(io.BytesIO(png_bytes)).convert("RGBA")
+    return ImageClip(np.array(image)).set_duration(1)
+
+
+# Rendered captions as PNG bytes, shared across languages, burns and reburns
+CAPTION_CACHE_MAX_BYTES = _env_int("SUBTITLE_CAPTION_CACHE_MB", 128) * 1024 * 1024
+_caption_cache: "OrderedDict[Tuple[object, ...], bytes]" = OrderedDict()
+_caption_cache_bytes = 0
+_caption_cache_hits = 0
+_caption_cache_misses = 0
+_caption_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _style_fingerprint(style_key: str) -> str:
+    # Keyed by the style's settings, so editing one style leaves the others' captions cached
+    config = SUBTITLE_STYLES.get(style_key, SUBTITLE_STYLES["default"])
+    return json.dumps(config, sort_keys=True, default=str)
+
+
+def _caption_png(text: str, style_key: str, old_code: str, video_width: int, video_height: int) -> bytes:
+    """Return the rendered caption as PNG bytes, rendering it only on a cache miss."""
+    global _caption_cache_bytes, _caption_cache_hits, _caption_cache_misses
+    key = (text, _style_fingerprint(style_key), old_code, video_width, video_height)
+    with _caption_cache_lock:
+        cached = _caption_cache.get(key)
+        if cached is not None:
+            _caption_cache.move_to_end(key)
+            _caption_cache_hits += 1
+            return cached
+        _caption_cache_misses += 1
+
+    buffer = io.BytesIO()
+    _render_caption_image(text, style_key, old_code, video_width, video_height).save(buffer, format="PNG")
+    png_bytes = buffer.getvalue()
+
+    if CAPTION_CACHE_MAX_BYTES and len(png_bytes) <= CAPTION_CACHE_MAX_BYTES:
+        with _caption_cache_lock:
+            if key not in _caption_cache:
+                _caption_cache[key] = png_bytes
+                _caption_cache_bytes += len(png_bytes)
+                while _caption_cache_bytes > CAPTION_CACHE_MAX_BYTES:
+                    _, evicted = _caption_cache.popitem(last=False)
+                    _caption_cache_bytes -= len(evicted)
+    return png_bytes
+
+
+def get_caption_cache_stats() -> Dict[str, object]:
+    with _caption_cache_lock:
+        return {
+            "caption_hits": _caption_cache_hits,
+            "caption_misses": _caption_cache_misses,
+            "captions_cached": len(_caption_cache),
+            "caption_bytes": _caption_cache_bytes,
+        }
+
+
+def _render_caption_image(text: str, style_key: str, old_code: str, video_width: int, video_height: int) -> Image.Image:
+    """Render one caption as an RGBA image sized to its styled background."""
     config = SUBTITLE_STYLES.get(style_key, SUBTITLE_STYLES["default"])
     base_height = float(config.get("base_video_height", 1920)) or 1920
     base_width = float(config.get("base_video_width", base_height)) or base_height
@@ -312,7 +486,7 @@ def _create_text_clip(text: str, style_key: str, old_code: str, video_width: int
     stroke_fill = _parse_color(config.get("stroke_fill", "#00000080"))
     border_radius = int(config.get("border_radius", 12) * scale)
 
-    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    draw = _scratch_draw()
     bounding_boxes: List[Tuple[int, int, int, int]] = []
     line_heights: List[int] = []
     baseline_offsets: List[int] = []
@@ -381,8 +555,7 @@ def _create_text_clip(text: str, style_key: str, old_code: str, video_width: int
         )
         current_y += line_heights[idx]
 
-    array = np.array(image)
-    return ImageClip(array).set_duration(1)
+    return image
 
 
 def format_timestamp(seconds: float) -> str:
@@ -414,14 +587,15 @@ def transcribe_audio_for_subtitles(
     openai_client,
     prompt: Optional[str] = None,
 ) -> Dict[str, object]:
-    try:
-        with open(audio_path, "rb") as audio_file:
+    def transcribe_chunk(chunk_path: Path) -> Dict[str, object]:
+        with open(chunk_path, "rb") as audio_file:
             response = openai_client.audio.transcriptions.create(
                 file=audio_file,
                 model="whisper-1",
                 response_format="verbose_json",
                 language=language_iso,
                 prompt=prompt or "",
+                timestamp_granularities=list(WHISPER_TIMESTAMP_GRANULARITIES),
             )
         if hasattr(response, "model_dump"):
             payload = response.model_dump()
@@ -429,8 +603,22 @@ def transcribe_audio_for_subtitles(
             payload = response
         else:
             payload = json.loads(response)
-        segments = payload.get("segments", []) if isinstance(payload, dict) else []
-        return {"success": True, "segments": segments, "text": payload.get("text", "")}
+        if not isinstance(payload, dict):
+            return {"text": "", "segments": [], "words": []}
+        return {
+            "text": payload.get("text", ""),
+            "segments": payload.get("segments") or [],
+            "words": payload.get("words") or [],
+        }
+
+    try:
+        payload = transcribe_with_chunking(audio_path, transcribe_chunk)
+        return {
+            "success": True,
+            "segments": payload.get("segments", []),
+            "words": payload.get("words", []),
+            "text": payload.get("text", ""),
+        }
     except Exception as exc:  # pragma: no cover - relies on network API
         LOGGER.error("Subtitle transcription failed: %s", exc)
         return {"success": False, "error": str(exc)}
@@ -442,23 +630,69 @@ def generate_srt_file(
     base_name: str,
     subtitles_dir: Path,
     openai_client,
+    timing_mode: Optional[str] = None,
 ) -> Dict[str, object]:
-    if openai_client is None:
-        return {"success": False, "error": "OpenAI client not configured"}
-
+    """Write an SRT for *audio_file*.
+
+    ``timing_mode`` is ``auto`` (align the known TTS script when a sidecar
+    exists, otherwise transcribe), ``align`` (same, but log when no script is
+    available) or ``transcribe`` (always ask Whisper). Defaults to
+    ``SUBTITLE_TIMING_MODE``.
+    """
+    timing_mode = (timing_mode or SUBTITLE_TIMING_MODE).lower()
     iso_code, old_code = _normalize_codes(language_code)
     audio_path = Path(audio_file)
     subtitles_dir.mkdir(parents=True, exist_ok=True)
     srt_path = subtitles_dir / f"{base_name}.srt"
 
-    result = transcribe_audio_for_subtitles(audio_path, iso_code, openai_client)
-    if not result.get("success"):
-        return {"success": False, "error": result.get("error"), "language": old_code}
+    result: Optional[Dict[str, object]] = None
+    aligned_segments: List[Dict[str, object]] = []
+    if timing_mode in ("auto", "align"):
+        script = read_script_sidecar(audio_path)
+        if script:
+            aligned_segments = align_script(audio_path, script, language_code)
+            if aligned_segments:
+                result = {"success": True, "segments": aligned_segments, "text": script, "timing_source": "alignment"}
+        elif timing_mode == "align":
+            LOGGER.info("No script sidecar for %s; falling back to transcription", audio_path.name)
+
+    if result is None:
+        if openai_client is None:
+            return {"success": False, "error": "OpenAI client not configured"}
+
+        # Regenerated-but-identical voiceovers and retries reuse the earlier Whisper response
+        cache_key = transcription_cache.cache_key(
+            audio_path,
+            language=iso_code,
+            prompt="",
+            timestamp_granularities=WHISPER_TIMESTAMP_GRANULARITIES,
+        )
+        result = transcription_cache.get(cache_key)
+        if result is None:
+            extracted_path: Optional[Path] = None
+            if audio_path.suffix.lower() in VIDEO_SUFFIXES:
+                # Upload compressed speech instead of the whole video
+                extracted_path = extract_transcription_audio(audio_path, subtitles_dir / f"{base_name}_speech")
+                if extracted_path is None:
+                    return {"success": False, "error": "Could not extract audio from video", "language": old_code}
+
+            try:
+                result = transcribe_audio_for_subtitles(extracted_path or audio_path, iso_code, openai_client)
+            finally:
+                if extracted_path is not None:
+                    try:
+                        extracted_path.unlink()
+                    except OSError:
+                        pass
+            if not result.get("success"):
+                return {"success": False, "error": result.get("error"), "language": old_code}
+            transcription_cache.put(cache_key, result)
 
     raw_segments = result.get("segments", [])
     transcript_text = (result.get("text") or "").strip()
 
-    refined_segments = refine_segments(raw_segments, language_code)
+    # Aligned segments are already split into display lines
+    refined_segments = aligned_segments or refine_segments(raw_segments, language_code, words=result.get("words"))
     fallback_used = False
 
     if not refined_segments and transcript_text:
@@ -505,23 +739,297 @@ def generate_srt_file(
         "segments": refined_segments,
         "text": transcript_text,
         "fallback_used": fallback_used,
+        "timing_source": result.get("timing_source", "transcription"),
         "transcript_path": str(transcript_path) if transcript_path else None,
     }
 
 
-def burn_subtitles_onto_video(
-    video_path: str,
+def _probe_video(video_path: str) -> Dict[str, object]:
+    probe = ffmpeg.probe(str(video_path))
+    video_stream = next(stream for stream in probe["streams"] if stream.get("codec_type") == "video")
+    duration = probe.get("format", {}).get("duration") or video_stream.get("duration") or 0.0
+    return {
+        "width": int(video_stream["width"]),
+        "height": int(video_stream["height"]),
+        "duration": float(duration),
+        "has_audio": any(stream.get("codec_type") == "audio" for stream in probe["streams"]),
+    }
+
+
+def _clip_duration(video_path: str) -> float:
+    """Duration as MoviePy reads it; used when ffprobe is unavailable."""
+    clip = VideoFileClip(video_path)
+    try:
+        return float(clip.duration or 0.0)
+    finally:
+        clip.close()
+
+
+def _resolve_burn_segments(
     srt_path: str,
-    output_path: str,
-    language_code: str,
-    style_key: str = "default",
-    segments: Optional[List[Dict[str, object]]] = None,
-) -> Dict[str, object]:
+    segments: Optional[List[Dict[str, object]]],
+    video_duration: float,
+) -> Tuple[List[Dict[str, object]], bool]:
+    """Return the segments to burn and whether a fallback had to be generated."""
+    segment_list = _ensure_segment_list(segments) if segments else _ensure_segment_list(_load_segments_from_srt(Path(srt_path)))
+    fallback_generated = False
+    if not segment_list:
+        try:
+            raw_lines = [
+                line.strip()
+                for line in Path(srt_path).read_text(encoding="utf-8", errors="ignore").splitlines()
+                if line.strip() and not line.strip().isdigit() and '-->' not in line
+            ]
+            fallback_text = ' '.join(raw_lines).strip()
+        except Exception:
+            fallback_text = ''
+
+        if fallback_text:
+            fallback_generated = True
+            duration = max(video_duration - 0.5, 1.0)
+            segment_list = _ensure_segment_list([
+                {
+                    'start': 0.0,
+                    'end': duration,
+                    'text': fallback_text,
+                }
+            ])
+
+    if not segment_list:
+        fallback_generated = True
+        fallback_text = "(no subtitles available)"
+        duration = max(video_duration - 0.5, 1.0)
+        segment_list = _ensure_segment_list([
+            {
+                'start': 0.0,
+                'end': duration,
+                'text': fallback_text,
+            }
+        ])
+    return segment_list, fallback_generated
+
+
+def _burn_with_ffmpeg_overlay(
+    video_path: str,
+    segment_list: List[Dict[str, object]],
+    output_file: Path,
+    style_key: str,
+    old_code: str,
+    video_info: Dict[str, object],
+) -> None:
+    """Overlay one pre-rendered PNG per caption, timed with ``enable=between(t,a,b)``.
+
+    Captions are drawn by the same ``_render_caption_image`` the MoviePy path
+    uses and placed at the same position, so output matches it while ffmpeg
+    encodes natively and stream-copies the audio.
+    """
+    video_width = int(video_info["width"])
+    video_height = int(video_info["height"])
+    effective_end = max(0.0, float(video_info["duration"]) - SUBTITLE_END_OFFSET)
+    vertical_ratio = SUBTITLE_STYLES.get(style_key, SUBTITLE_STYLES["default"]).get("vertical_position", 0.75)
+    pos_y = int(video_height * vertical_ratio)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="captions_", dir=str(output_file.parent)))
+    try:
+        source = ffmpeg.input(str(video_path))
+        video = source.video
+        caption_inputs: Dict[str, object] = {}
+        for segment in segment_list:
+            start = float(segment["start"])
+            end = min(float(segment["end"]), effective_end)
+            if end <= start:
+                continue
+            text = segment["text"]
+            caption = caption_inputs.get(text)
+            if caption is None:
+                image_path = work_dir / f"caption_{len(caption_inputs):04d}.png"
+                image_path.write_bytes(_caption_png(text, style_key, old_code, video_width, video_height))
+                caption = caption_inputs[text] = ffmpeg.input(str(image_path))
+            video = ffmpeg.overlay(
+                video,
+                caption,
+                x="(main_w-overlay_w)/2",
+                y=pos_y,
+                enable=f"between(t,{start:.3f},{end:.3f})",
+            )
+
+        streams = [video]
+        output_kwargs = {"vcodec": "libx264", "pix_fmt": "yuv420p"}
+        if video_info.get("has_audio"):
+            streams.append(source.audio)
+            output_kwargs["acodec"] = "copy"
+        (
+            ffmpeg
+            .output(*streams, str(output_file), **output_kwargs)
+            .global_args('-threads', FFMPEG_THREAD_STR)
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _ass_color(color: object) -> str:
+    """Convert ``#RRGGBB[AA]`` to ASS ``&HAABBGGRR`` (ASS alpha 00 is opaque)."""
+    r, g, b, a = _parse_color(color)
+    return f"&H{255 - a:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def _ass_timestamp(seconds: float) -> str:
+    centiseconds = int(round(max(0.0, seconds) * 100))
+    hours, remainder = divmod(centiseconds, 360000)
+    minutes, remainder = divmod(remainder, 6000)
+    secs, centis = divmod(remainder, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def _ass_escape(text: str) -> str:
+    # Braces open override blocks and a backslash starts a tag; neither may leak from captions
+    text = text.replace("\\", "\u2216").replace("{", "\uff5b").replace("}", "\uff5d")
+    return "\\N".join(line.strip() for line in text.splitlines())
+
+
+def build_ass_script(
+    segment_list: List[Dict[str, object]],
+    style_key: str,
+    old_code: str,
+    video_width: int,
+    video_height: int,
+    effective_end: Optional[float] = None,
+) -> Tuple[str, Optional[str]]:
+    """Translate a ``SUBTITLE_STYLES`` entry and segments into an ASS script.
+
+    Returns the script text and the font file it names, so the caller can
+    point libass at the right ``fontsdir``. Sizes use the same scaling as
+    ``_render_caption_image`` and ``PlayResX/Y`` match the video, so
+    coordinates are in pixels. A non-transparent background becomes an opaque
+    box (``BorderStyle=3``); libass cannot round its corners.
+    """
+    config = SUBTITLE_STYLES.get(style_key, SUBTITLE_STYLES["default"])
+    base_height = float(config.get("base_video_height", 1920)) or 1920
+    base_width = float(config.get("base_video_width", base_height)) or base_height
+    raw_scale = max(video_height / base_height, video_width / base_width)
+    scale = max(float(config.get("min_scale", 0.55)), min(float(config.get("max_scale", 1.5)), raw_scale))
+
+    font_size = int(config.get("font_size", 54) * scale)
+    font_source = _resolve_font_source(old_code)
+    font_name = "Sans"
+    if font_source is not None:
+        try:
+            font_name = _truetype(font_source, 12).getname()[0] or font_name
+        except Exception as exc:
+            LOGGER.warning("Could not read font family from %s: %s", font_source, exc)
+
+    background = _parse_color(config.get("background_color", "#000000A0"))
+    padding_x, padding_y = config.get("padding", (36, 22))
+    if background[3] > 0:
+        border_style = 3
+        outline = max(1, int(padding_y * scale))
+        outline_color = _ass_color(background)
+    else:
+        border_style = 1
+        outline = max(0, int(config.get("stroke_width", 0) * scale))
+        outline_color = _ass_color(config.get("stroke_fill", "#00000080"))
+    primary_color = _ass_color(config.get("text_color", "#FFFFFF"))
+
+    margin_x = max(0, int(video_width * (1.0 - float(config.get("max_width_ratio", 0.8))) / 2))
+    # The PIL path puts the top of the caption box at vertical_position
+    top = int(video_height * float(config.get("vertical_position", 0.75)))
+    text_top = top + (int(padding_y * scale) if border_style == 3 else 0)
+    alignment = 9 if old_code in RTL_OLD_CODES else 8
+    anchor_x = video_width - margin_x if alignment == 9 else video_width // 2
+
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {video_width}",
+        f"PlayResY: {video_height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        f"Style: Caption,{font_name},{font_size},{primary_color},{primary_color},{outline_color},&H00000000,"
+        f"0,0,0,0,100,100,0,0,{border_style},{outline},0,{alignment},{margin_x},{margin_x},0,1",
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for segment in segment_list:
+        start = float(segment["start"])
+        end = float(segment["end"])
+        if effective_end is not None:
+            end = min(end, effective_end)
+        if end <= start:
+            continue
+        text = _ass_escape(str(segment["text"]))
+        lines.append(
+            f"Dialogue: 0,{_ass_timestamp(start)},{_ass_timestamp(end)},Caption,,0,0,0,,"
+            f"{{\\pos({anchor_x},{text_top})}}{text}"
+        )
+    return "\n".join(lines) + "\n", font_source
+
+
+def _burn_with_ass(
+    video_path: str,
+    segment_list: List[Dict[str, object]],
+    output_file: Path,
+    style_key: str,
+    old_code: str,
+    video_info: Dict[str, object],
+) -> None:
+    """Burn captions with ffmpeg's ``subtitles`` filter; libass shapes RTL and CJK itself."""
+    effective_end = max(0.0, float(video_info["duration"]) - SUBTITLE_END_OFFSET)
+    script, font_source = build_ass_script(
+        segment_list,
+        style_key,
+        old_code,
+        int(video_info["width"]),
+        int(video_info["height"]),
+        effective_end,
+    )
+    fonts_dir = FONT_DIRECTORY
+    if font_source and Path(font_source).exists():
+        fonts_dir = Path(font_source).parent
+
+    fd, ass_path = tempfile.mkstemp(prefix="captions_", suffix=".ass", dir=str(output_file.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(script)
+        source = ffmpeg.input(str(video_path))
+        video = ffmpeg.filter(source.video, "subtitles", filename=ass_path, fontsdir=str(fonts_dir))
+        streams = [video]
+        output_kwargs = {"vcodec": "libx264", "pix_fmt": "yuv420p"}
+        if video_info.get("has_audio"):
+            streams.append(source.audio)
+            output_kwargs["acodec"] = "copy"
+        (
+            ffmpeg
+            .output(*streams, str(output_file), **output_kwargs)
+            .global_args('-threads', FFMPEG_THREAD_STR)
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    finally:
+        try:
+            os.remove(ass_path)
+        except OSError:
+            pass
+
+
+def _burn_with_moviepy(
+    video_path: str,
+    segment_list: List[Dict[str, object]],
+    output_file: Path,
+    style_key: str,
+    old_code: str,
+) -> None:
     video_clip = None
     subtitles = None
     result_clip = None
     try:
-        _, old_code = _normalize_codes(language_code)
         video_clip = VideoFileClip(video_path)
         video_width, video_height = video_clip.size
 
@@ -533,45 +1041,6 @@ def burn_subtitles_onto_video(
             video_height=video_height,
         )
 
-        segment_list = _ensure_segment_list(segments) if segments else _ensure_segment_list(_load_segments_from_srt(Path(srt_path)))
-        fallback_generated = False
-        if not segment_list:
-            try:
-                raw_lines = [
-                    line.strip()
-                    for line in Path(srt_path).read_text(encoding="utf-8", errors="ignore").splitlines()
-                    if line.strip() and not line.strip().isdigit() and '-->' not in line
-                ]
-                fallback_text = ' '.join(raw_lines).strip()
-            except Exception:
-                fallback_text = ''
-
-            if fallback_text:
-                fallback_generated = True
-                duration = max(video_clip.duration - 0.5, 1.0)
-                segment_list = _ensure_segment_list([
-                    {
-                        'start': 0.0,
-                        'end': duration,
-                        'text': fallback_text,
-                    }
-                ])
-
-        if not segment_list:
-            fallback_generated = True
-            fallback_text = "(no subtitles available)"
-            duration = max(video_clip.duration - 0.5, 1.0)
-            segment_list = _ensure_segment_list([
-                {
-                    'start': 0.0,
-                    'end': duration,
-                    'text': fallback_text,
-                }
-            ])
-
-        if not segment_list:
-            return {"success": False, "error": "Subtitle file has no entries"}
-
         subtitle_tuples = [((seg['start'], seg['end']), seg['text']) for seg in segment_list]
         subtitles = SubtitlesClip(subtitle_tuples, generator)
         clip_list = (
@@ -581,19 +1050,16 @@ def burn_subtitles_onto_video(
             or getattr(subtitles, 'subtitles', [])
         )
         if not clip_list:
-            return {"success": False, "error": "Subtitle file has no entries"}
+            raise ValueError("Subtitle file has no entries")
 
-        end_offset = 0.8
         subtitle_end = max(end for ((_, end), _) in subtitle_tuples)
-        effective_end = min(subtitle_end, max(0, video_clip.duration - end_offset))
+        effective_end = min(subtitle_end, max(0, video_clip.duration - SUBTITLE_END_OFFSET))
         subtitles = subtitles.subclip(0, effective_end)
         vertical_ratio = SUBTITLE_STYLES.get(style_key, SUBTITLE_STYLES["default"]).get("vertical_position", 0.75)
         pos_y = int(video_height * vertical_ratio)
         subtitles = subtitles.set_position(("center", pos_y))
 
         result_clip = CompositeVideoClip([video_clip, subtitles])
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
         result_clip.write_videofile(
             str(output_file),
             codec="libx264",
@@ -605,24 +1071,95 @@ def burn_subtitles_onto_video(
             verbose=False,
             logger=None,
         )
+    finally:
+        for clip in (result_clip, subtitles, video_clip):
+            try:
+                if clip:
+                    clip.close()
+            except Exception:
+                continue
+
+
+def burn_subtitles_onto_video(
+    video_path: str,
+    srt_path: str,
+    output_path: str,
+    language_code: str,
+    style_key: str = "default",
+    segments: Optional[List[Dict[str, object]]] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, object]:
+    """Burn *segments* (or the SRT) onto the video with the requested backend.
+
+    *backend* overrides ``SUBTITLE_BURN_BACKEND`` for this call. ffmpeg-based
+    backends fall back to the next one on failure (ass -> ffmpeg -> moviepy),
+    and straight to MoviePy when the video cannot be probed with ffprobe.
+    """
+    try:
+        _, old_code = _normalize_codes(language_code)
+        requested_backend = normalize_burn_backend(backend)
+        chain = _BURN_FALLBACK_CHAINS[requested_backend]
+        video_info: Optional[Dict[str, object]] = None
+        if chain[0] != "moviepy":
+            try:
+                video_info = _probe_video(video_path)
+            except Exception as exc:
+                # The ffmpeg backends need ffprobe; MoviePy only needs its bundled ffmpeg
+                LOGGER.warning("Could not probe %s, burning with moviepy: %s", video_path, exc)
+                chain = _BURN_FALLBACK_CHAINS["moviepy"]
+        video_duration = float(video_info["duration"]) if video_info else _clip_duration(video_path)
+
+        segment_list, fallback_generated = _resolve_burn_segments(srt_path, segments, video_duration)
+        if not segment_list:
+            return {"success": False, "error": "Subtitle file has no entries"}
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        used_backend = None
+        for index, candidate in enumerate(chain):
+            try:
+                if candidate == "moviepy":
+                    _burn_with_moviepy(video_path, segment_list, output_file, style_key, old_code)
+                elif candidate == "ass":
+                    _burn_with_ass(video_path, segment_list, output_file, style_key, old_code, video_info)
+                else:
+                    _burn_with_ffmpeg_overlay(video_path, segment_list, output_file, style_key, old_code, video_info)
+                used_backend = candidate
+                break
+            except Exception as exc:
+                # Writing the .ass/PNG files, fonts or the style can fail as well as ffmpeg itself
+                if index == len(chain) - 1:
+                    raise
+                stderr = getattr(exc, "stderr", None)
+                detail = stderr.decode(errors="ignore") if isinstance(stderr, bytes) else exc
+                LOGGER.warning("%s subtitle burn failed, trying the next backend: %s", candidate, detail)
+        burn_seconds = round(time.perf_counter() - started, 3)
+
+        LOGGER.info(
+            "Subtitle burn done for %s with %s in %.2fs; font cache %s; caption cache %s",
+            old_code,
+            used_backend,
+            burn_seconds,
+            get_font_cache_stats(),
+            get_caption_cache_stats(),
+        )
         return {
             "success": True,
             "output_path": str(output_file),
             "language": old_code,
             "style": style_key,
+            "backend": used_backend,
+            "burn_seconds": burn_seconds,
             "fallback_generated": fallback_generated,
             "segments": segment_list,
         }
     except Exception as exc:  # pragma: no cover - relies on video processing
         LOGGER.exception("Failed to burn subtitles: %s", exc)
         return {"success": False, "error": str(exc)}
-    finally:
-        for clip in (result_clip, subtitles, video_clip):
-            try:
-                if clip:
-                    clip.close()
-            except Exception:
-                continue
+
+
 def _ensure_segment_list(segment_list: List[Dict[str, object]]) -> List[Dict[str, object]]:
     valid_segments: List[Dict[str, object]] = []
     for segment in segment_list or []:
@@ -690,3 +1227,7 @@ def _load_segments_from_srt(path: Path) -> List[Dict[str, object]]:
             continue
         segments.append({"start": start_seconds, "end": end_seconds, "text": text})
     return segments
+
+
+if os.environ.get("SUBTITLE_FONT_WARMUP", "").lower() in {"1", "true", "yes"}:
+    threading.Thread(target=warm_font_cache, name="subtitle-font-warmup", daemon=True).start()
@@ -0,0 +1,139 @@
+"""Whisper results cached by audio fingerprint, language and prompt.
+
+Voiceovers are often regenerated unchanged and source videos re-uploaded, so
+the same bytes get transcribed again and again. Responses are stored as JSON
+under ``TRANSCRIPTION_CACHE_DIR`` keyed by the SHA-256 of the media plus every
+request parameter that changes Whisper's output, with a small in-memory LRU in
+front of the directory.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from media_hash import file_sha256
+
+logger = logging.getLogger('transcription_cache')
+
+TRANSCRIPTION_CACHE_DIR = Path(os.environ.get('TRANSCRIPTION_CACHE_DIR', 'temp_files/_transcription_cache'))
+
+try:
+    TRANSCRIPTION_CACHE_MAX_ENTRIES = max(0, int(os.environ.get('TRANSCRIPTION_CACHE_MAX_ENTRIES', '2000')))
+except (TypeError, ValueError):
+    TRANSCRIPTION_CACHE_MAX_ENTRIES = 2000
+
+_MEMORY_ENTRIES = 128
+_memory: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+_lock = threading.Lock()
+_writes_since_evict = 0
+
+
+def cache_key(
+    media_path,
+    *,
+    language: Optional[str] = None,
+    prompt: Optional[str] = None,
+    response_format: str = 'verbose_json',
+    model: str = 'whisper-1',
+    timestamp_granularities: Sequence[str] = (),
+) -> Optional[str]:
+    """Return the cache key for transcribing *media_path*, or None if it is unreadable."""
+    try:
+        media_hash = file_sha256(media_path)
+    except OSError as exc:
+        logger.warning('Cannot fingerprint %s for transcription cache: %s', media_path, exc)
+        return None
+    parts = [media_hash, model, response_format, language or '', prompt or '']
+    if timestamp_granularities:
+        # Only appended when set so keys for plain requests stay unchanged
+        parts.append(','.join(sorted(timestamp_granularities)))
+    material = '\x1f'.join(parts)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return TRANSCRIPTION_CACHE_DIR / key[:2] / f'{key}.json'
+
+
+def get(key: Optional[str]) -> Optional[Dict[str, object]]:
+    """Return a copy of the cached payload for *key*."""
+    if not key:
+        return None
+    with _lock:
+        payload = _memory.get(key)
+        if payload is not None:
+            _memory.move_to_end(key)
+            return dict(payload)
+
+    path = _entry_path(key)
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+
+    _remember(key, payload)
+    logger.info('Transcription cache hit %s', key[:12])
+    return dict(payload)
+
+
+def put(key: Optional[str], payload: Dict[str, object]) -> None:
+    """Store *payload* for *key* (atomically on disk)."""
+    global _writes_since_evict
+    if not key:
+        return
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.part')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            json.dump(payload, handle, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.warning('Could not store transcription cache entry: %s', exc)
+        return
+
+    _remember(key, payload)
+    with _lock:
+        _writes_since_evict += 1
+        should_evict = _writes_since_evict >= 50
+        if should_evict:
+            _writes_since_evict = 0
+    if should_evict:
+        _evict()
+
+
+def _remember(key: str, payload: Dict[str, object]) -> None:
+    with _lock:
+        _memory[key] = payload
+        _memory.move_to_end(key)
+        while len(_memory) > _MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _evict() -> None:
+    """Keep at most TRANSCRIPTION_CACHE_MAX_ENTRIES files, dropping the least recently used."""
+    if not TRANSCRIPTION_CACHE_MAX_ENTRIES:
+        return
+    try:
+        entries = [(path, path.stat().st_mtime) for path in TRANSCRIPTION_CACHE_DIR.glob('*/*.json')]
+    except OSError:
+        return
+    excess = len(entries) - TRANSCRIPTION_CACHE_MAX_ENTRIES
+    if excess <= 0:
+        return
+    for path, _ in sorted(entries, key=lambda item: item[1])[:excess]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+__all__ = ['cache_key', 'get', 'put']
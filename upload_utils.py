@@ -0,0 +1,79 @@
+"""Chunked upload persistence shared by the converter and AdLocalizer routes.
+
+Uploads are copied from the request stream in fixed-size chunks into a
+temporary file next to the destination, hashed in the same pass, and renamed
+into place, so peak memory stays at one chunk whatever the upload size and a
+failed or rejected upload never leaves a partial file behind. The SHA-256 is
+recorded with ``media_hash`` so content-keyed caches (transcriptions, music
+beds) do not re-read the file.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tempfile
+from typing import Optional
+
+from media_hash import remember_hash
+
+try:
+    _configured_chunk_mb = int(os.environ.get('VIDEO_UPLOAD_CHUNK_MB', '8'))
+except (TypeError, ValueError):
+    _configured_chunk_mb = 8
+
+UPLOAD_CHUNK_BYTES = max(256 * 1024, _configured_chunk_mb * 1024 * 1024)
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload streams more than the allowed number of bytes."""
+
+    def __init__(self, limit_bytes: int):
+        super().__init__(f'Upload exceeds {limit_bytes / (1024 * 1024):.0f}MB limit')
+        self.limit_bytes = limit_bytes
+
+
+def stream_save_file(file_storage, destination_path, chunk_size=UPLOAD_CHUNK_BYTES, max_bytes: Optional[int] = None):
+    """Persist an uploaded file to disk without loading the full payload into memory.
+
+    Returns the number of bytes written. Raises ``UploadTooLarge`` as soon as
+    more than *max_bytes* have been read; the partial file is discarded.
+    """
+    destination_path = os.fspath(destination_path)
+    directory = os.path.dirname(destination_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    file_stream = getattr(file_storage, 'stream', None)
+    if file_stream and hasattr(file_stream, 'seek'):
+        try:
+            file_stream.seek(0)
+        except (OSError, io.UnsupportedOperation):
+            pass
+
+    digest = hashlib.sha256()
+    bytes_written = 0
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload_', suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as output_file:
+            while True:
+                chunk = file_storage.stream.read(chunk_size)
+                if not chunk:
+                    break
+                bytes_written += len(chunk)
+                if max_bytes is not None and bytes_written > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                output_file.write(chunk)
+        os.replace(temp_path, destination_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    remember_hash(destination_path, digest.hexdigest())
+    return bytes_written
+
+
+__all__ = ['UPLOAD_CHUNK_BYTES', 'UploadTooLarge', 'stream_save_file']
@@ -15,7 +15,6 @@ import threading
 import time
 import argparse
 import gc
-import io
 import glob
 from collections import deque
 try:
@@ -24,6 +23,7 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 from tools_config import get_active_tools
+from upload_utils import stream_save_file
 
 # Import the video processing functions
 from video_converter import (
@@ -49,13 +49,6 @@ else:
     # None removes Flask's request limit so chunked uploads can flow through
     app.config.pop('MAX_CONTENT_LENGTH', None)
 
-try:
-    _configured_chunk_mb = int(os.environ.get('VIDEO_UPLOAD_CHUNK_MB', '8'))
-except (TypeError, ValueError):
-    _configured_chunk_mb = 8
-
-UPLOAD_CHUNK_BYTES = max(256 * 1024, _configured_chunk_mb * 1024 * 1024)
-
 # Concurrency controls for background conversion jobs
 _cpu_count = os.cpu_count() or 2
 try:
@@ -108,28 +101,6 @@ ALLOWED_EXTENSIONS = {'mp4', 'mov'}
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def stream_save_file(file_storage, destination_path, chunk_size=UPLOAD_CHUNK_BYTES):
-    """Persist an uploaded file to disk without loading the full payload into memory."""
-    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
-
-    file_stream = getattr(file_storage, 'stream', None)
-    if file_stream and hasattr(file_stream, 'seek'):
-        try:
-            file_stream.seek(0)
-        except (OSError, io.UnsupportedOperation):
-            pass
-
-    bytes_written = 0
-    with open(destination_path, 'wb') as output_file:
-        while True:
-            chunk = file_storage.stream.read(chunk_size)
-            if not chunk:
-                break
-            output_file.write(chunk)
-            bytes_written += len(chunk)
-
-    return bytes_written
-
 def detect_naming_convention_and_replace(original_filename, target_format):
     """
     Detect if filename follows the creative naming convention and replace dimension accordingly.
@@ -0,0 +1,216 @@
+"""ElevenLabs voice catalog with stale-while-revalidate refreshes.
+
+The catalog used to be refetched inside whichever request found the 300 s TTL
+expired, and was lost on every restart. Here the last good catalog is served
+immediately and, once older than ``VOICE_CATALOG_TTL_SECONDS``, refreshed on a
+background thread; only an empty catalog or one older than
+``VOICE_CATALOG_MAX_STALE_SECONDS`` is fetched inline. Refreshes send the
+previous ``ETag`` as ``If-None-Match`` so an unchanged catalog costs a 304.
+The catalog is written to ``VOICE_CATALOG_PATH`` for warm starts, tagged with
+a digest of the API key so a different account never sees it, and indexed by
+``voice_id`` for name lookups.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from http_clients import get_session
+
+logger = logging.getLogger('voice_catalog')
+
+VOICES_URL = 'https://api.elevenlabs.io/v1/voices'
+VOICE_CATALOG_PATH = Path(os.environ.get('VOICE_CATALOG_PATH', 'temp_files/_voice_catalog.json'))
+
+try:
+    VOICE_CATALOG_TTL_SECONDS = max(0, int(os.environ.get('VOICE_CATALOG_TTL_SECONDS', '300')))
+except (TypeError, ValueError):
+    VOICE_CATALOG_TTL_SECONDS = 300
+
+try:
+    VOICE_CATALOG_MAX_STALE_SECONDS = max(0, int(os.environ.get('VOICE_CATALOG_MAX_STALE_SECONDS', '86400')))
+except (TypeError, ValueError):
+    VOICE_CATALOG_MAX_STALE_SECONDS = 86400
+
+# After a failed refresh, wait this long before trying again
+_RETRY_SECONDS = 30
+
+_voices: List[dict] = []
+_by_id: Dict[str, dict] = {}
+_etag: Optional[str] = None
+_fetched_at = 0.0
+_account: Optional[str] = None
+_next_attempt = 0.0
+_refreshing = False
+_loaded = False
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+
+def _account_digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+def _map_voices(payload: dict) -> List[dict]:
+    mapped = []
+    for voice in payload.get('voices', []):
+        voice_id = voice.get('voice_id')
+        name = voice.get('name') or voice_id
+        if not voice_id or not name:
+            continue
+        mapped.append({
+            'id': voice_id,
+            'name': name,
+            'preview_url': voice.get('preview_url'),
+            'labels': voice.get('labels', {}),
+        })
+    return mapped
+
+
+def fetch(api_key: str, etag: Optional[str] = None, timeout: float = 15) -> Tuple[Optional[List[dict]], Optional[str]]:
+    """Fetch the catalog; returns ``(voices, etag)``, with ``voices=None`` on 304."""
+    headers = {'xi-api-key': api_key, 'Accept': 'application/json'}
+    if etag:
+        headers['If-None-Match'] = etag
+    response = get_session('elevenlabs').get(VOICES_URL, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return None, etag
+    response.raise_for_status()
+    return _map_voices(response.json()), response.headers.get('ETag')
+
+
+def _install(voices: List[dict], etag: Optional[str], fetched_at: float, account: str) -> None:
+    global _voices, _by_id, _etag, _fetched_at, _account
+    index = {voice['id']: voice for voice in voices}
+    with _lock:
+        _voices, _by_id, _etag, _fetched_at, _account = voices, index, etag, fetched_at, account
+
+
+def _load_from_disk(account: str) -> None:
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+    try:
+        payload = json.loads(VOICE_CATALOG_PATH.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return
+    if payload.get('account') != account or not isinstance(payload.get('voices'), list):
+        return
+    _install(payload['voices'], payload.get('etag'), float(payload.get('fetched_at', 0.0)), account)
+    logger.info('Loaded %s voice(s) from %s', len(_voices), VOICE_CATALOG_PATH)
+
+
+def _save_to_disk() -> None:
+    with _lock:
+        payload = json.dumps({'account': _account, 'etag': _etag, 'fetched_at': _fetched_at, 'voices': _voices})
+    try:
+        VOICE_CATALOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(VOICE_CATALOG_PATH.parent), prefix='.voice_catalog.', suffix='.part')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(payload)
+        os.replace(temp_path, VOICE_CATALOG_PATH)
+    except OSError as exc:
+        logger.warning('Could not persist voice catalog: %s', exc)
+
+
+def refresh(api_key: str) -> bool:
+    """Fetch (or revalidate) the catalog now; returns False if the request failed."""
+    global _next_attempt
+    account = _account_digest(api_key)
+    with _refresh_lock:
+        with _lock:
+            etag = _etag if _account == account and _voices else None
+        try:
+            voices, new_etag = fetch(api_key, etag)
+        except Exception as exc:
+            logger.error('Failed to fetch ElevenLabs voices: %s', exc)
+            with _lock:
+                _next_attempt = time.time() + _RETRY_SECONDS
+            return False
+        if voices is None:
+            # 304: the catalog we hold is still current
+            with _lock:
+                current = _voices
+            _install(current, new_etag, time.time(), account)
+        elif voices:
+            _install(voices, new_etag, time.time(), account)
+        else:
+            # An empty answer never replaces a catalog we already have
+            with _lock:
+                _next_attempt = time.time() + _RETRY_SECONDS
+            return False
+    _save_to_disk()
+    return True
+
+
+def _refresh_in_background(api_key: str) -> None:
+    global _refreshing
+    with _lock:
+        if _refreshing:
+            return
+        _refreshing = True
+
+    def run() -> None:
+        global _refreshing
+        try:
+            refresh(api_key)
+        finally:
+            with _lock:
+                _refreshing = False
+
+    threading.Thread(target=run, name='voice-catalog-refresh', daemon=True).start()
+
+
+def get_catalog(api_key: Optional[str], force_refresh: bool = False) -> List[dict]:
+    """Return the catalog, serving stale data while a background refresh runs."""
+    if not api_key:
+        return []
+    account = _account_digest(api_key)
+    _load_from_disk(account)
+
+    with _lock:
+        usable = _account == account and bool(_voices)
+        age = time.time() - _fetched_at
+        can_retry = time.time() >= _next_attempt
+
+    if force_refresh or not usable or (VOICE_CATALOG_MAX_STALE_SECONDS and age > VOICE_CATALOG_MAX_STALE_SECONDS):
+        if force_refresh or can_retry:
+            refresh(api_key)
+    elif age > VOICE_CATALOG_TTL_SECONDS and can_retry:
+        _refresh_in_background(api_key)
+
+    with _lock:
+        return _voices if _account == account else []
+
+
+def get_voice(api_key: Optional[str], voice_id: str) -> Optional[dict]:
+    """Look up one voice by id without scanning the catalog."""
+    if not api_key:
+        return None
+    get_catalog(api_key)
+    with _lock:
+        if _account != _account_digest(api_key):
+            return None
+        return _by_id.get(voice_id)
+
+
+def is_cached(api_key: Optional[str]) -> bool:
+    """True when a catalog for *api_key* is held in memory (or on disk, which is then loaded)."""
+    if not api_key:
+        return False
+    account = _account_digest(api_key)
+    _load_from_disk(account)
+    with _lock:
+        return _account == account and bool(_voices)
+
+
+__all__ = ['fetch', 'get_catalog', 'get_voice', 'is_cached', 'refresh']
@@ -1,18 +1,78 @@
 import { apiClient } from './client';
 
+export type JobStatus = 'queued' | 'processing' | 'completed' | 'completed_with_errors' | 'error' | 'cancelled';
+
+export interface JobTask {
+  task_id: string;
+  status: string;
+  stage?: string | null;
+  stages: Record<string, string>;
+  error?: string | null;
+}
+
+export interface JobStatusResponse<T> {
+  job_id: string;
+  kind?: string;
+  status: JobStatus;
+  progress: number;
+  status_message?: string;
+  tasks: JobTask[];
+  errors?: string[];
+  result?: T | null;
+  error?: string;
+}
+
+interface StartJobResponse {
+  job_id?: string;
+  error?: string;
+}
+
+const JOB_POLL_INTERVAL_MS = 2000;
+const FINISHED_JOB_STATUSES: JobStatus[] = ['completed', 'completed_with_errors', 'error', 'cancelled'];
+
+export const fetchJobStatus = async <T>(jobId: string) => {
+  const { data } = await apiClient.get<JobStatusResponse<T>>(`/api/adlocalizer/jobs/${jobId}`);
+  return data;
+};
+
+const waitForJob = async <T extends { error?: string }>(
+  started: StartJobResponse,
+  fallbackError: string,
+  onProgress?: (status: JobStatusResponse<T>) => void,
+): Promise<T> => {
+  if (!started.job_id) {
+    return { error: started.error ?? fallbackError } as T;
+  }
+
+  for (;;) {
+    const status = await fetchJobStatus<T>(started.job_id);
+    onProgress?.(status);
+    if (FINISHED_JOB_STATUSES.includes(status.status)) {
+      if (status.result) {
+        return status.result;
+      }
+      return { error: status.errors?.join('; ') || status.status_message || fallbackError } as T;
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+};
+
 export interface TranscriptionResponse {
   transcription?: string;
   video_available_for_vocal_removal?: boolean;
   error?: string;
 }
 
-export const transcribeMedia = async (file: File): Promise<TranscriptionResponse> => {
+export const transcribeMedia = async (
+  file: File,
+  onProgress?: (status: JobStatusResponse<TranscriptionResponse>) => void,
+): Promise<TranscriptionResponse> => {
   const formData = new FormData();
   formData.append('video', file);
-  const { data } = await apiClient.post<TranscriptionResponse>('/api/transcribe', formData, {
+  const { data } = await apiClient.post<StartJobResponse>('/api/transcribe', formData, {
     headers: { 'Content-Type': 'multipart/form-data' },
   });
-  return data;
+  return waitForJob<TranscriptionResponse>(data, 'Transcription failed', onProgress);
 };
 
 export interface TranslateRequest {
@@ -26,9 +86,12 @@ export interface TranslateResponse {
   error?: string;
 }
 
-export const translateText = async (payload: TranslateRequest) => {
-  const { data } = await apiClient.post<TranslateResponse>('/api/translate', payload);
-  return data;
+export const translateText = async (
+  payload: TranslateRequest,
+  onProgress?: (status: JobStatusResponse<TranslateResponse>) => void,
+): Promise<TranslateResponse> => {
+  const { data } = await apiClient.post<StartJobResponse>('/api/translate', payload);
+  return waitForJob<TranslateResponse>(data, 'Translation failed', onProgress);
 };
 
 export interface ElevenLabsVoice {
@@ -61,9 +124,12 @@ export interface GenerateVoiceResponse {
   warnings?: Record<string, string>;
 }
 
-export const generateVoiceovers = async (payload: GenerateVoiceRequest) => {
-  const { data } = await apiClient.post<GenerateVoiceResponse>('/api/generate-voice', payload);
-  return data;
+export const generateVoiceovers = async (
+  payload: GenerateVoiceRequest,
+  onProgress?: (status: JobStatusResponse<GenerateVoiceResponse>) => void,
+): Promise<GenerateVoiceResponse> => {
+  const { data } = await apiClient.post<StartJobResponse>('/api/generate-voice', payload);
+  return waitForJob<GenerateVoiceResponse>(data, 'Voice generation failed', onProgress);
 };
 
 export interface UploadVideoResponse {
@@ -117,6 +183,7 @@ export interface MixAudioRequest {
   use_custom_music?: boolean;
   add_subtitles?: boolean;
   subtitle_style?: string;
+  subtitle_backend?: 'ffmpeg' | 'ass' | 'moviepy';
 }
 
 export interface MixAudioResponse {
@@ -128,7 +195,10 @@ export interface MixAudioResponse {
   error?: string;
 }
 
-export const mixAudio = async (payload: MixAudioRequest) => {
-  const { data } = await apiClient.post<MixAudioResponse>('/api/mix-audio', payload);
-  return data;
+export const mixAudio = async (
+  payload: MixAudioRequest,
+  onProgress?: (status: JobStatusResponse<MixAudioResponse>) => void,
+): Promise<MixAudioResponse> => {
+  const { data } = await apiClient.post<StartJobResponse>('/api/mix-audio', payload);
+  return waitForJob<MixAudioResponse>(data, 'Mixing failed', onProgress);
 };
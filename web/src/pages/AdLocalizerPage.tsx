@@ -411,6 +411,8 @@ export const AdLocalizerPage = () => {
         use_custom_music: useCustomMusic,
         add_subtitles: addSubtitles,
         subtitle_style: subtitleStyle || undefined,
+      }, (status) => {
+        setLoadingMessage(`Mixing audio and rendering videos... ${Math.round(status.progress ?? 0)}%`);
       });
       if (response.mixed_videos) {
         setMixedVideos(response.mixed_videos);
@@ -0,0 +1,322 @@
+"""Whisper upload preparation: compressed extraction and silence-aware chunking.
+
+Speech is extracted as 16 kHz mono Opus/OGG (or FLAC/WAV, see
+``TRANSCRIPTION_AUDIO_FORMAT``) so uploads are a fraction of the PCM size.
+
+Whisper rejects uploads above 25 MB and a single request for a long file is
+slow. Long inputs are converted to 16 kHz mono WAV, cut at the quietest point
+near every ``WHISPER_CHUNK_SECONDS`` boundary (found with ffmpeg's
+``silencedetect``), transcribed concurrently and stitched back together with
+segment timestamps shifted by each chunk's offset.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import ffmpeg
+
+from ffmpeg_config import FFMPEG_THREAD_STR
+
+logger = logging.getLogger('whisper_chunking')
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+# Whisper's hard limit is 25 MB; leave headroom for multipart overhead
+WHISPER_MAX_UPLOAD_BYTES = int(_env_float('WHISPER_MAX_UPLOAD_MB', 24) * 1024 * 1024)
+# 16 kHz mono PCM is ~1.9 MB/min, so 10 minutes stays well under the limit
+WHISPER_CHUNK_SECONDS = _env_float('WHISPER_CHUNK_SECONDS', 600)
+WHISPER_CHUNK_WORKERS = int(_env_float('WHISPER_CHUNK_WORKERS', 4))
+# How far before a boundary we look for a pause to cut on
+SILENCE_SEARCH_WINDOW = 0.25
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.3
+
+# Whisper only needs 16 kHz mono speech; Opus at ~24 kbps is ~10x smaller than PCM
+TRANSCRIPTION_AUDIO_FORMAT = os.environ.get('TRANSCRIPTION_AUDIO_FORMAT', 'opus').strip().lower()
+TRANSCRIPTION_OPUS_BITRATE = os.environ.get('TRANSCRIPTION_OPUS_BITRATE', '24k')
+
+EXTRACTION_PROFILES: Dict[str, Dict[str, object]] = {
+    'opus': {
+        'suffix': '.ogg',
+        'args': {'acodec': 'libopus', 'audio_bitrate': TRANSCRIPTION_OPUS_BITRATE, 'application': 'voip', 'ac': 1, 'ar': '16000'},
+    },
+    'flac': {'suffix': '.flac', 'args': {'acodec': 'flac', 'ac': 1, 'ar': '16000'}},
+    'wav': {'suffix': '.wav', 'args': {'acodec': 'pcm_s16le', 'ac': 1, 'ar': '16000'}},
+}
+if TRANSCRIPTION_AUDIO_FORMAT not in EXTRACTION_PROFILES:
+    logger.warning('Unknown TRANSCRIPTION_AUDIO_FORMAT %r, using opus', TRANSCRIPTION_AUDIO_FORMAT)
+    TRANSCRIPTION_AUDIO_FORMAT = 'opus'
+
+TRANSCRIPTION_AUDIO_SUFFIX = EXTRACTION_PROFILES[TRANSCRIPTION_AUDIO_FORMAT]['suffix']
+VIDEO_SUFFIXES = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv', '.m4v'}
+
+_SILENCE_START_RE = re.compile(r'silence_start:\s*(-?[\d.]+)')
+_SILENCE_END_RE = re.compile(r'silence_end:\s*(-?[\d.]+)')
+
+ChunkTranscriber = Callable[[Path], Dict[str, object]]
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    try:
+        probe = ffmpeg.probe(str(path))
+        raw = probe.get('format', {}).get('duration') or probe['streams'][0].get('duration')
+        return float(raw) if raw is not None else None
+    except Exception as exc:
+        logger.warning('Could not probe duration of %s: %s', path, exc)
+        return None
+
+
+def needs_chunking(path: Path, duration: Optional[float] = None) -> bool:
+    """True when *path* is too large for one upload or longer than one chunk."""
+    try:
+        if Path(path).stat().st_size > WHISPER_MAX_UPLOAD_BYTES:
+            return True
+    except OSError:
+        return False
+    if duration is None:
+        duration = probe_duration(path)
+    return bool(duration and duration > WHISPER_CHUNK_SECONDS)
+
+
+def extraction_output_args(output_path) -> Dict[str, object]:
+    """Return ffmpeg output arguments matching the suffix of *output_path*."""
+    suffix = Path(output_path).suffix.lower()
+    for profile in EXTRACTION_PROFILES.values():
+        if profile['suffix'] == suffix:
+            return dict(profile['args'])
+    return dict(EXTRACTION_PROFILES['wav']['args'])
+
+
+def extract_transcription_audio(source, output_stem) -> Optional[Path]:
+    """Extract speech audio from *source* in the configured upload format.
+
+    The suffix is chosen from ``TRANSCRIPTION_AUDIO_FORMAT``; if this ffmpeg
+    build cannot encode it (e.g. no libopus) the extraction falls back to WAV.
+    """
+    output_stem = Path(output_stem)
+    formats = [TRANSCRIPTION_AUDIO_FORMAT] + (['wav'] if TRANSCRIPTION_AUDIO_FORMAT != 'wav' else [])
+    for fmt in formats:
+        profile = EXTRACTION_PROFILES[fmt]
+        target = output_stem.with_suffix(profile['suffix'])
+        try:
+            (
+                ffmpeg
+                .input(str(source))
+                .output(str(target), vn=None, **profile['args'])
+                .global_args('-threads', FFMPEG_THREAD_STR)
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True)
+            )
+        except ffmpeg.Error as exc:
+            logger.warning('%s extraction failed for %s: %s', fmt, source, exc.stderr.decode() if exc.stderr else exc)
+            continue
+        if target.exists():
+            return target
+    return None
+
+
+def to_whisper_wav(source: Path, output_path: Path) -> bool:
+    """Convert any media file to the 16 kHz mono PCM WAV the chunker cuts."""
+    try:
+        (
+            ffmpeg
+            .input(str(source))
+            .output(str(output_path), acodec='pcm_s16le', ac=1, ar='16000', vn=None)
+            .global_args('-threads', FFMPEG_THREAD_STR)
+            .overwrite_output()
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        return output_path.exists()
+    except ffmpeg.Error as exc:
+        logger.error('Failed to convert %s for chunking: %s', source, exc.stderr.decode() if exc.stderr else exc)
+        return False
+
+
+def detect_silences(
+    audio_path: Path,
+    noise_db: float = SILENCE_NOISE_DB,
+    min_silence: float = SILENCE_MIN_SECONDS,
+) -> List[Tuple[float, float]]:
+    """Return ``(start, end)`` pairs of pauses found by ffmpeg silencedetect."""
+    try:
+        _, stderr = (
+            ffmpeg
+            .input(str(audio_path))
+            .filter('silencedetect', noise=f'{noise_db}dB', d=min_silence)
+            .output('-', format='null')
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as exc:
+        logger.warning('Silence detection failed, cutting on fixed boundaries: %s', exc)
+        return []
+
+    silences: List[Tuple[float, float]] = []
+    start = None
+    for line in stderr.decode('utf-8', errors='ignore').splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
+    return silences
+
+
+def plan_chunks(duration: float, silences: List[Tuple[float, float]], chunk_seconds: float = WHISPER_CHUNK_SECONDS) -> List[Tuple[float, float]]:
+    """Split ``[0, duration]`` into ``(start, end)`` windows cut inside pauses.
+
+    Each cut is placed in the middle of the last pause that ends before the
+    nominal boundary and starts within the search window; without one the
+    audio is cut exactly on the boundary.
+    """
+    chunks: List[Tuple[float, float]] = []
+    start = 0.0
+    min_cut_offset = chunk_seconds * (1 - SILENCE_SEARCH_WINDOW)
+    while duration - start > chunk_seconds:
+        boundary = start + chunk_seconds
+        cut = boundary
+        for silence_start, silence_end in silences:
+            midpoint = (silence_start + silence_end) / 2
+            if start + min_cut_offset <= midpoint <= boundary:
+                cut = midpoint
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, duration))
+    return chunks
+
+
+def _cut_chunk(audio_path: Path, start: float, end: float, output_path: Path) -> None:
+    (
+        ffmpeg
+        .input(str(audio_path), ss=f'{start:.3f}', t=f'{end - start:.3f}')
+        .output(str(output_path), **extraction_output_args(output_path))
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
+
+# Scripts written without spaces between words: Thai, Lao, Myanmar, Khmer, CJK
+# punctuation, kana, ideographs and fullwidth forms (Hangul uses spaces)
+_NO_SPACE_RE = re.compile(
+    '[\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]'
+)
+
+
+def _join_texts(texts: List[str]) -> str:
+    """Join chunk transcripts, adding a space only where the script uses them."""
+    joined = ''
+    for text in texts:
+        if joined and not (_NO_SPACE_RE.match(joined[-1]) or _NO_SPACE_RE.match(text[0])):
+            joined += ' '
+        joined += text
+    return joined
+
+
+def stitch_results(results: List[Tuple[float, Dict[str, object]]]) -> Dict[str, object]:
+    """Merge per-chunk verbose_json payloads, shifting timestamps by each chunk offset."""
+    texts: List[str] = []
+    segments: List[Dict[str, object]] = []
+    words: List[Dict[str, object]] = []
+    for offset, payload in results:
+        text = (payload.get('text') or '').strip()
+        if text:
+            texts.append(text)
+        for segment in payload.get('segments') or []:
+            shifted = dict(segment)
+            for key in ('start', 'end'):
+                try:
+                    shifted[key] = float(segment.get(key, 0.0)) + offset
+                except (TypeError, ValueError):
+                    shifted[key] = offset
+            if segment.get('words'):
+                shifted['words'] = [
+                    {**word, 'start': float(word.get('start', 0.0)) + offset, 'end': float(word.get('end', 0.0)) + offset}
+                    for word in segment['words']
+                ]
+            shifted['id'] = len(segments)
+            segments.append(shifted)
+        # Word granularity comes back as a top-level list alongside the segments
+        for word in payload.get('words') or []:
+            words.append({**word, 'start': float(word.get('start', 0.0)) + offset, 'end': float(word.get('end', 0.0)) + offset})
+    stitched = {'text': _join_texts(texts), 'segments': segments}
+    if words:
+        stitched['words'] = words
+    return stitched
+
+
+def transcribe_with_chunking(audio_path, transcribe_chunk: ChunkTranscriber) -> Dict[str, object]:
+    """Transcribe *audio_path*, chunking it first when it is too long or too large.
+
+    *transcribe_chunk* receives a file path and returns ``{'text', 'segments'}``
+    (segments may be empty). Short inputs are passed through in one call.
+    Raises the first chunk error so callers keep their existing error handling.
+    """
+    audio_path = Path(audio_path)
+    duration = probe_duration(audio_path)
+    if not needs_chunking(audio_path, duration):
+        return transcribe_chunk(audio_path)
+
+    work_dir = Path(tempfile.mkdtemp(prefix='whisper_chunks_', dir=str(audio_path.parent)))
+    try:
+        wav_path = audio_path
+        if audio_path.suffix.lower() != '.wav':
+            wav_path = work_dir / 'source.wav'
+            if not to_whisper_wav(audio_path, wav_path):
+                raise RuntimeError('Could not prepare audio for chunked transcription')
+            duration = probe_duration(wav_path) or duration
+        if not duration:
+            raise RuntimeError('Could not determine audio duration for chunked transcription')
+
+        windows = plan_chunks(duration, detect_silences(wav_path))
+        logger.info('Transcribing %s in %s chunk(s) of ~%ss', audio_path.name, len(windows), int(WHISPER_CHUNK_SECONDS))
+
+        chunk_paths = []
+        for index, (start, end) in enumerate(windows):
+            chunk_path = work_dir / f'chunk_{index:03d}{TRANSCRIPTION_AUDIO_SUFFIX}'
+            try:
+                _cut_chunk(wav_path, start, end, chunk_path)
+            except ffmpeg.Error:
+                # Encoder unavailable; PCM chunks are still within the upload limit
+                chunk_path = chunk_path.with_suffix('.wav')
+                _cut_chunk(wav_path, start, end, chunk_path)
+            chunk_paths.append((start, chunk_path))
+
+        workers = max(1, min(WHISPER_CHUNK_WORKERS, len(chunk_paths)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='whisper-chunk') as executor:
+            payloads = list(executor.map(lambda item: transcribe_chunk(item[1]), chunk_paths))
+
+        return stitch_results([(start, payload) for (start, _), payload in zip(chunk_paths, payloads)])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+__all__ = [
+    'TRANSCRIPTION_AUDIO_FORMAT',
+    'TRANSCRIPTION_AUDIO_SUFFIX',
+    'VIDEO_SUFFIXES',
+    'WHISPER_CHUNK_SECONDS',
+    'WHISPER_MAX_UPLOAD_BYTES',
+    'detect_silences',
+    'extract_transcription_audio',
+    'extraction_output_args',
+    'needs_chunking',
+    'plan_chunks',
+    'stitch_results',
+    'transcribe_with_chunking',
+]
@@ -0,0 +1,240 @@
+"""Per-session AdLocalizer workspaces under ``temp_files/<session_id>`` with a disk budget.
+
+Every AdLocalizer session writes uploads, voiceovers, mixes and subtitles into
+its own directory, and nothing used to remove them. This module keeps an index
+of each workspace's size and last access, persisted next to the workspaces so
+restarts do not need a full walk. A background sweep evicts workspaces idle
+longer than ``WORKSPACE_MAX_IDLE_HOURS`` and, while the total is over
+``WORKSPACE_DISK_BUDGET_GB``, the least recently used idle ones. Only
+workspaces used within the last ``HOT_WINDOW_SECONDS`` are re-measured on a
+pass; colder ones keep their recorded size.
+
+Bundled assets (default music tracks) are hardlinked into a workspace instead
+of copied, and hardlinked files are not charged to the session.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger('workspace_manager')
+
+WORKSPACE_ROOT = Path(os.environ.get('WORKSPACE_ROOT', 'temp_files'))
+INDEX_PATH = WORKSPACE_ROOT / '_workspace_index.json'
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+WORKSPACE_DISK_BUDGET_BYTES = int(_env_float('WORKSPACE_DISK_BUDGET_GB', 20) * 1024 ** 3)
+WORKSPACE_MAX_IDLE_SECONDS = _env_float('WORKSPACE_MAX_IDLE_HOURS', 24) * 3600
+# Never evict a workspace that was used this recently, even over budget
+WORKSPACE_MIN_IDLE_SECONDS = _env_float('WORKSPACE_MIN_IDLE_MINUTES', 30) * 60
+WORKSPACE_SWEEP_SECONDS = max(30.0, _env_float('WORKSPACE_SWEEP_SECONDS', 300))
+# Background jobs keep writing for a while after the last request
+HOT_WINDOW_SECONDS = 3600
+
+_index: Dict[str, Dict[str, float]] = {}
+_lock = threading.Lock()
+_loaded = False
+_scheduler: Optional[threading.Thread] = None
+
+
+def _is_workspace_name(name: str) -> bool:
+    # Shared caches and indexes live next to workspaces with a leading underscore
+    return bool(name) and not name.startswith(('_', '.'))
+
+
+def _load_index() -> None:
+    global _loaded
+    if _loaded:
+        return
+    try:
+        payload = json.loads(INDEX_PATH.read_text(encoding='utf-8'))
+        if isinstance(payload, dict):
+            _index.update({key: value for key, value in payload.items() if isinstance(value, dict)})
+    except (OSError, ValueError):
+        pass
+    _loaded = True
+
+
+def _save_index() -> None:
+    with _lock:
+        snapshot = json.dumps(_index)
+    try:
+        WORKSPACE_ROOT.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(WORKSPACE_ROOT), prefix='_workspace_index.', suffix='.part')
+        with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+            handle.write(snapshot)
+        os.replace(temp_path, INDEX_PATH)
+    except OSError as exc:
+        logger.warning('Could not persist workspace index: %s', exc)
+
+
+def touch(session_id: Optional[str]) -> None:
+    """Record that *session_id* was just used."""
+    if not session_id or not _is_workspace_name(session_id):
+        return
+    with _lock:
+        _load_index()
+        entry = _index.setdefault(session_id, {'bytes': 0, 'measured_at': 0.0})
+        entry['last_access'] = time.time()
+
+
+def session_workspace(session_id: str) -> Path:
+    """Return (and create) the workspace for *session_id*, marking it as used."""
+    path = WORKSPACE_ROOT / session_id
+    path.mkdir(parents=True, exist_ok=True)
+    touch(session_id)
+    return path
+
+
+def link_shared_asset(source, target) -> Path:
+    """Hardlink *source* to *target*, copying only when linking is impossible."""
+    source = Path(source)
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if target.exists():
+            if os.path.samefile(source, target):
+                return target
+            target.unlink()
+        os.link(source, target)
+    except OSError:
+        # Cross-device or unsupported filesystem
+        shutil.copy2(str(source), str(target))
+    return target
+
+
+def measure(path: Path) -> int:
+    """Bytes a workspace owns; hardlinked shared assets are not counted."""
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            if stat.st_nlink <= 1:
+                                total += stat.st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _refresh(now: float) -> None:
+    """Pick up new workspaces and re-measure the ones used recently."""
+    try:
+        present = {entry.name for entry in os.scandir(WORKSPACE_ROOT) if entry.is_dir() and _is_workspace_name(entry.name)}
+    except OSError:
+        present = set()
+
+    with _lock:
+        _load_index()
+        for session_id in list(_index):
+            if session_id not in present:
+                del _index[session_id]
+        for session_id in present - set(_index):
+            # Unknown to the index (e.g. written before it existed): age it by mtime
+            try:
+                mtime = (WORKSPACE_ROOT / session_id).stat().st_mtime
+            except OSError:
+                mtime = now
+            _index[session_id] = {'bytes': 0, 'measured_at': 0.0, 'last_access': mtime}
+        stale = [
+            session_id
+            for session_id, entry in _index.items()
+            if entry.get('measured_at', 0.0) < entry.get('last_access', 0.0) + HOT_WINDOW_SECONDS
+            and entry.get('measured_at', 0.0) < now
+        ]
+
+    for session_id in stale:
+        size = measure(WORKSPACE_ROOT / session_id)
+        with _lock:
+            entry = _index.get(session_id)
+            if entry is not None:
+                entry['bytes'] = size
+                entry['measured_at'] = now
+
+
+def _evict(session_id: str) -> int:
+    with _lock:
+        entry = _index.pop(session_id, None)
+    freed = int(entry.get('bytes', 0)) if entry else 0
+    shutil.rmtree(WORKSPACE_ROOT / session_id, ignore_errors=True)
+    return freed
+
+
+def sweep(busy_sessions: Iterable[str] = ()) -> Dict[str, int]:
+    """One maintenance pass; returns counts for logging."""
+    now = time.time()
+    busy = set(busy_sessions)
+    _refresh(now)
+
+    with _lock:
+        entries = sorted(_index.items(), key=lambda item: item[1].get('last_access', 0.0))
+        total = sum(int(entry.get('bytes', 0)) for _, entry in entries)
+
+    evicted = 0
+    freed = 0
+    for session_id, entry in entries:
+        if session_id in busy:
+            continue
+        idle = now - entry.get('last_access', 0.0)
+        expired = WORKSPACE_MAX_IDLE_SECONDS and idle > WORKSPACE_MAX_IDLE_SECONDS
+        over_budget = WORKSPACE_DISK_BUDGET_BYTES and total > WORKSPACE_DISK_BUDGET_BYTES
+        if not expired and not (over_budget and idle > WORKSPACE_MIN_IDLE_SECONDS):
+            continue
+        released = _evict(session_id)
+        total -= released
+        freed += released
+        evicted += 1
+        logger.info('Evicted workspace %s (%.1f MB, idle %.0f min)', session_id, released / 1048576, idle / 60)
+
+    _save_index()
+    if WORKSPACE_DISK_BUDGET_BYTES and total > WORKSPACE_DISK_BUDGET_BYTES:
+        logger.warning(
+            'Workspaces use %.1f GB, over the %.1f GB budget, but the rest are in use',
+            total / 1024 ** 3,
+            WORKSPACE_DISK_BUDGET_BYTES / 1024 ** 3,
+        )
+    return {'evicted': evicted, 'freed_bytes': freed, 'total_bytes': total}
+
+
+def start_scheduler(busy_sessions: Callable[[], Iterable[str]] = lambda: ()) -> None:
+    """Run ``sweep`` every WORKSPACE_SWEEP_SECONDS on a daemon thread (once per process)."""
+    global _scheduler
+    if _scheduler is not None:
+        return
+
+    def run() -> None:
+        while True:
+            try:
+                sweep(busy_sessions())
+            except Exception as exc:
+                logger.error('Workspace sweep failed: %s', exc)
+            time.sleep(WORKSPACE_SWEEP_SECONDS)
+
+    _scheduler = threading.Thread(target=run, name='workspace-sweeper', daemon=True)
+    _scheduler.start()
+
+
+__all__ = ['link_shared_asset', 'measure', 'session_workspace', 'start_scheduler', 'sweep', 'touch']
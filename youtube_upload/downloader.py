@@ -4,12 +4,9 @@ from __future__ import annotations
 import mimetypes
 import os
 from pathlib import Path
-from typing import Optional
 from urllib.parse import unquote, urlparse
 
-import requests
-
-DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB
+from http_download import DownloadFailed, download, probe
 
 
 class DownloadError(Exception):
@@ -24,12 +21,12 @@ def _derive_filename(url: str, fallback: str) -> str:
     return name
 
 
-def _ensure_extension(name: str, response: requests.Response) -> str:
+def _ensure_extension(name: str, content_type: str) -> str:
     path = Path(name)
     if path.suffix:
         return name
 
-    content_type = response.headers.get('content-type', '').split(';')[0].strip()
+    content_type = content_type.split(';')[0].strip()
     guessed = mimetypes.guess_extension(content_type) if content_type else None
     if guessed:
         return f"{name}{guessed}"
@@ -43,13 +40,12 @@ def download_to_directory(url: str, directory: Path, *, prefix: str = 'remote')
     fallback_name = f"{prefix}_{os.urandom(4).hex()}"
 
     try:
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-    except Exception as exc:  # noqa: BLE001
+        remote = probe(url)
+    except DownloadFailed as exc:
         raise DownloadError(f"Failed to download {url}: {exc}") from exc
 
     filename = _derive_filename(url, fallback_name)
-    filename = _ensure_extension(filename, response)
+    filename = _ensure_extension(filename, remote.content_type)
 
     target = directory / filename
     counter = 1
@@ -58,11 +54,6 @@ def download_to_directory(url: str, directory: Path, *, prefix: str = 'remote')
         counter += 1
 
     try:
-        with target.open('wb') as handle:
-            for chunk in response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
-                if chunk:
-                    handle.write(chunk)
-    except Exception as exc:  # noqa: BLE001
+        return download(url, target, remote=remote)
+    except DownloadFailed as exc:
         raise DownloadError(f"Error writing download for {url}: {exc}") from exc
-
-    return target